@@ -0,0 +1,105 @@
+import argparse
+import json
+import time
+from config.logs import setup_logging
+from simulation.scenario import build_simulation, list_scenarios, load_scenario
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+'''
+Benchmark bez okna - rozgrywa scenariusze z benchmarks/scenarios i mierzy wydajność symulacji
+'''
+def peak_memory_mb():
+    """Peak resident memory of this process, None where the platform doesn't report it"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 1024 / (1024 if peak > 1 << 32 else 1)
+
+
+def run_scenario(scenario, waves=None):
+    """Play the scenario's waves and return the measurements"""
+    waves = waves or scenario.get("waves", 10)
+    simulation, _ = build_simulation(scenario)
+    enemies = simulation.enemies
+    peak_enemies = peak_projectiles = 0
+    wave_results = []
+    start = time.perf_counter()
+    for _ in range(waves):
+        wave = simulation.state.wave
+        wave_start = time.perf_counter()
+        wave_ticks = 0
+        simulation.start_wave()
+        while simulation.state.wave_started and not simulation.game_over:
+            simulation.step()
+            wave_ticks += 1
+            if len(enemies) > peak_enemies:
+                peak_enemies = len(enemies)
+            if len(simulation.projectiles) > peak_projectiles:
+                peak_projectiles = len(simulation.projectiles)
+        wave_results.append({
+            "wave": wave,
+            "ticks": wave_ticks,
+            "wall_ms": (time.perf_counter() - wave_start) * 1000.0,
+            "lives": simulation.state.lives,
+        })
+        if simulation.game_over:
+            break
+    elapsed = time.perf_counter() - start
+    return {
+        "scenario": scenario["name"],
+        "seed": simulation.seed,
+        "hit_mode": simulation.hit_mode,
+        "waves_played": len(wave_results),
+        "game_over": simulation.game_over,
+        "ticks": simulation.tick,
+        "seconds": elapsed,
+        "ticks_per_second": simulation.tick / elapsed if elapsed else 0.0,
+        "peak_enemies": peak_enemies,
+        "peak_projectiles": peak_projectiles,
+        "towers": len(simulation.towers),
+        "score": simulation.state.score,
+        "peak_memory_mb": peak_memory_mb(),
+        "waves": wave_results,
+    }
+
+
+def print_result(result):
+    memory = result["peak_memory_mb"]
+    print(f"{result['scenario']} ({result['hit_mode']}, seed {result['seed']}): "
+          f"{result['waves_played']} waves, {result['ticks']} ticks in {result['seconds']:.2f} s, "
+          f"{result['ticks_per_second']:.0f} ticks/s"
+          + (" - game over" if result["game_over"] else ""))
+    print(f"  peak enemies {result['peak_enemies']}, peak projectiles {result['peak_projectiles']}, "
+          f"towers {result['towers']}, peak memory "
+          + (f"{memory:.1f} MB" if memory is not None else "n/a"))
+    for wave in result["waves"]:
+        print(f"  wave {wave['wave']:>3}: {wave['ticks']:>6} ticks {wave['wall_ms']:>9.1f} ms  lives {wave['lives']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play benchmark scenarios without a window")
+    parser.add_argument("scenarios", nargs="*", help="scenario files or names (default: all in benchmarks/scenarios)")
+    parser.add_argument("--waves", type=int, help="override the number of waves to play")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--verbose", action="store_true", help="log the game's debug output")
+    args = parser.parse_args()
+    if args.verbose:
+        setup_logging("DEBUG")
+
+    results = []
+    for name in args.scenarios or list_scenarios():
+        result = run_scenario(load_scenario(name), args.waves)
+        print_result(result)
+        results.append(result)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,27 @@
 
+# Map size in tiles, large maps (256x256 and more) are supported
 MAP_WIDTH = 30
 MAP_HEIGHT = 30
+MAP_CHUNK_CACHE_MB = 64  # Rasterised map chunks kept once they scroll out of view
+AI_VIEW_TILES = 32  # Side of the map window the AI observes and places towers in
 BASE_GOLD = 1000
 BASE_LIVES = 20
 BASE_WAVE = 1
-TILE_SIZE = 16
\ No newline at end of file
+TILE_SIZE = 16
+# Game loop
+FRAME_INTERVAL_MS = 16  # Display refresh, independent of the simulation tick
+MAX_CATCH_UP_STEPS = 5  # Max simulation steps per frame while catching up
+MAX_BACKLOG_MS = 250  # Stalls longer than this slow the game down instead
+GAME_SPEEDS = [1, 4, 16, 0]  # Fast-forward multipliers, 0 = as fast as possible
+ENEMY_POOL_HIGH_WATER = 256  # Idle enemy sprites kept per type for the next waves
+MAX_SPEED_FRAME_BUDGET_MS = 12  # Simulation time per frame at max speed, leaves room for the render
+# Simulation
+GAME_SEED = None  # Seed of the game's random stream (map, waves; the AI derives its own), None = a new one every game
+HIT_RESOLUTION = "collision"  # "collision", "intercept" (predicted hit time) or "hitscan" (instant hit)
+# Profiling
+PROFILER_ENABLED = False  # Time every simulation subsystem and the render, see Debug > Profiler overlay
+PROFILER_WINDOW = 600  # Samples kept per section for the rolling percentiles
+# Logging
+LOG_LEVEL = "INFO"  # DEBUG also logs per-event output: history events, placement checks, the map grid
+LOG_CATEGORY_LEVELS = {}  # Per-category overrides, e.g. {"network": "DEBUG"}
+LOG_RATE_LIMIT = 20  # Records per second let through per category, the rest are counted and dropped
@@ -42,13 +42,21 @@ class GameHistoryManager:
         ET.SubElement(metadata, "Date").text = history.get("date", datetime.now().isoformat())
         ET.SubElement(metadata, "GameMode").text = history.get("game_mode", "")
         ET.SubElement(metadata, "ServerIP").text = history.get("server_ip", "")
+        if history.get("seed") is not None:
+            ET.SubElement(metadata, "Seed").text = str(history["seed"])
         # Add map data if available
         if "map" in history:
             map_elem = ET.SubElement(metadata, "Map")
             map_data = history.get("map", [])
-            for row in map_data:
-                row_elem = ET.SubElement(map_elem, "Row")
-                row_elem.text = " ".join(str(cell) for cell in row)
+            if isinstance(map_data, dict):
+                # Compressed map (encode_grid), one element instead of a row per line
+                map_elem.set("width", str(map_data["width"]))
+                map_elem.set("height", str(map_data["height"]))
+                map_elem.text = map_data["tiles"]
+            else:
+                for row in map_data:
+                    row_elem = ET.SubElement(map_elem, "Row")
+                    row_elem.text = " ".join(str(cell) for cell in row)
 
         # Add path data if available
         if "path" in history:
@@ -91,7 +99,16 @@ class GameHistoryManager:
                 "map": [],
                 "events": []
             }
-            if root.find("./Metadata/Map") is not None:
+            if root.find("./Metadata/Seed") is not None:
+                history["seed"] = int(root.find("./Metadata/Seed").text)
+            map_elem = root.find("./Metadata/Map")
+            if map_elem is not None and map_elem.get("width") is not None:
+                history["map"] = {
+                    "width": int(map_elem.get("width")),
+                    "height": int(map_elem.get("height")),
+                    "tiles": (map_elem.text or "").strip()
+                }
+            elif map_elem is not None:
                 map_data = []
                 for row_elem in root.findall("./Metadata/Map/Row"):
                     if row_elem.text:
@@ -0,0 +1,88 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+import config.config as cfg
+
+'''
+Logowanie - rekordy trafiają do kolejki, a zapisuje je wątek w tle, więc gra nie czeka na konsolę.
+Każda kategoria ma własny poziom i limit rekordów na sekundę.
+'''
+ROOT_LOGGER = "tower_defense"
+
+_listener = None
+
+
+def get_logger(category):
+    """Logger for one category (history, placement, map, network...)"""
+    return logging.getLogger(f"{ROOT_LOGGER}.{category}")
+
+
+class RateLimitFilter(logging.Filter):
+    """Lets at most limit records per period through for each category and counts the dropped ones"""
+    def __init__(self, limit, period=1.0):
+        super().__init__()
+        self.limit = limit
+        self.period = period
+        # category -> [window start, records passed, records dropped]
+        self._windows = {}
+        # The game loop and the network threads log through the same filter
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(record.name)
+            if window is None or now - window[0] >= self.period:
+                dropped = window[2] if window else 0
+                window = self._windows[record.name] = [now, 0, 0]
+            else:
+                dropped = 0
+            if window[1] < self.limit:
+                window[1] += 1
+                passed = True
+            else:
+                window[2] += 1
+                passed = False
+        if dropped:
+            record.msg = f"{record.getMessage()} ({dropped} earlier messages suppressed)"
+            record.args = None
+        return passed
+
+
+def setup_logging(level=None, category_levels=None, rate_limit=None, stream=None):
+    """Route the game's loggers through a queue to a background writer thread, safe to call again"""
+    global _listener
+    root = logging.getLogger(ROOT_LOGGER)
+    if _listener is not None:
+        _listener.stop()
+        root.handlers.clear()
+    root.setLevel(level or cfg.LOG_LEVEL)
+    root.propagate = False
+    for category, category_level in (cfg.LOG_CATEGORY_LEVELS if category_levels is None else category_levels).items():
+        get_logger(category).setLevel(category_level)
+
+    writer = logging.StreamHandler(stream or sys.stdout)
+    writer.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s", "%H:%M:%S"))
+    records = queue.SimpleQueue()
+    # Handler filters run in the calling (game) thread before the record is queued, so the
+    # rate limit is paid on the hot path; only the writer runs in the listener thread
+    handler = logging.handlers.QueueHandler(records)
+    handler.addFilter(RateLimitFilter(cfg.LOG_RATE_LIMIT if rate_limit is None else rate_limit))
+    root.addHandler(handler)
+    _listener = logging.handlers.QueueListener(records, writer)
+    _listener.start()
+
+
+def shutdown_logging():
+    """Flush the queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
@@ -59,6 +59,10 @@ class AnimationComponent:
             self.current_time = 0.0
         else:
             raise ValueError(f"Animation '{name}' not found by {self.spritesheet}.")
+    def reset(self):
+        """Restart the current animation from its first frame"""
+        self.current_frame = 0
+        self.current_time = 0.0
     def get_current_frame(self):
         if self.current_frame in self.current_anim:
             frame_data = self.current_anim[self.current_frame]
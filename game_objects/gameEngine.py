@@ -4,76 +4,117 @@ from PySide6.QtGui import QBrush, QColor, QPainterPath,QPen
 from PySide6.QtWidgets import QGraphicsSceneMouseEvent, QGraphicsView,QGraphicsPathItem
 from PySide6.QtCore import QEvent, QObject, Signal, Slot
 from game_objects.graphicItems import GhostTowerItem ,BaseItem, BaseTowerItem, RangeIndicator, ProjectileItem,BaseEnemyItem
-from game_objects.graphicItems import  PathItem, ObstacleItem, MapItem
-from game_objects.towers import BasicTower, BombTower, BoosterTower,BombProjectile, ExplosionProjectile,BasicProjectile
-from game_objects.enemies import Rat, FastRat, GiantRat
-from map_generation.map_generator import MapGenerator,MapGraphicsManager
+from game_objects.sceneRenderer import SceneRenderer
+from map_generation.map_generator import MapGenerator,MapGraphicsManager, encode_grid, decode_grid
 from game_objects.animationManager import AsepriteLoader,SpriteSheet, get_all_animations
 from map_generation.tileset import get_tileset
-from game_objects.waves import ENEMY_LIST, build_new_wave
-import random
 import config.config as cfg
+from simulation.simulation import GameSimulation, SimulationState
+from simulation.entities import TOWER_TYPES, TOWER_KINDS, ENEMY_KINDS
+from simulation.occupancy import LEFT, RIGHT
 from history.history_recorder import GameHistoryRecorder
 from network.network import NetworkManager,GameNetworkEvent
+from config.logs import get_logger
+import time
 '''
 Klasa odpowiedzialna za sterowanie grą i jej elementami
 '''
+log = get_logger("game")
+placement_log = get_logger("placement")
+replay_log = get_logger("replay")
+network_log = get_logger("network")
 class GameState(QObject):
+    """Qt facade over SimulationState, emits signals when values change"""
     gold_changed = Signal(int)
     score_changed = Signal(int)
     lives_changed = Signal(int)
     level_changed = Signal(int)
     record_changed = Signal(bool)
 
-    def __init__(self):
+    def __init__(self, state=None):
         super().__init__()
-        self._gold = cfg.BASE_GOLD
-        self._score = 0
-        self._lives = cfg.BASE_LIVES
-        self._level = 1
-        self.wave = 1
-        self.wave_started = False
-        self.enemies_to_spawn = []
-        self._record = True
+        self.state = state if state is not None else SimulationState()
+        self._emitted = {}
+        self._remember()
+    def _remember(self):
+        self._emitted = {
+            "gold": self.state.gold,
+            "score": self.state.score,
+            "lives": self.state.lives,
+            "level": self.state.level,
+        }
+    def sync(self):
+        """Emit signals for values the simulation changed since the last sync"""
+        if self._emitted["gold"] != self.state.gold:
+            self.gold_changed.emit(self.state.gold)
+        if self._emitted["score"] != self.state.score:
+            self.score_changed.emit(self.state.score)
+        if self._emitted["lives"] != self.state.lives:
+            self.lives_changed.emit(self.state.lives)
+        if self._emitted["level"] != self.state.level:
+            self.level_changed.emit(self.state.level)
+        self._remember()
     @property
     def gold(self):
-        return self._gold
+        return self.state.gold
         
     @gold.setter
     def gold(self, value):
-        self._gold = value
+        self.state.gold = value
+        self._emitted["gold"] = value
         self.gold_changed.emit(value)
     
     @property
     def score(self):
-        return self._score
+        return self.state.score
     
     @score.setter
     def score(self, value):
-        self._score = value
+        self.state.score = value
+        self._emitted["score"] = value
         self.score_changed.emit(value)
     @property
     def lives(self):
-        return self._lives
+        return self.state.lives
     
     @lives.setter
     def lives(self, value):
-        self._lives = value
+        self.state.lives = value
+        self._emitted["lives"] = value
         self.lives_changed.emit(value)
     @property
     def level(self):
-        return self._level
+        return self.state.level
     @level.setter
     def level(self, value):
-        self._level = value
+        self.state.level = value
+        self._emitted["level"] = value
         self.level_changed.emit(value)
     @property
     def record(self):
-        return self._record
+        return self.state.record
     @record.setter
     def record(self, value):
-        self._record = value
+        self.state.record = value
         self.record_changed.emit(value)
+    @property
+    def wave(self):
+        return self.state.wave
+    @wave.setter
+    def wave(self, value):
+        self.state.wave = value
+    @property
+    def wave_started(self):
+        return self.state.wave_started
+    @wave_started.setter
+    def wave_started(self, value):
+        self.state.wave_started = value
+    @property
+    def enemies_to_spawn(self):
+        return self.state.enemies_to_spawn
+    @enemies_to_spawn.setter
+    def enemies_to_spawn(self, value):
+        self.state.enemies_to_spawn = value
 
 
 class GameScene(QGraphicsScene):
@@ -87,12 +128,22 @@ class GameScene(QGraphicsScene):
     network_event = Signal(dict)
     player_joined = Signal(str)
     player_left = Signal(str)
-    def __init__(self, parent=None,multiplayer=False,is_host=False,map_gen = None):
+    def __init__(self, parent=None,multiplayer=False,is_host=False,map_gen = None, seed=cfg.GAME_SEED):
         super().__init__(parent)
 
         self.game_active = False
-        self.game_state = GameState()
+        self.history_recorder = GameHistoryRecorder()
+        # Game rules run in the Qt-free simulation, the scene only mirrors it
+        self.simulation = GameSimulation(history_recorder=self.history_recorder, seed=seed)
+        self.simulation.on_enemy_spawned = self._on_enemy_spawned
+        self.simulation.on_wave_ended = self.end_wave
+        self.simulation.on_game_over = self.game_over
+        self.game_state = GameState(self.simulation.state)
         self.last_frame_time = 0.0
+        # Wall-clock time not yet consumed by fixed simulation steps
+        self.tick_accumulator = 0.0
+        # Ticks simulated per tick of wall time, 0 = as fast as possible
+        self.game_speed = 1
 
         self.multiplayer = multiplayer
         self.is_host = is_host
@@ -101,6 +152,9 @@ class GameScene(QGraphicsScene):
         self.player_side = "left"
 
         if self.multiplayer:
+            # Host and client hand out even and odd ids, so towers placed on both sides never clash
+            self.simulation.id_stride = 2
+            self.simulation.id_offset = 0 if is_host else 1
             self.network = NetworkManager(is_host)
             self.network.connected.connect(self._on_network_connected)
             self.network.disconnected.connect(self._on_network_disconnected)
@@ -112,23 +166,28 @@ class GameScene(QGraphicsScene):
             # Add state request handler
             self.network.state_request.connect(self._on_state_request)
         self.map_divider = None
-        # Game state containers
-        self.game_items = {
-            "towers": [],
-            "enemies": [],
-            "projectiles": []
-        }
         self.current_range_indicator = None
         self.animations = get_all_animations()
         self.tileset = get_tileset()
+        self.renderer = SceneRenderer(self, self.simulation, self.animations)
         # Setup game systems
         self.path_points = []
-        self.history_recorder = GameHistoryRecorder()
+        # Scene area shown by the view, kept so a new map layer starts with the right chunks
+        self.viewport_rect = None
         self._setup_timers()
         self._map_init(map_gen=map_gen)
         self._connect_signals()
         self._background = QBrush(QColor(50, 50, 50))
         self.setBackgroundBrush(self._background)
+
+    @property
+    def game_items(self):
+        """Simulation entities by category"""
+        return {
+            "towers": self.simulation.towers,
+            "enemies": self.simulation.enemies,
+            "projectiles": self.simulation.projectiles
+        }
         
     # ----------------------
     # Initialization Methods
@@ -136,22 +195,23 @@ class GameScene(QGraphicsScene):
     def _map_init(self,height=cfg.MAP_HEIGHT,width=cfg.MAP_WIDTH,map_gen = None):
         if map_gen is None:
             """Initialize grid and path system"""
-            self.map_generator = MapGenerator(height,width)
+            self.map_generator = MapGenerator(width,height,self.simulation.rng)
         else:
             self.map_generator = map_gen
-        self.map_graphics_manager = MapGraphicsManager(self.map_generator.grid, 16, self.tileset)
-        for item in self.map_graphics_manager.create_items():
-            self.addItem(item)
+        self.map_height, self.map_width = self.map_generator.grid.shape
+        self._set_map_layer(self.map_generator.grid)
         #self._init_grid()
         for p in self.map_generator.path:
             self.path_points.append(self.grid_to_scene(p))
+        self.simulation.set_path([(p.x(), p.y()) for p in self.path_points])
+        self.simulation.set_map_grid(self.map_generator.grid)
 
 
         if self.multiplayer:
             # Create a vertical divider in the middle of the map
             divider_path = QPainterPath()
-            divider_path.moveTo(width * cfg.TILE_SIZE/2, 0)
-            divider_path.lineTo(width * cfg.TILE_SIZE/2, height * cfg.TILE_SIZE)
+            divider_path.moveTo(self.map_width * cfg.TILE_SIZE/2, 0)
+            divider_path.lineTo(self.map_width * cfg.TILE_SIZE/2, self.map_height * cfg.TILE_SIZE)
             
             self.map_divider = QGraphicsPathItem(divider_path)
             pen = QPen(QColor(255, 255, 0))  # Yellow divider
@@ -160,9 +220,22 @@ class GameScene(QGraphicsScene):
             self.map_divider.setPen(pen)
             self.map_divider.setZValue(10)  # Above most game elements
             self.addItem(self.map_divider)
-            self.map_width = width
 
 
+    def _set_map_layer(self, grid):
+        """Set up the static map tiles, drawn in drawBackground instead of as scene items"""
+        self.map_graphics_manager = MapGraphicsManager(grid, cfg.TILE_SIZE, self.tileset,
+                                                       cfg.MAP_CHUNK_CACHE_MB * 1024 * 1024)
+        # Without tile items the scene rect no longer follows the map on its own
+        self.setSceneRect(self.map_graphics_manager.bounding_rect())
+        if self.viewport_rect is not None:
+            self.map_graphics_manager.set_viewport(self.viewport_rect)
+        self.update()
+
+    def drawBackground(self, painter, rect):
+        super().drawBackground(painter, rect)
+        self.map_graphics_manager.paint(painter, rect)
+
     def _init_grid(self):
         """Create visual/logical grid system"""
         self.grid = {}
@@ -188,68 +261,39 @@ class GameScene(QGraphicsScene):
         """Handle game over state"""
 
         self.game_timer.stop()
-        self.spawn_timer.stop()
         self.game_active = False
+        self._render_frame()
         self.game_over_signal.emit()
         # Show game over screen or reset game
-        if self.game_state.record: self.history_recorder.record_event("game_over", {
-            "final_score": self.game_state.score,
-            "waves_completed": self.game_state.wave,
-            "result": "defeat"
-        })
-        print("Game Over!")
+        log.info("Game Over!")
         # Reset game state
     
     def _setup_timers(self):
         """Initialize game timers"""
         self.game_timer = QTimer()
-        self.game_timer.setInterval(16)  # ~60 FPS
+        self.game_timer.setInterval(cfg.FRAME_INTERVAL_MS)  # ~60 FPS
         self.game_timer.timeout.connect(self.advance)
-        self.spawn_timer = QTimer()
-        self.spawn_timer.setInterval(1000)
-        self.spawn_timer.timeout.connect(self.spawn_enemy)
+
+    def _start_game_timer(self):
+        """Start the frame timer with a fresh clock, so paused time is not caught up"""
+        self.last_frame_time = time.perf_counter()
+        self.tick_accumulator = 0.0
+        self.game_timer.start()
         
     def start_wave(self):
         """Start a new wave of enemies"""
         if self.multiplayer and not self.is_host:
-            print("Only host can start waves in multiplayer")
+            log.warning("Only host can start waves in multiplayer")
             return
         # Send network event if in multiplayer as host
         if self.multiplayer and self.is_host:
             self.network.send_event(GameNetworkEvent.START_WAVE, {
                 "wave_number": self.game_state.wave
             })
-        enemies = {}
-        self.game_state.wave_started = True
-        if self.game_state.wave > len(ENEMY_LIST):
-            enemies = build_new_wave(self.game_state.wave)
-        else:
-            enemies = ENEMY_LIST[self.game_state.wave-1]
-        enemy_type = ["rat", "FAST_RAT", "GIANT_RAT"]
-        for enemy_type in enemies:
-            enemies_to_spawn = enemies[enemy_type]
-            for enemy in range(enemies_to_spawn):
-                # Ensure lowercase enemy types are used
-                self.game_state.enemies_to_spawn.append(enemy_type.lower())
-        random.shuffle(self.game_state.enemies_to_spawn)
-
-        if self.game_state.record: self.history_recorder.record_event("wave_started", {
-            "wave_number": self.game_state.wave,
-            "enemies": [e.__class__.__name__ for e in self.game_state.enemies_to_spawn]
-        })
-        # Make sure spawn timer is running (important for AI play)
-        if not self.spawn_timer.isActive():
-            self.spawn_timer.start()
+        self.simulation.start_wave()
 
     def end_wave(self):
         """End the current wave of enemies"""
-        self.game_state.wave_started = False
-        self.game_state.wave += 1
-        if self.game_state.record: self.history_recorder.record_event("wave_ended", {
-            "wave_number": self.game_state.wave,
-            "gold": self.game_state.gold,
-            "lives": self.game_state.lives
-        })
         self.wave_ended.emit()
 
     def _repaint_scene(self):
@@ -272,8 +316,9 @@ class GameScene(QGraphicsScene):
             path_int.append(self.scene_to_grid(p))
         self.history_recorder.start_recording({
             "game_mode": "single_player",
-            "map": self.map_generator.grid,
+            "map": encode_grid(self.map_generator.grid),
             "path": path_int,
+            "seed": self.simulation.seed,
         })
         self.history_recorder.record_event("initial_state", {
             "gold": self.game_state.gold,
@@ -281,206 +326,101 @@ class GameScene(QGraphicsScene):
             "wave": self.game_state.wave
         })
         
-        self.game_timer.start()
+        self._start_game_timer()
 
     def advance(self):
-        """Main game update cycle"""
+        """Main game update cycle: fixed simulation steps for the elapsed wall time, then one render"""
         if not self.game_active:
             return
-        
-        self._update_enemies()
-        self._update_towers()
-        self._update_projectiles()
-        self._check_collisions()
-        self._cleanup_items()
+        now = time.perf_counter()
+        frame_ms = (now - self.last_frame_time) * 1000.0
+        self.last_frame_time = now
+        if self.game_speed == 0:
+            self._advance_max_speed(now)
+            self.tick_accumulator = 0.0
+            if self.game_active:
+                self._render_frame(frame_ms, 1.0)
+            return
+
+        # Longer stalls (debugger, window drag...) are dropped instead of spiralling
+        self.tick_accumulator = min(self.tick_accumulator + frame_ms * self.game_speed,
+                                    cfg.MAX_BACKLOG_MS * self.game_speed)
+
+        tick_ms = GameSimulation.TICK_MS
+        max_steps = cfg.MAX_CATCH_UP_STEPS * self.game_speed
+        steps = 0
+        while self.tick_accumulator >= tick_ms and steps < max_steps:
+            self.simulation.step()
+            self.tick_accumulator -= tick_ms
+            steps += 1
+            if not self.game_active:
+                return
+        # Any backlog left over is caught up during the next frames
+        self._render_frame(frame_ms, min(self.tick_accumulator / tick_ms, 1.0))
         #self._repaint_scene()
         #self.update_viewport(self.sceneRect())
+    def _advance_max_speed(self, frame_start):
+        """Step the simulation until this frame's time budget is used up"""
+        deadline = frame_start + cfg.MAX_SPEED_FRAME_BUDGET_MS / 1000.0
+        while self.game_active:
+            self.simulation.step()
+            if time.perf_counter() >= deadline:
+                break
+
+    def set_game_speed(self, speed):
+        """Fast-forward by simulating several ticks per frame, 0 runs as fast as possible"""
+        if speed < 0:
+            return
+        if self.multiplayer and speed != 1:
+            log.warning("Game speed can't be changed in multiplayer")
+            return
+        self.game_speed = speed
+        self.tick_accumulator = 0.0
+
+    def _render_frame(self, elapsed_ms=0, alpha=None):
+        """Mirror the simulation into the scene and notify the UI"""
+        if alpha is None:
+            alpha = min(self.tick_accumulator / GameSimulation.TICK_MS, 1.0)
+        profiler = self.simulation.profiler
+        if profiler.enabled:
+            start = time.perf_counter()
+        self.renderer.sync(elapsed_ms, alpha)
+        self.game_state.sync()
+        if profiler.enabled:
+            profiler.record("render", (time.perf_counter() - start) * 1000.0)
     def update_viewport(self,viewport_rect: QRectF):
-        """Update scene viewport"""
-        for item in self.items():
-            item_rect = item.mapRectToScene(item.boundingRect())
-
-            if viewport_rect.intersects(item_rect):
-                item.setVisible(True)
-            else:
-                item.setVisible(False)
-        self.update(viewport_rect)
-
-    # ----------------------
-    # Update Subsystems
-    # ----------------------
-    def _cleanup_items(self):
-        pass
-    def _update_enemies(self):
-        """Process enemy movement and health"""
-        for enemy in self.game_items['enemies']:
-            if enemy.health <= 0:
-                self.game_state.score += enemy.value
-                self.game_state.gold += enemy.value
-                if self.game_state.record: self.history_recorder.record_event("enemy_killed", {
-                    "enemy_type": enemy.__class__.__name__,
-                    "enemy_id": enemy.enemy_id,
-                    "position": (enemy.pos().x(), enemy.pos().y())
-                })
-                self.removeItem(enemy)
-                self.game_items['enemies'].remove(enemy)
-
-                continue
-            if enemy.pos() == self.path_points[-1]:
-                self.game_state.lives -= 1
-
-                if self.game_state.record: self.history_recorder.record_event("enemy_reached_end", {
-                    "enemy_type": enemy.__class__.__name__,
-                    "enemy_id": enemy.enemy_id,
-                    "position": (enemy.pos().x(), enemy.pos().y())
-                })
-                self.removeItem(enemy)
-                self.game_items['enemies'].remove(enemy)
-                if self.game_state.lives <= 0:
-
-                    self.game_over()
-                continue
-            if type(enemy) != 'MockEnemy':
-                enemy.advance_animation(16)
-        if self.game_items['enemies'] == [] and self.game_state.enemies_to_spawn == [] and self.game_state.wave_started:
-            self.end_wave()
-    
-    def _update_towers(self):
-        """Handle tower targeting and shooting"""
-        for tower in self.game_items['towers']:
-            enemy = tower.acquire_target(self.game_items['enemies'])
-             
-            if tower.should_fire() and enemy is not None:
-                
-                tower.set_cooldown()
-                if isinstance(tower, BasicTower):
-                    projectile = BasicProjectile(tower.pos(), enemy.pos(), tower,self.animations["basic_projectile"])
-                    
-                    self.add_projectile(projectile)
-                if isinstance(tower, BombTower):
-                    projectile = BombProjectile(tower.pos(), enemy.pos(), tower, self.animations["bomb_projectile"])
-                    self.add_projectile(projectile)
-                if self.game_state.record: self.history_recorder.record_event("tower_shot", {
-                    "tower_type": tower.__class__.__name__,
-                    "tower_id": tower.tower_id,
-                    "projectile_type": projectile.__class__.__name__,
-                    "target_enemy": enemy.__class__.__name__,
-                    "position": (tower.pos().x(), tower.pos().y())
-                })
-            tower.advance_animation(16)
-    def _handle_projectile_hit(self, projectile, enemy):
-        """Process projectile-enemy collision"""
-        
-        enemy._health -= projectile._damage
-        projectile._pierce -= 1
-        if enemy._health <= 0:
-            projectile.parentTower.add_kill()
-        if self.game_state.record: self.history_recorder.record_event("projectile_hit", {
-            "projectile_type": projectile.__class__.__name__,
-            "target_enemy": enemy.__class__.__name__,
-            "position": (projectile.pos().x(), projectile.pos().y())
-        })
-    def _handle_projectile_death(self, projectile):
-        """Process projectile expiration"""
-        if isinstance(projectile, BombProjectile):
-            explosion = ExplosionProjectile(projectile.pos(),None,projectile.parentTower,self.animations["explosion_projectile"])
-            self.add_projectile(explosion)
-        if self.game_state.record: self.history_recorder.record_event("projectile_expired", {
-            "projectile_type": projectile.__class__.__name__,
-            "position": (projectile.pos().x(), projectile.pos().y())
-        })
-        self.removeItem(projectile)
-        self.game_items['projectiles'].remove(projectile)
-    def _update_projectiles(self):
-        """Move projectiles and check lifespan"""
-        for projectile in self.game_items['projectiles']:
-            projectile.advance_animation(8)
-            if projectile.is_expired():
-                self._handle_projectile_death(projectile)
-            
-            
-
-    # ----------------------
-    # Collision Detection
-    # ----------------------
-    def _check_collisions(self):
-        """Detect and handle collisions"""
-        for projectile in self.game_items['projectiles']:
-            colliding = self.collidingItems(projectile)
-            for item in colliding:
-                if isinstance(item, Rat) or isinstance(item, FastRat) or isinstance(item, GiantRat):
-                    print(f"{projectile.__class__.__name__} hit {item.__class__.__name__}: {item._health} health left")
-                    self._handle_projectile_hit(projectile, item)
+        """Follow the view's visible area (GameView.viewport_changed) with the map chunk cache"""
+        self.viewport_rect = viewport_rect
+        self.map_graphics_manager.set_viewport(viewport_rect)
 
     # ----------------------
     # Item Management
     # ----------------------
     def add_tower(self, tower, pos):
         """Register new tower"""
-        new_tower = None
-        if(tower.name == "basic"):
-            new_tower = BasicTower(pos,self.animations["basic_tower"])
-        
-        elif(tower.name == "bomb"):
-            new_tower = BombTower(pos,self.animations["bomb_tower"])
-        elif(tower.name == "booster"):
-            new_tower = BoosterTower(pos,self.animations["booster_tower"])
-            #boost towers around it
-            self.boost_around_tower(new_tower)
-        self.game_items['towers'].append(new_tower)
-        self.addItem(new_tower)
-        if self.game_state.record: self.history_recorder.record_event("tower_placed", {
-            "tower_type": new_tower.__class__.__name__,
-            "tower_id": new_tower.tower_id,
-            "position": (pos.x(), pos.y()),
-            "cost": new_tower.cost
-        })
+        new_tower = self.simulation.place_tower(tower.name, pos.x(), pos.y())
+        self._render_frame()
         if self.multiplayer and not hasattr(tower, '_network_event'):
             self.network.send_event(GameNetworkEvent.PLACE_TOWER, {
                 "tower_type": tower.name,
                 "x": pos.x(),
                 "y": pos.y(),
-                "tower_id": new_tower.tower_id
+                "tower_id": new_tower.tower_id,
+                "targeting": new_tower.targeting
             })
-        
-    def boost_around_tower(self,tower):
-        """Boost towers around the tower"""
-        for item in self.items():
-            if isinstance(item, BaseTowerItem) and item != tower:
-                if tower.collidesWithItem(item):
-                    tower.boost_tower(item)
-    def add_projectile(self, projectile):
-        """Register new projectile"""
-        self.game_items['projectiles'].append(projectile)
-        self.addItem(projectile)
-
-    def spawn_enemy(self):
-        """Create and register new enemy"""
-        enemy = None
-        if not self.game_state.enemies_to_spawn:
-            self.spawn_timer.stop()
-        if self.game_state.enemies_to_spawn[0] == "rat":
-            enemy = Rat(path=self.path_points, animation=self.animations["rat"])
-        if self.game_state.enemies_to_spawn[0] == "fast_rat":
-            enemy = FastRat(path=self.path_points, animation=self.animations["fast_rat"])
-        if self.game_state.enemies_to_spawn[0] == "giant_rat":
-            enemy = GiantRat(path=self.path_points, animation=self.animations["giant_rat"])
-        if enemy:
-            self.game_state.enemies_to_spawn.pop(0)
-        self.game_items['enemies'].append(enemy)
-        self.addItem(enemy)
-        enemy.setPos(self.path_points[0])
-        if self.game_state.record: self.history_recorder.record_event("enemy_spawned", {
-            "enemy_type": enemy.__class__.__name__,
-            "enemy_id": enemy.enemy_id,
-            "position": (enemy.pos().x(), enemy.pos().y())
-        })
-        if self.multiplayer and not hasattr(enemy, '_network_event'):
+        return new_tower
+
+    def _on_enemy_spawned(self, enemy_id):
+        """Share enemies spawned by the host's wave with the other player"""
+        if self.multiplayer:
+            enemies = self.simulation.enemies
+            row = enemies.row_of(enemy_id)
+            x, y = enemies.position(row)
             self.network.send_event(GameNetworkEvent.SPAWN_ENEMY, {
-                "enemy_type": enemy.__class__.__name__,
-                "x": enemy.pos().x(),
-                "y": enemy.pos().y(),
-                "enemy_id": enemy.enemy_id
+                "enemy_type": enemies.class_name(row),
+                "x": x,
+                "y": y,
+                "enemy_id": enemy_id
             })
 
 
@@ -495,16 +435,8 @@ class GameScene(QGraphicsScene):
     @Slot(object)
     def handle_tower_sale(self, tower):
         """Handle tower sale"""
-        self.game_items['towers'].remove(tower)
-        refund = tower.cost // 2
-        self.game_state.gold += refund
-        self.removeItem(tower)
-        if self.game_state.record: self.history_recorder.record_event("tower_sold", {
-            "tower_type": tower.__class__.__name__,
-            "tower_id": tower.tower_id,
-            "position": (tower.pos().x(), tower.pos().y()),
-            "refund": refund
-        })
+        refund = self.simulation.sell_tower(tower.tower)
+        self._render_frame()
         # Send network event in multiplayer
         if self.multiplayer:
             self.network.send_event(GameNetworkEvent.TOWER_SELL, {
@@ -518,24 +450,23 @@ class GameScene(QGraphicsScene):
     @Slot(object)
     def handle_tower_upgrade(self, tower):
         """Handle tower upgrade"""
-        if self.game_state.gold >= tower.upgrade_cost:
-            self.game_state.gold -= tower.upgrade_cost
-            # Pass any value - it's not used but required for the setter
-            tower.upgrade_level = 0  # The actual value doesn't matter
-            tower.upgrade()  # Call the tower's upgrade method to update stats
-            if self.game_state.record: self.history_recorder.record_event("tower_upgraded", {
-                "tower_type": tower.__class__.__name__,
-                "tower_id": tower.tower_id,
-                "position": (tower.pos().x(), tower.pos().y()),
-                "upgrade_level": tower.upgrade_level,
-                "cost": tower.upgrade_cost
-            })
-        # Send network event in multiplayer
-        if self.multiplayer:
-            self.network.send_event(GameNetworkEvent.TOWER_UPGRADE, {
-                "tower_id": tower.tower_id,
-                "upgrade_level": tower._upgrade_level
-            })
+        if self.simulation.upgrade_tower(tower.tower):
+            self._render_frame()
+            # Send network event in multiplayer
+            if self.multiplayer:
+                self.network.send_event(GameNetworkEvent.TOWER_UPGRADE, {
+                    "tower_id": tower.tower_id,
+                    "upgrade_level": tower.upgrade_level
+                })
+    @Slot(object, str)
+    def handle_tower_targeting(self, tower, targeting):
+        """Change a tower's targeting mode"""
+        if self.simulation.set_tower_targeting(tower.tower, targeting):
+            if self.multiplayer:
+                self.network.send_event(GameNetworkEvent.TOWER_TARGETING, {
+                    "tower_id": tower.tower_id,
+                    "targeting": targeting
+                })
     @Slot(object)
     def handle_tower_selection(self, tower):
         """Display tower range"""
@@ -553,14 +484,14 @@ class GameScene(QGraphicsScene):
 
     def eventFilter(self, source, event):
         if event.type() == QEvent.GraphicsSceneMouseMove:
+            self.placement_ghost.setPos(event.scenePos())
             #Check if in valid position
             if self.is_valid_position(self.placement_ghost):
-                print("Valid position")
+                placement_log.debug("Valid position")
                 self.placement_ghost.valid = True
             else:
-                print("Invalid position")
+                placement_log.debug("Invalid position")
                 self.placement_ghost.valid = False
-            self.placement_ghost.setPos(event.scenePos())
         elif event.type() == QEvent.GraphicsSceneMousePress:
             if self.placement_ghost.valid:
                 self.finalize_placement(event.scenePos())
@@ -573,7 +504,7 @@ class GameScene(QGraphicsScene):
         self.cleanup_placement()
 
     def cleanup_placement(self):
-        print("Cleaning up placement")
+        placement_log.debug("Cleaning up placement")
         self.removeItem(self.placement_ghost)
         self.placement_ghost = None
         self.removeEventFilter(self)
@@ -583,103 +514,75 @@ class GameScene(QGraphicsScene):
     # Helper Methods
     # ----------------------
     def is_valid_position(self,check_item):
-        """Check if shape intersects with other item shapes"""
-        for item in self.items():
-            if item.isVisible() and item.collidesWithItem(check_item) and (isinstance(item, PathItem) or isinstance(item, ObstacleItem) or  isinstance(item, BaseTowerItem)):
-                print(f"Collision with {item}")
-                return False
+        """Check if an item (the placement ghost) stands where a tower can be placed"""
+        return self.can_place_at(check_item.pos())
+
+    def can_place_at(self, pos):
+        """Check a scene position against the occupancy grid (terrain, towers and, in multiplayer, our half)"""
+        side = None
         if self.multiplayer:
-            x_position = check_item.pos().x()
-            map_center = self.map_width * cfg.TILE_SIZE / 2
-            
-            # Check if position is on the correct side for this player
-            if self.player_side == "left" and x_position >= map_center:
-                return False
-            elif self.player_side == "right" and x_position < map_center:
-                return False
-        return True
+            side = LEFT if self.player_side == "left" else RIGHT
+        return self.simulation.can_place_tower(pos.x(), pos.y(), side)
     # ----------------------
     # Replay Methods
     # ----------------------
-    def prepare_for_replay(self,path,grid):
+    def prepare_for_replay(self,path,grid,seed=None):
         """Prepare the scene for replay"""
         # Clear current game state
         self.game_active = False
-        self.reset_game_state(path,grid)
+        self.reset_game_state(path,grid,seed)
 
-    def reset_game_state(self,path,grid):
+    def reset_game_state(self,path,grid,seed=None):
         """Reset the game state for replaying"""
         # Clear all entities
+        self.renderer.clear()
+        self.current_range_indicator = None
         for item in self.items():
             self.removeItem(item)
         
+        #load map
+        self.map_generator = MapGenerator.from_grid(grid, path)
+        grid = self.map_generator.grid
+        self.map_height, self.map_width = grid.shape
+        self.path_points = []
+        for p in path:
+            self.path_points.append(self.grid_to_scene(p))
         # Reset game state variables
-        self.game_state.gold = cfg.BASE_GOLD
-        self.game_state.lives = cfg.BASE_LIVES
-        self.game_state.score = 0
-        self.game_state.wave = 1
+        self.simulation.reset([(p.x(), p.y()) for p in self.path_points], seed)
+        self.simulation.set_map_grid(grid)
         self.game_state.record = False
-        self.game_items['towers'] = []
-        self.game_items['enemies'] = []
-        self.game_items['projectiles'] = []
         # Notify UI
         self.game_state.gold_changed.emit(self.game_state.gold)
         self.game_state.lives_changed.emit(self.game_state.lives)
+        self.game_state.sync()
 
-        #load map
-        self.path_points = []
-        for p in path:
-            self.path_points.append(self.grid_to_scene(p))
-            print(p)
-        self.map_graphics_manager = MapGraphicsManager(grid, 16, self.tileset)
-        for item in self.map_graphics_manager.create_items():
-            self.addItem(item)
+        self._set_map_layer(grid)
         
         self.game_active = True
-        self.game_timer.start()
+        self._start_game_timer()
 
     def cleanup_after_replay(self):
         """Clean up after replay finishes"""
         # Can be used to reset the game state if needed
         pass
 
-    def replay_place_tower(self, tower_type, position):
+    def replay_place_tower(self, tower_type, position, tower_id=None, targeting="first"):
         """Place a tower during replay"""
 
-        # Create tower based on type
-        tower = None
-        print(f"Placing tower: {tower_type} at {position}")
-        if tower_type == "BasicTower":
-            tower = BasicTower(position, self.animations["basic_tower"])
-        elif tower_type == "BombTower":
-            tower = BombTower(position, self.animations["bomb_tower"])
-        elif tower_type == "BoosterTower":
-            tower = BoosterTower(position, self.animations["booster_tower"])
-
-        if tower:
-            self.addItem(tower)
-            self.game_items['towers'].append(tower)
-            print(f"Placed tower: {tower.__class__.__name__} at {position}")
+        replay_log.debug("Placing tower: %s at %s", tower_type, position)
+        kind = TOWER_KINDS.get(tower_type)
+        if kind:
+            tower = self.simulation.place_tower(kind, position.x(), position.y(), tower_id, targeting)
+            replay_log.debug("Placed tower: %s at %s", tower.class_name, position)
             # No need to deduct gold in replay mode
 
     def replay_spawn_enemy(self, enemy_type,enemy_id):
         """Spawn an enemy during replay"""
 
-        # Create enemy based on type
-        enemy = None
-        if enemy_type == "Rat":
-            enemy = Rat(self.path_points,enemy_id,self.animations["rat"])
-        elif enemy_type == "FastRat":
-            enemy = FastRat(self.path_points,enemy_id, self.animations["fast_rat"])
-        elif enemy_type == "GiantRat":
-            enemy = GiantRat(self.path_points,enemy_id, self.animations["giant_rat"])
-
-        if enemy:
-            self.addItem(enemy)
-            self.game_items['enemies'].append(enemy)
-            
-            enemy.setPos(self.path_points[0])
-            print(f"Spawned enemy: {enemy.__class__.__name__} at {self.path_points[0]}")
+        kind = ENEMY_KINDS.get(enemy_type)
+        if kind:
+            self.simulation.spawn_enemy(kind, enemy_id)
+            replay_log.debug("Spawned enemy: %s at %s", enemy_type, self.path_points[0])
 
     # def replay_kill_enemy(self, enemy_id, gold):
     #     """Kill an enemy during replay"""
@@ -697,43 +600,45 @@ class GameScene(QGraphicsScene):
 
     def replay_start_wave(self, wave_number):
         """Start a wave during replay"""
-        self.game_state.current_wave = wave_number
+        self.game_state.wave = wave_number
         self.game_state.wave_started = True
-        print(f"Starting wave {wave_number}")
+        replay_log.info("Starting wave %s", wave_number)
 
     def replay_end_wave(self):
         """End the current wave during replay"""
         self.game_state.wave_started = False
-        print(f"Ending wave {self.game_state.current_wave}")
+        replay_log.info("Ending wave %s", self.game_state.wave)
 
     def replay_game_end(self):
         """Handle game end during replay"""
         self.game_active = False
-        print("Game ended during replay")
+        replay_log.info("Game ended during replay")
     def replay_tower_upgrade(self, tower_id, upgrade_level):
         """Upgrade a tower during replay"""
         # Find the tower by ID and upgrade it
-        tower = next(filter(lambda t: t.tower_id == tower_id, self.game_items['towers']), None)
+        tower = self.simulation.find_tower(tower_id)
         if tower:
-            tower.upgrade_level = upgrade_level
             tower.upgrade()
-            print(f"Upgraded tower: {tower.__class__.__name__} to level {upgrade_level}")
+            self.simulation.refresh_tower(tower)
+            replay_log.debug("Upgraded tower: %s to level %s", tower.class_name, tower.upgrade_level)
+        else:
+            replay_log.warning("Tower with ID %s not found for upgrade", tower_id)
+    def replay_tower_targeting(self, tower_id, targeting):
+        """Change a tower's targeting mode during replay"""
+        tower = self.simulation.find_tower(tower_id)
+        if tower:
+            self.simulation.set_tower_targeting(tower, targeting)
         else:
-            print(f"Tower with ID {tower_id} not found for upgrade")
+            replay_log.warning("Tower with ID %s not found for targeting change", tower_id)
     def replay_tower_sell(self, tower_id):
         """Sell a tower during replay"""
         # Find the tower by ID and remove it
-        tower = next(filter(lambda t: t.tower_id == tower_id, self.game_items['towers']), None)
+        tower = self.simulation.find_tower(tower_id)
         if tower:
-            self.removeItem(tower)
-            self.game_items['towers'].remove(tower)
-            print(f"Sold tower: {tower.__class__.__name__}")
+            self.simulation.remove_tower(tower)
+            replay_log.debug("Sold tower: %s", tower.class_name)
         else:
-            print(f"Tower with ID {tower_id} not found for selling")
-    def update_timer_interval(self, interval):
-        """Update the timer interval with playback speed for game speed"""
-        self.game_timer.setInterval(interval)
-        self.spawn_timer.setInterval(interval)
+            replay_log.warning("Tower with ID %s not found for selling", tower_id)
     # ----------------------
     # Network Methods
     # ----------------------
@@ -761,31 +666,31 @@ class GameScene(QGraphicsScene):
         else:
             self.player_side = "right"
         
-        print(f"Connected as player: {player_id} on {self.player_side} side")
+        network_log.info("Connected as player: %s on %s side", player_id, self.player_side)
     
     def _on_network_disconnected(self):
         """Handle disconnection"""
         self.game_active = False
-        print("Disconnected from network game")
+        network_log.info("Disconnected from network game")
     
     def _on_player_joined(self, player_id):
         """Handle another player joining"""
-        print(f"Player joined: {player_id}")
+        network_log.info("Player joined: %s", player_id)
         self.player_joined.emit(player_id)
 
         # Send current game state if we're the host
         if self.is_host:
-            print("Sending current game state to new player...")
+            network_log.info("Sending current game state to new player...")
             self._on_state_request()
     
     def _on_player_left(self, player_id):
         """Handle player leaving"""
-        print(f"Player left: {player_id}")
+        network_log.info("Player left: %s", player_id)
         self.player_left.emit(player_id)
     
     def _on_network_error(self, error_msg):
         """Handle network error"""
-        print(f"Network error: {error_msg}")
+        network_log.error("Network error: %s", error_msg)
     
     def _on_network_event(self, event):
         """Process incoming network event"""
@@ -800,37 +705,18 @@ class GameScene(QGraphicsScene):
         # Handle different event types
         if event_type == GameNetworkEvent.SYNC_STATE:
             # Received a game state sync from the host
-            print("Received game state from host")
+            network_log.info("Received game state from host")
             self.apply_network_state(data)
         elif event_type == GameNetworkEvent.PLACE_TOWER:
             # Another player placed a tower
             tower_type = data["tower_type"]
-            pos = QPointF(data["x"], data["y"])
             tower_id = data.get("tower_id", None)  # Get tower ID if provided
 
             # Create the actual tower directly (not a ghost)
-            if tower_type == "basic":
-                tower = BasicTower(pos, self.animations["basic_tower"], tower_id)
-                tower._network_event = True  # Mark as network-sourced to avoid loops
-                self.game_items['towers'].append(tower)
-                self.addItem(tower)
-                print(f"Network: Added {tower_type} tower at {pos}")
-
-            elif tower_type == "bomb":
-                tower = BombTower(pos, self.animations["bomb_tower"], tower_id)
-                tower._network_event = True
-                self.game_items['towers'].append(tower)
-                self.addItem(tower)
-                print(f"Network: Added {tower_type} tower at {pos}")
-
-            elif tower_type == "booster":
-                tower = BoosterTower(pos, self.animations["booster_tower"], tower_id)
-                tower._network_event = True
-                self.game_items['towers'].append(tower)
-                self.addItem(tower)
-                # Apply booster effect
-                self.boost_around_tower(tower)
-                print(f"Network: Added {tower_type} tower at {pos}")
+            if tower_type in TOWER_TYPES:
+                self.simulation.place_tower(tower_type, data["x"], data["y"], tower_id,
+                                            data.get("targeting", "first"))
+                network_log.debug("Added %s tower at %s, %s", tower_type, data['x'], data['y'])
             
         elif event_type == GameNetworkEvent.START_WAVE:
             # Wave was started by host
@@ -838,59 +724,52 @@ class GameScene(QGraphicsScene):
                 # Handle wave start as client
                 self.game_state.wave = data["wave_number"]
                 self.game_state.wave_started = True
-                print(f"Network: Wave {self.game_state.wave} started")
+                network_log.info("Wave %s started", self.game_state.wave)
         elif event_type == GameNetworkEvent.SPAWN_ENEMY:
             # Another player spawned an enemy
-            enemy_type = data["enemy_type"]
-            enemy_id = data["enemy_id"]
+            kind = ENEMY_KINDS.get(data["enemy_type"])
 
             # Create the actual enemy directly (not a ghost)
-            if enemy_type == "Rat":
-                enemy = Rat(self.path_points,enemy_id,self.animations["rat"])
-            elif enemy_type == "FastRat":
-                enemy = FastRat(self.path_points,enemy_id, self.animations["fast_rat"])
-            elif enemy_type == "GiantRat":
-                enemy = GiantRat(self.path_points,enemy_id, self.animations["giant_rat"])
-
-            if enemy:
-                self.game_items['enemies'].append(enemy)
-                self.addItem(enemy)
-                enemy.setPos(self.path_points[0])
-                print(f"Network: Spawned {enemy_type} at {self.path_points[0]}")
+            if kind:
+                self.simulation.spawn_enemy(kind, data["enemy_id"])
+                network_log.debug("Spawned %s at %s", data['enemy_type'], self.path_points[0])
         elif event_type == GameNetworkEvent.TOWER_UPGRADE:
             # Another player upgraded a tower
             tower_id = data["tower_id"]
             # Find the tower with matching ID
-            tower = next((t for t in self.game_items['towers'] if t.tower_id == tower_id), None)
+            tower = self.simulation.find_tower(tower_id)
             if tower:
-                tower.upgrade_level = 0  # Trigger upgrade
                 tower.upgrade()
-                print(f"Network: Upgraded tower {tower_id}")
+                self.simulation.refresh_tower(tower)
+                network_log.debug("Upgraded tower %s", tower_id)
 
     
             
+        elif event_type == GameNetworkEvent.TOWER_TARGETING:
+            # Another player changed a tower's targeting mode
+            tower = self.simulation.find_tower(data["tower_id"])
+            if tower:
+                self.simulation.set_tower_targeting(tower, data["targeting"])
+                network_log.debug("Tower %s now targets %s", data['tower_id'], data['targeting'])
         elif event_type == GameNetworkEvent.TOWER_SELL:
             # Another player sold a tower
             tower_id = data["tower_id"]
             # Find the tower with matching ID
-            tower = next((t for t in self.game_items['towers'] if t.tower_id == tower_id), None)
+            tower = self.simulation.find_tower(tower_id)
             if tower:
-                self.removeItem(tower)
-                self.game_items['towers'].remove(tower)
-                print(f"Network: Sold tower {tower_id}")
+                self.simulation.remove_tower(tower)
+                network_log.debug("Sold tower %s", tower_id)
         elif event_type == GameNetworkEvent.ENEMY_KILLED:
             # Handle enemy killed remotely - for proper sync in case of lag
             enemy_id = data.get("enemy_id")
             gold_earned = data.get("gold", 0)
 
-            # Find the enemy with matching ID
-            enemy = next((e for e in self.game_items['enemies'] if e.enemy_id == enemy_id), None)
-            if enemy:
+            # Remove the enemy with matching ID
+            if self.simulation.remove_enemy(enemy_id):
                 self.game_state.gold += gold_earned
-                self.removeItem(enemy)
-                self.game_items['enemies'].remove(enemy)
-                print(f"Network: Enemy {enemy_id} killed")
+                network_log.debug("Enemy %s killed", enemy_id)
         
+        self._render_frame()
         # Emit the event for UI to handle
         self.network_event.emit(event)
     def serialize_game_state(self):
@@ -902,25 +781,27 @@ class GameScene(QGraphicsScene):
 
         # Serialize towers
         towers_data = []
-        for tower in self.game_items['towers']:
+        for tower in self.simulation.towers:
             tower_data = {
-                "type": tower.__class__.__name__,
-                "position": [tower.pos().x(), tower.pos().y()],
-                "upgrade_level": tower._upgrade_level,
+                "type": tower.class_name,
+                "position": [tower.x, tower.y],
+                "upgrade_level": tower.upgrade_level,
                 "tower_id": tower.tower_id,
-                "kills": tower.kills
+                "kills": tower.kills,
+                "targeting": tower.targeting
             }
             towers_data.append(tower_data)
 
-        # Build complete state
+        # Build complete state, the map goes compressed so its size follows its content, not its area
         state = {
-            "grid": self.map_generator.grid,
+            "map": encode_grid(self.map_generator.grid),
             "path": path_data,
             "towers": towers_data,
             "gold": self.game_state.gold,
             "lives": self.game_state.lives,
             "wave": self.game_state.wave,
-            "wave_started": self.game_state.wave_started
+            "wave_started": self.game_state.wave_started,
+            "seed": self.simulation.seed
         }
 
         return state
@@ -932,37 +813,36 @@ class GameScene(QGraphicsScene):
             return
 
         # Process map and path data if available
-        if "grid" in state_data and "path" in state_data:
+        if ("map" in state_data or "grid" in state_data) and "path" in state_data:
             # Clear existing map
+            self.renderer.clear()
+            self.current_range_indicator = None
             for item in self.items():
                 self.removeItem(item)
 
-            # Reset game state containers
-            self.game_items = {
-                "towers": [],
-                "enemies": [],
-                "projectiles": []
-            }
-
             # Apply map data
-            grid = state_data["grid"]
+            grid = decode_grid(state_data.get("map", state_data.get("grid")))
+            self.map_height, self.map_width = grid.shape
             path_data = state_data["path"]
 
             # Convert path coordinates to QPointF objects
             self.path_points = []
             for p in path_data:
                 self.path_points.append(QPointF(p[0], p[1]))
+            # The host's map replaces ours, for recording, re-serializing and the AI
+            self.map_generator = MapGenerator.from_grid(grid, [self.scene_to_grid(p) for p in self.path_points])
+            self.simulation.clear_entities()
+            self.simulation.set_path(path_data)
+            self.simulation.set_map_grid(grid)
 
             # Recreate map graphics
-            self.map_graphics_manager = MapGraphicsManager(grid, 16, self.tileset)
-            for item in self.map_graphics_manager.create_items():
-                self.addItem(item)
+            self._set_map_layer(grid)
 
             # Recreate the map divider for multiplayer
             if self.multiplayer:
                 divider_path = QPainterPath()
                 divider_path.moveTo(self.map_width * cfg.TILE_SIZE / 2, 0)
-                divider_path.lineTo(self.map_width * cfg.TILE_SIZE / 2, cfg.MAP_HEIGHT * cfg.TILE_SIZE)
+                divider_path.lineTo(self.map_width * cfg.TILE_SIZE / 2, self.map_height * cfg.TILE_SIZE)
 
                 self.map_divider = QGraphicsPathItem(divider_path)
                 pen = QPen(QColor(255, 255, 0))
@@ -975,36 +855,21 @@ class GameScene(QGraphicsScene):
         # Apply tower data
         if "towers" in state_data:
             # Clear existing towers
-            for tower in list(self.game_items['towers']):
-                self.removeItem(tower)
-            self.game_items['towers'] = []
+            for tower in list(self.simulation.towers):
+                self.simulation.remove_tower(tower)
 
             # Add towers from state
             for tower_data in state_data["towers"]:
-                tower_type = tower_data["type"]
-                position = QPointF(tower_data["position"][0], tower_data["position"][1])
-                tower_id = tower_data["tower_id"]
-
-                tower = None
-                if tower_type == "BasicTower":
-                    tower = BasicTower(position, self.animations["basic_tower"], tower_id)
-                elif tower_type == "BombTower":
-                    tower = BombTower(position, self.animations["bomb_tower"], tower_id)
-                elif tower_type == "BoosterTower":
-                    tower = BoosterTower(position, self.animations["booster_tower"], tower_id)
-
-                if tower:
-                    # Set tower properties
-                    tower._upgrade_level = tower_data.get("upgrade_level", 0)
-                    tower.kills = tower_data.get("kills", 0)
-
-                    # Apply upgrade if needed
-                    if tower._upgrade_level > 0:
+                kind = TOWER_KINDS.get(tower_data["type"])
+                if kind:
+                    position = tower_data["position"]
+                    tower = self.simulation.place_tower(kind, position[0], position[1], tower_data["tower_id"],
+                                                        tower_data.get("targeting", "first"))
+                    # Apply upgrades if needed
+                    for _ in range(tower_data.get("upgrade_level", 0)):
                         tower.upgrade()
-
-                    # Add to scene
-                    self.game_items['towers'].append(tower)
-                    self.addItem(tower)
+                    self.simulation.refresh_tower(tower)
+                    tower.kills = tower_data.get("kills", 0)
 
         # Apply game state values
         if "gold" in state_data:
@@ -1015,6 +880,9 @@ class GameScene(QGraphicsScene):
             self.game_state.wave = state_data["wave"]
         if "wave_started" in state_data:
             self.game_state.wave_started = state_data["wave_started"]
+        if "seed" in state_data:
+            self.simulation.set_seed(state_data["seed"])
+        self._render_frame()
     def _on_state_request(self):
         """Handle request for game state (host only)"""
         if not self.is_host:
@@ -1023,33 +891,14 @@ class GameScene(QGraphicsScene):
         # Serialize and send the current game state
         state_data = self.serialize_game_state()
         self.network.send_game_state(state_data)
-        print("Sent game state to newly connected player")
+        network_log.info("Sent game state to newly connected player")
     def advance_for_training(self):
         """Advance the game state without using timers (for AI training)"""
-        # Skip the timer-based operations, just update game state
-        self._update_enemies()
-        self._update_towers() 
-        self._update_projectiles()
-        self._check_collisions()
-        self._cleanup_items()
+        # Skip rendering, just update game state
+        self.simulation.step()
     def start_wave_training(self):
         """Start a new wave of enemies specifically for training, bypassing network checks"""
-        # Prepare enemy wave data
-        enemies = {}
-        self.game_state.wave_started = True
-        
-        if self.game_state.wave > len(ENEMY_LIST):
-            enemies = build_new_wave(self.game_state.wave)
-        else:
-            enemies = ENEMY_LIST[self.game_state.wave-1]
-            
         # Queue up enemies to spawn
         self.game_state.enemies_to_spawn = []
-        for enemy_type in enemies:
-            enemies_to_spawn = enemies[enemy_type]
-            for _ in range(enemies_to_spawn):
-                self.game_state.enemies_to_spawn.append(enemy_type.lower())
-        
-        random.shuffle(self.game_state.enemies_to_spawn)
-        
-        # Note: We don't start spawn_timer here since we're handling enemy spawns manually in training
\ No newline at end of file
+        self.simulation.start_wave()
+        # Note: enemies are spawned by the simulation itself as it advances
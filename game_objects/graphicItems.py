@@ -4,7 +4,6 @@ from game_objects.animationManager import SpriteSheet, AnimationComponent
 from PySide6.QtGui import QPainter, QPainterPath, QColor, QBrush,QPixmap
 from game_objects.animationManager import AnimationComponent
 from abc import ABC, abstractmethod
-from uuid import uuid4
 
 import math
 class BaseItem(QGraphicsObject):
@@ -121,74 +120,32 @@ class BaseItem(QGraphicsObject):
         # Draw the pixmap centered
         painter.drawPixmap(QRectF(x, y, pixmap.width(), pixmap.height()), pixmap, pixmap.rect())
         #painter.restore()
-class MapItem(QGraphicsItem):
-    def __init__(self, pixmap):
-        super().__init__()
-        self._image :QPixmap = pixmap
-        self.setZValue(-10)  # Below other items
-
-    def boundingRect(self) -> QRectF:
-        return QRectF(0, 0, self._image.width(), self._image.height())
-
-    def paint(self, painter, option, widget):
-        painter.drawPixmap(self._image.rect().topLeft(), self._image)
-class ObstacleItem(QGraphicsItem):
-    def __init__(self, pixmap):
-        super().__init__()
-        self._image = pixmap
-        self.setZValue(-1)  # Below other items
-
-    def boundingRect(self) -> QRectF:
-        return QRectF(0, 0, self._image.width(), self._image.height())
-
-    def paint(self, painter, option, widget):
-        painter.drawPixmap(self._image.rect().topLeft(), self._image)
-class PathItem(QGraphicsItem):
-    def __init__(self, pixmap):
-        super().__init__()
-        self._image = pixmap
-        self.setZValue(-1)  # Below other items
-
-    def boundingRect(self) -> QRectF:
-        return QRectF(0, 0, self._image.width(), self._image.height())
-
-    def paint(self, painter, option, widget):
-        painter.drawPixmap(self._image.rect().topLeft(), self._image)
         
         
 
 class BaseTowerItem(BaseItem):
     kills_changed = Signal(int) # Emit when kills change
-    def __init__(self, pos, animation=None,tower_id = None, max_upgrade_level=3):
+    def __init__(self, tower=None, animation=None):
         super().__init__(animation=animation)
         self.set_z_value(1)
-        self.setPos(pos)
         self.setFlag(QGraphicsItem.ItemIsSelectable, True)
         self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
         self.setAcceptHoverEvents(True)
         self.setAcceptDrops(True)
-        self.cost = 0
-        self._color = QColor(255, 0, 0, 255)
-        self._radius = 25
-        self._damage = 10
-        self.range = 100
-        self._fire_rate = 100
-        self._target = None
-        self._selected = False
-        self._cooldown = 0
-        self.kills = 0
-        self.upgrade_cost = 20
-        self._upgrade_level = 0
-        self._boost_modifier = 1.0
-        self.max_upgrade_level = max_upgrade_level
-        self.tower_id = uuid4().hex if tower_id == None else tower_id # Unique ID for the tower
+        # Simulation entity (simulation.entities.Tower) this item displays
+        self.tower = tower
+        self._shown_upgrade_level = 0
+        self._shown_kills = 0
+        self._attacking = False
         # Store upgrade sprites
         self.upgrade_sprites = []
         if animation is not None:
             # Start from 1 and go to max_upgrade_level
-            for upgrade in range(1, max_upgrade_level + 1):
+            for upgrade in range(1, (tower.max_upgrade_level if tower else 3) + 1):
                 if upgrade in animation:  # Check if this level exists
                     self.upgrade_sprites.append(animation[upgrade])
+        if tower is not None:
+            self.setPos(tower.x, tower.y)
 
     def itemChange(self, change, value):
         if change == QGraphicsItem.ItemSelectedChange:
@@ -206,83 +163,76 @@ class BaseTowerItem(BaseItem):
         pic = self.animations.get_current_frame()
         self.paint_sprite(painter, pic)
     def can_upgrade(self,gold):
-        return True if gold >= self.upgrade_cost else False
-    @abstractmethod
-    def upgrade(self) -> None:
-        """Must implement in subclasses"""
-        pass
-    def update(self) -> None:
-        if self._cooldown > 0:
-            self._cooldown -= 1
-
-    def acquire_target(self, enemies):
-        for enemy in enemies:
-            if self.distance_between_points(self.pos(),enemy.pos()) < self.range:
-                self._target = enemy
-                return enemy
-        if(self.animations.current_anim == "attack"):
-            self.animations.set_animation("idle")
-    def should_fire(self):
-        if (self._target and self._cooldown == 0):
-            self.animations.set_animation("attack")
-            return True
-        return False
-    
+        return self.tower.can_upgrade(gold) if self.tower else False
+
+    def sync_from_entity(self, alpha=1.0) -> None:
+        """Mirror the simulated tower's state (sprite level, attack animation, kills)"""
+        tower = self.tower
+        if tower.upgrade_level != self._shown_upgrade_level:
+            self._shown_upgrade_level = tower.upgrade_level
+            if 0 < tower.upgrade_level <= len(self.upgrade_sprites):
+                # Access the appropriate sprite for this level (subtract 1 since arrays are 0-indexed)
+                self.animations.spritesheet = self.upgrade_sprites[tower.upgrade_level - 1]
+                self.update()
+        attacking = tower.target is not None
+        if attacking != self._attacking:
+            self._attacking = attacking
+            name = "attack" if attacking else "idle"
+            if name in self.animations.animations:
+                self.animations.set_animation(name)
+        if tower.kills != self._shown_kills:
+            self._shown_kills = tower.kills
+            self.kills_changed.emit(tower.kills)
 
-    def add_kill(self):
-        self.kills += 1
-        self.kills_changed.emit(self)  # Emit signal when kills change
-        print(f"Tower {self.name} has {self.kills} kills.")
-        
     def hoverEnterEvent(self, event):
         return super().hoverEnterEvent(event)
-    @Property(float)
-    def boost_modifier(self) -> int:
-        return self._boost_modifier
-    @boost_modifier.setter
-    def boost_modifier(self, value: int) -> None:
-        self._boost_modifier = value
-        self._damage = self._damage * value
-        self._upgrade_cost = self._upgrade_cost / (value/1.5)
-        self._fire_rate = self._fire_rate / value
-    @Property(float)
-    def upgrade_level(self) -> int:
-        return self._upgrade_level
 
-    @upgrade_level.setter
-    def upgrade_level(self, value) -> None:
-        # Process the upgrade
-        self._upgrade_level += 1
-        
-        # Check if we've reached the maximum level
-        if self._upgrade_level <= len(self.upgrade_sprites):
-            # Access the appropriate sprite for this level (subtract 1 since arrays are 0-indexed)
-            new_spritesheet = self.upgrade_sprites[self._upgrade_level - 1]
-            # Update the animation component with the new spritesheet
-            self.animations.spritesheet = new_spritesheet
-            print(f"Tower upgraded to level {self._upgrade_level}")
-        else:
-            print(f"Tower already at maximum level ({self._upgrade_level})")
+    # =====================
+    # Simulation state
+    # =====================
+    @property
+    def name(self):
+        return self.tower.name if self.tower else ""
+    @property
+    def tower_id(self):
+        return self.tower.tower_id if self.tower else None
+    @property
+    def cost(self):
+        return self.tower.cost if self.tower else 0
+    @property
+    def upgrade_cost(self):
+        return self.tower.upgrade_cost if self.tower else 0
+    @property
+    def targeting(self):
+        return self.tower.targeting if self.tower else None
+    @property
+    def can_target(self):
+        """Booster towers don't shoot, so they have no targeting mode"""
+        return self.tower is not None and self.tower.projectile is not None
+    @property
+    def kills(self):
+        return self.tower.kills if self.tower else 0
+    @property
+    def range(self):
+        return self.tower.range if self.tower else 0
+    @property
+    def upgrade_level(self):
+        return self.tower.upgrade_level if self.tower else 0
 class BaseEnemyItem(BaseItem):
-    def __init__(self,path,enemy_id = None,animation = None):
+    def __init__(self, enemy_id, animation = None):
         super().__init__(animation=animation)
         self.set_z_value(1)
-        self.setPos(QPointF(0, 300))
         self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
         self.setAcceptHoverEvents(True)
         self.setAcceptDrops(True)
-        
-        self._color = QColor(0, 255, 0, 255)
-        self._radius = 20
-        self._speed = 10
-        self._health = 100
-        self._path = path
-        self.enemy_id =  uuid4().hex if enemy_id == None else enemy_id # Unique ID for the enemy
-        #path[0] to punkt startowy
-        self._current_waypoint = path[1]
-        self._target = None
-        self._selected = False
-        self.value = 20
+        # enemy_id of the EnemyTable entity this item displays
+        self._enemy_id = enemy_id
+
+    def bind(self, enemy_id) -> None:
+        """Reuse a pooled item for another enemy of the same type"""
+        self._enemy_id = enemy_id
+        self.animations.reset()
+        self.facing_right = True
     def boundingRect(self) -> QRectF:
         pixmap = self.animations.get_current_frame()
         width = pixmap.width()
@@ -295,72 +245,38 @@ class BaseEnemyItem(BaseItem):
         pic = self.animations.get_current_frame()
         self.paint_sprite(painter, pic)
 
-    def update_direction(self, target_pos):
+    def update_direction(self, x):
         """Flip sprite based on movement direction"""
-        self.facing_right = target_pos.x() > self.x()
-    def update(self) -> None:
-        self.follow_path()
+        self.facing_right = x > self.x()
 
+    def sync_from_row(self, enemies, row, alpha=1.0) -> None:
+        """Move the item to the simulated enemy's position, interpolated between ticks"""
+        x, y = enemies.interpolated_position(row, alpha)
+        self.update_direction(x)
+        self.setPos(x, y)
 
-    def follow_path(self):
-        # Define a minimum waypoint proximity threshold
-        waypoint_threshold = max(5.0, self._speed)  # At least 5 pixels or the speed value
-        
-        # Check if we've reached the current waypoint or passed it
-        distance_to_waypoint = self.distance_between_points(self.pos(), self._current_waypoint)
-        
-        if distance_to_waypoint < waypoint_threshold:
-            # Get next waypoint if available
-            current_index = self._path.index(self._current_waypoint)
-            if current_index < len(self._path) - 1:
-                # Move to next waypoint
-                self._current_waypoint = self._path[current_index + 1]
-                self.update_direction(self._current_waypoint)
-        
-        # Calculate direction vector to current waypoint
-        direction = QPointF(
-            self._current_waypoint.x() - self.pos().x(),
-            self._current_waypoint.y() - self.pos().y()
-        )
-        
-        # Normalize the direction vector
-        length = math.sqrt(direction.x()**2 + direction.y()**2)
-        if length > 0:
-            normalized_dir = QPointF(direction.x() / length, direction.y() / length)
-            
-            # Scale by speed but prevent overshooting
-            move_distance = min(self._speed, distance_to_waypoint)
-            move_vector = QPointF(normalized_dir.x() * move_distance, normalized_dir.y() * move_distance)
-            
-            # Move along that direction
-            self.setPos(self.pos() + move_vector)
-        
-        # Check for stuck condition (optional)
-        # If an enemy hasn't made significant progress toward waypoint after several updates
-        # we could add some recovery logic here
+    @property
+    def enemy_id(self):
+        return self._enemy_id
 
 class ProjectileItem(BaseItem):
-    def __init__(self,pos,target,parentTower,animation = None):
+    def __init__(self, projectile, animation = None):
         super().__init__(animation=animation)
         self.set_z_value(1)
-        self.setPos(pos)
         self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
         self.setAcceptHoverEvents(True)
         self.setAcceptDrops(True)
-        
-        self._color = QColor(0, 0, 255, 255)
-        self._radius = 5
-        self._speed = 10
-        self._damage= 100
-        self._pierce = 0
-        self.parentTower = parentTower
-        self._direction = target - pos if target != None else QPointF(0, 0)
-        # Normalize the direction vector
-        direction_length = math.sqrt(self._direction.x()**2 + self._direction.y()**2)
-        if direction_length != 0:
-            self._direction /= direction_length
-        self._selected = False
-        self._lifetime = 1000
+        # Simulation entity (simulation.entities.Projectile) this item displays
+        self.projectile = projectile
+        # Pooled projectiles can change kind, the item's sprite can't
+        self.kind = projectile.kind
+        self.setPos(projectile.x, projectile.y)
+
+    def bind(self, projectile) -> None:
+        """Reuse a pooled item for another projectile"""
+        self.projectile = projectile
+        self.animations.reset()
+        self.setPos(projectile.x, projectile.y)
 
     def boundingRect(self) -> QRectF:
         pixmap = self.animations.get_current_frame()
@@ -375,18 +291,9 @@ class ProjectileItem(BaseItem):
         pic = self.animations.get_current_frame()
         self.paint_sprite(painter, pic)
 
-    
-    def update(self) -> None:
-        self.update_position()
-        self.is_expired()
-    def update_position(self):
-        self.setPos(self.pos() + self._direction * self._speed)
-        self._lifetime -= 1
-        pass
-    def is_expired(self):
-        if self._lifetime <= 0 or self._pierce < 0:
-            return True
-        return False
+    def sync_from_entity(self, alpha=1.0) -> None:
+        """Move the item to the simulated projectile's position, interpolated between ticks"""
+        self.setPos(*self.projectile.interpolated_position(alpha))
 class GhostTowerItem(QGraphicsItem):
     def __init__(self, tower_type):
         super().__init__()
@@ -0,0 +1,181 @@
+from game_objects.towers import BasicTower, BombTower, BoosterTower, BasicProjectile, BombProjectile, ExplosionProjectile
+from game_objects.enemies import Rat, FastRat, GiantRat
+from simulation.entities import Projectile
+import config.config as cfg
+
+# Simulation kind -> (view class, animation key)
+TOWER_VIEWS = {
+    "basic": (BasicTower, "basic_tower"),
+    "bomb": (BombTower, "bomb_tower"),
+    "booster": (BoosterTower, "booster_tower"),
+}
+ENEMY_VIEWS = {
+    "rat": (Rat, "rat"),
+    "fast_rat": (FastRat, "fast_rat"),
+    "giant_rat": (GiantRat, "giant_rat"),
+}
+PROJECTILE_VIEWS = {
+    "basic": (BasicProjectile, "basic_projectile"),
+    "bomb": (BombProjectile, "bomb_projectile"),
+    "explosion": (ExplosionProjectile, "explosion_projectile"),
+}
+
+# Hidden projectile items created per kind when its pool is first used
+PROJECTILE_ITEM_PREFILL = 16
+
+class ItemPool:
+    """Graphics items of one view class, hidden and left in the scene between uses"""
+    def __init__(self, scene, view_class, animation, high_water=None):
+        self.scene = scene
+        self.view_class = view_class
+        self.animation = animation
+        # Max idle items kept, None for no limit
+        self.high_water = high_water
+        self.free = []
+
+    def prefill(self, count, placeholder):
+        """Create idle items up front, bound to a placeholder entity"""
+        for _ in range(count):
+            item = self.view_class(placeholder, self.animation)
+            item.hide()
+            self.scene.addItem(item)
+            self.free.append(item)
+
+    def acquire(self, entity):
+        """Show an idle item for the entity, or create one"""
+        if self.free:
+            item = self.free.pop()
+            item.bind(entity)
+            item.show()
+            return item
+        item = self.view_class(entity, self.animation)
+        self.scene.addItem(item)
+        return item
+
+    def release(self, item):
+        """Hide the item for later reuse, or drop it above the high-water mark"""
+        if self.high_water is not None and len(self.free) >= self.high_water:
+            self.scene.removeItem(item)
+            return
+        item.hide()
+        self.free.append(item)
+
+class SceneRenderer:
+    """Mirrors GameSimulation entities into a QGraphicsScene when a frame is drawn"""
+    def __init__(self, scene, simulation, animations):
+        self.scene = scene
+        self.simulation = simulation
+        self.animations = animations
+        # entity (enemy_id for enemies) -> graphics item
+        self.tower_views = {}
+        self.enemy_views = {}
+        self.projectile_views = {}
+        # projectile kind -> ItemPool
+        self.projectile_pools = {}
+        # enemy view class -> ItemPool, kept across waves
+        self.enemy_pools = {}
+
+    def sync(self, elapsed_ms=0, alpha=1.0):
+        """Create, move and remove items so the scene matches the simulation
+
+        alpha (0..1) is how far the display is between the last two ticks
+        """
+        self._sync_group(self.simulation.towers, self.tower_views, TOWER_VIEWS, elapsed_ms, alpha)
+        self._sync_enemies(elapsed_ms, alpha)
+        # Projectiles animate at half rate, as they always have
+        self._sync_projectiles(elapsed_ms / 2, alpha)
+
+    def _sync_group(self, entities, views, view_types, elapsed_ms, alpha):
+        live = set()
+        for entity in entities:
+            live.add(entity)
+            item = views.get(entity)
+            if item is None:
+                view_class, animation_key = view_types[entity.kind]
+                item = view_class(entity, self.animations[animation_key])
+                views[entity] = item
+                self.scene.addItem(item)
+            item.sync_from_entity(alpha)
+            if elapsed_ms:
+                item.advance_animation(elapsed_ms)
+        if len(views) != len(live):
+            for entity in [e for e in views if e not in live]:
+                self.scene.removeItem(views.pop(entity))
+
+    def _projectile_pool(self, kind):
+        pool = self.projectile_pools.get(kind)
+        if pool is None:
+            view_class, animation_key = PROJECTILE_VIEWS[kind]
+            pool = ItemPool(self.scene, view_class, self.animations[animation_key])
+            pool.prefill(PROJECTILE_ITEM_PREFILL, Projectile(kind))
+            self.projectile_pools[kind] = pool
+        return pool
+
+    def _sync_projectiles(self, elapsed_ms, alpha):
+        """Projectiles are pooled in the simulation, so their items are pooled too"""
+        views = self.projectile_views
+        live = set()
+        for projectile in self.simulation.projectiles:
+            live.add(projectile)
+            item = views.get(projectile)
+            if item is not None and item.kind != projectile.kind:
+                # The pooled projectile was reused as another kind since the last frame
+                self.projectile_pools[item.kind].release(item)
+                item = None
+            if item is None:
+                item = self._projectile_pool(projectile.kind).acquire(projectile)
+                views[projectile] = item
+            item.sync_from_entity(alpha)
+            if elapsed_ms:
+                item.advance_animation(elapsed_ms)
+        if len(views) != len(live):
+            for projectile in [p for p in views if p not in live]:
+                item = views.pop(projectile)
+                self.projectile_pools[item.kind].release(item)
+
+    def _sync_enemies(self, elapsed_ms, alpha):
+        """Enemies live in a table, their items are keyed by enemy_id"""
+        enemies = self.simulation.enemies
+        views = self.enemy_views
+        for row, enemy_id in enumerate(enemies.enemy_id.tolist()):
+            item = views.get(enemy_id)
+            if item is None:
+                item = self._enemy_pool(enemies.kind(row)).acquire(enemy_id)
+                views[enemy_id] = item
+            item.sync_from_row(enemies, row, alpha)
+            if elapsed_ms:
+                item.advance_animation(elapsed_ms)
+        if len(views) != len(enemies):
+            for enemy_id in [e for e in views if e not in enemies.rows]:
+                item = views.pop(enemy_id)
+                self.enemy_pools[type(item)].release(item)
+
+    def _enemy_pool(self, kind):
+        view_class, animation_key = ENEMY_VIEWS[kind]
+        pool = self.enemy_pools.get(view_class)
+        if pool is None:
+            pool = ItemPool(self.scene, view_class, self.animations[animation_key],
+                            high_water=cfg.ENEMY_POOL_HIGH_WATER)
+            self.enemy_pools[view_class] = pool
+        return pool
+
+    def view_for(self, entity):
+        """Return the graphics item showing the given entity, if any"""
+        for views in (self.tower_views, self.enemy_views, self.projectile_views):
+            if entity in views:
+                return views[entity]
+        return None
+
+    def clear(self):
+        """Forget all items, e.g. after the scene was cleared"""
+        for views in (self.tower_views, self.enemy_views, self.projectile_views):
+            for item in views.values():
+                if item.scene() is self.scene:
+                    self.scene.removeItem(item)
+            views.clear()
+        for pool in list(self.projectile_pools.values()) + list(self.enemy_pools.values()):
+            for item in pool.free:
+                if item.scene() is self.scene:
+                    self.scene.removeItem(item)
+        self.projectile_pools = {}
+        self.enemy_pools = {}
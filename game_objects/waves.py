@@ -1,4 +1,7 @@
 import random
+from config.logs import get_logger
+
+log = get_logger("waves")
 ENEMY_LIST = [{
         "rat" : 5
     },
@@ -23,26 +26,25 @@ ENEMY_LIST = [{
         "giant_rat" : 6
     },]
 
-def build_new_wave(current_wave,):
+def build_new_wave(current_wave, rng=random):
+    """Enemy counts for waves past ENEMY_LIST, drawn from rng (the game's seeded random stream)"""
     scaling_factor = 1 + (current_wave // 5) * 0.1
     enemies_in_wave = {
-        "rat" : int(ENEMY_LIST[5]["rat"] * scaling_factor),
-        "fast_rat" : int(ENEMY_LIST[5]["fast_rat"] * scaling_factor),
-        "giant_rat" : int(ENEMY_LIST[5]["giant_rat"] * scaling_factor)
+        "rat" : int(ENEMY_LIST[-1]["rat"] * scaling_factor),
+        "fast_rat" : int(ENEMY_LIST[-1]["fast_rat"] * scaling_factor),
+        "giant_rat" : int(ENEMY_LIST[-1]["giant_rat"] * scaling_factor)
     }
-    enemies_in_wave["rat"] += random.randint(0, int(3*scaling_factor))
-    enemies_in_wave["fast_rat"] += random.randint(0, int(3*scaling_factor))
-    enemies_in_wave["giant_rat"] += random.randint(0, int(3*scaling_factor))
-    surge_chance = random.random()
+    enemies_in_wave["rat"] += rng.randint(0, int(3*scaling_factor))
+    enemies_in_wave["fast_rat"] += rng.randint(0, int(3*scaling_factor))
+    enemies_in_wave["giant_rat"] += rng.randint(0, int(3*scaling_factor))
+    surge_chance = rng.random()
     if surge_chance > 0.7:
-        enemy_type = random.choice(["rat", "fast_rat", "giant_rat"])
-        surge_amount = int(random.randint(3, 8) * scaling_factor)
-        print(f"Wave {current_wave}: Surge of {surge_amount} {enemy_type}s!")
+        enemy_type = rng.choice(["rat", "fast_rat", "giant_rat"])
+        surge_amount = int(rng.randint(3, 8) * scaling_factor)
+        log.info("Wave %s: Surge of %s %ss!", current_wave, surge_amount, enemy_type)
         enemies_in_wave[enemy_type] += surge_amount
         
-    # Increment wave number for next time
-    random.shuffle(enemies_in_wave)
-    current_wave += 1
+    # Spawn order is shuffled by the caller
     return enemies_in_wave
 
         
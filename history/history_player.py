@@ -1,6 +1,9 @@
 from PySide6.QtCore import QObject, Signal, QTimer, QPointF
+from config.logs import get_logger
 import time
 
+log = get_logger("replay")
+
 class GameHistoryPlayer(QObject):
     """Plays back recorded game history"""
     
@@ -39,14 +42,14 @@ class GameHistoryPlayer(QObject):
     def start(self, from_beginning=True):
         """Start playback of history"""
         if not self.events:
-            print("No history loaded")
+            log.warning("No history loaded")
             return False
             
         if from_beginning:
             self.current_event_index = 0
             
         if self.scene:
-            print(self.history.get("path"))
+            log.debug("Replay path: %s", self.history.get("path"))
             path = None
             if isinstance(self.history.get("path"),tuple):
                 path = self.history.get("path")[0]
@@ -110,7 +113,7 @@ class GameHistoryPlayer(QObject):
             self.start_time = current_time - (elapsed_game_time / speed)
             
         self.playback_speed = speed
-        self.scene.update_timer_interval(speed)
+        self.scene.set_game_speed(speed)
     def _process_events(self):
         """Process events according to current time"""
         if not self.is_playing or self.current_event_index >= len(self.events):
@@ -164,16 +167,17 @@ class GameHistoryPlayer(QObject):
                 path = self.history.get("path")[0]
             else:
                 path = self.history.get("path")
-            print(path)
-            self.scene.reset_game_state(path, self.history.get("map"))
+            log.debug("Replay path: %s", path)
+            self.scene.reset_game_state(path, self.history.get("map"), self.history.get("seed"))
             
         elif event_type == "tower_placed":
             # Extract tower data
-            print(f"data_type:{type(data)}")
+            log.debug("data_type: %s", type(data))
             tower_type = data.get("tower_type")
             
             pos = data.get("position")
-            self.scene.replay_place_tower(tower_type, QPointF(pos[0], pos[1]))
+            self.scene.replay_place_tower(tower_type, QPointF(pos[0], pos[1]),
+                                          data.get("tower_id"), data.get("targeting", "first"))
             
         elif event_type == "enemy_spawned":
             enemy_type = data.get("enemy_type")
@@ -188,6 +192,8 @@ class GameHistoryPlayer(QObject):
             tower_id = data.get("tower_id", 0)
             upgrade_level = data.get("upgrade_type")
             self.scene.replay_tower_upgrade(tower_id, upgrade_level)
+        elif event_type == "tower_targeting_changed":
+            self.scene.replay_tower_targeting(data.get("tower_id"), data.get("targeting"))
         elif event_type == "tower_sold":
             tower_id = data.get("tower_id", 0)
             self.scene.replay_tower_sell(tower_id)
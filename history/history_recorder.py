@@ -4,6 +4,9 @@ import xml.etree.ElementTree as ET
 import xml.dom.minidom
 from datetime import datetime
 import os
+from config.logs import get_logger
+
+log = get_logger("history")
 
 class GameHistoryRecorder:
     """Records game events for later replay and analysis"""
@@ -51,12 +54,12 @@ class GameHistoryRecorder:
             "type": event_type,
             "data": data
         }
-        print(f"Recorded event: {event}")
+        log.debug("Recorded event: %s", event)
         
         self.events.append(event)
     def export_history(self):
         if not self.events:
-            print("No events to export.")
+            log.warning("No events to export.")
             return
         history = {
             **self.metadata,
@@ -3,7 +3,7 @@ from PySide6.QtWidgets import QGraphicsScene, QGraphicsView,QLabel,QVBoxLayout,Q
 from PySide6.QtWidgets import QSplitter, QVBoxLayout, QHBoxLayout, QWidget, QLabel, QLineEdit, QPushButton, QGraphicsView
 from PySide6.QtWidgets import QProgressBar, QGroupBox
 
-from PySide6.QtWidgets import QMainWindow,  QDialog, QFormLayout, QSpinBox, QCheckBox,QMessageBox
+from PySide6.QtWidgets import QMainWindow,  QDialog, QFormLayout, QSpinBox, QCheckBox,QMessageBox,QFileDialog
 from PySide6.QtCore import Qt, Signal, Slot
 from PySide6.QtCore import Qt, QRectF, QTimer, QPoint, Signal,QObject
 from PySide6.QtWidgets import QGraphicsView, QApplication
@@ -11,6 +11,7 @@ from PySide6.QtGui import QWheelEvent, QMouseEvent, QPainter, QTransform, QActio
 from ui.ui import GameView, TowerStoreWidget,TowerOverviewWidget,MultiplayerInfoWidget
 
 from config.config_dialog import ConfigurationDialog
+from config.logs import setup_logging
 from game_objects.gameEngine import GameScene, GameState
 from tower_defense_ai import TowerDefenseAI, TrainingWorker
 
@@ -51,6 +52,18 @@ class MainWindow(QMainWindow):
         exit_action.triggered.connect(self.close)
         file_menu.addAction(exit_action)
 
+        # Debug menu
+        debug_menu = menu_bar.addMenu("Debug")
+
+        self.profiler_action = QAction("Profiler overlay", self)
+        self.profiler_action.setCheckable(True)
+        self.profiler_action.toggled.connect(lambda enable: self.view.set_profiler_overlay(enable))
+        debug_menu.addAction(self.profiler_action)
+
+        export_profile_action = QAction("Export profile...", self)
+        export_profile_action.triggered.connect(self.export_profile)
+        debug_menu.addAction(export_profile_action)
+
     def show_configuration_dialog(self):
         """Show the configuration dialog"""
         dialog = ConfigurationDialog(self, self.scene)
@@ -62,6 +75,13 @@ class MainWindow(QMainWindow):
         
         dialog.exec()
 
+    def export_profile(self):
+        """Save the profiler percentiles to a CSV or JSON file"""
+        filename, _ = QFileDialog.getSaveFileName(self, "Export profile", "profile.csv",
+                                                  "CSV (*.csv);;JSON (*.json)")
+        if filename:
+            self.scene.simulation.profiler.dump(filename)
+
     def show_internet_dialog(self):
         """Show the internet connection dialog"""
         from ui.connection_dialog import ConnectionDialog
@@ -184,16 +204,26 @@ class MainWindow(QMainWindow):
         self.scene.game_state.record_changed.connect(self.hide_uis)
         self.scene.tower_selected.connect(self.tower_overview.update_overview_ui)
         self.scene.repaint_view.connect(self.view.repaint_view)
+        self.view.viewport_changed.connect(self.scene.update_viewport)
+        self.scene.update_viewport(self.view.viewport_rect())
         
         self.store.tower_selected.connect(self.scene.start_tower_placement)
         self.tower_overview.sell_tower.connect(self.scene.handle_tower_sale)
         self.tower_overview.upgrade_tower.connect(self.scene.handle_tower_upgrade)
+        self.tower_overview.targeting_changed.connect(self.scene.handle_tower_targeting)
         self.tower_overview.tower_deselected.connect(self.scene.handle_tower_deselection)
         self.scene.tower_selected.connect(self.scene.handle_tower_selection)
         
         self.store.wave_started.connect(self.scene.start_wave)
+        self.store.speed_changed.connect(self.scene.set_game_speed)
+        if self.scene.multiplayer:
+            # Both players have to run at the same pace
+            self.store.speedButton.hide()
         self.scene.game_over_signal.connect(self.store.handle_game_over)
         self.scene.wave_ended.connect(self.store.handle_wave_end)
+        if self.profiler_action.isChecked():
+            # Keep profiling across scene changes while the overlay is on
+            self.scene.simulation.profiler.enabled = True
         
         # Add AI controls if they don't exist yet
         if not hasattr(self, 'ai_panel'):
@@ -380,6 +410,7 @@ class MainWindow(QMainWindow):
         else:
             self.ai_status.setText("AI Status: Evaluating...")
 if __name__ == "__main__":
+    setup_logging()
     app = QApplication([])
     window = MainWindow()
     window.show()
@@ -1,9 +1,16 @@
+import base64
+import logging
+import math
 import random
+import zlib
+from collections import OrderedDict
 from enum import Enum
-from PySide6.QtCore import QPointF
-from PySide6.QtGui import QPixmap
-from PySide6.QtWidgets import QGraphicsPixmapItem
-from game_objects.graphicItems import MapItem, PathItem,ObstacleItem
+import numpy as np
+from PySide6.QtCore import Qt, QRectF
+from PySide6.QtGui import QPixmap, QPainter
+from config.logs import get_logger
+
+log = get_logger("map")
 class TileType(Enum):
     EMPTY = 0
     PATH = 1
@@ -15,20 +22,40 @@ class TileType(Enum):
     
     
 class MapGenerator:
-    def __init__(self,map_width, map_height):
+    # Obstacle counts for a classic 30x30 map, larger maps get proportionally more
+    SMALL_OBSTACLES = 15
+    BIG_OBSTACLES = 3
+    BASE_AREA = 30 * 30
+
+    def __init__(self,map_width, map_height, rng=None):
+        # Random stream to draw the map from, normally the game's seeded GameSimulation.rng
+        self.rng = rng if rng is not None else random.Random()
         self.map_width = map_width
         self.map_height = map_height
         self.path = []
-        self.grid = [[TileType.EMPTY.value for _ in range(map_width)] for _ in range(map_height)]
+        # Tile types (TileType values), indexed [row, column]
+        self.grid = np.full((map_height, map_width), TileType.EMPTY.value, dtype=np.int8)
         self.generate_map_path()
         self.fill_path()
-        self.fill_path_with_obstacles()
+        scale = map_width * map_height / self.BASE_AREA
+        self.fill_path_with_obstacles(round(self.SMALL_OBSTACLES * scale), round(self.BIG_OBSTACLES * scale))
+
+    @classmethod
+    def from_grid(cls, grid, path):
+        """Generator holding an existing map (received from the host or replayed) instead of a new one"""
+        generator = cls.__new__(cls)
+        generator.rng = random.Random()
+        generator.grid = decode_grid(grid)
+        generator.map_height, generator.map_width = generator.grid.shape
+        generator.path = [tuple(point) for point in path]
+        return generator
+
     def generate_map_path(self):
 
-        start_y = random.randint(0, self.map_height - 1)
-        end_y = random.randint(0, self.map_height - 1)
+        start_y = self.rng.randint(0, self.map_height - 1)
+        end_y = self.rng.randint(0, self.map_height - 1)
         start = (0, start_y)
-        end = (self.map_height - 1, end_y)
+        end = (self.map_width - 1, end_y)
         self.path = [start]
         current = start
         direction = 'right'
@@ -36,7 +63,7 @@ class MapGenerator:
         while current[0] < end[0]:
             if direction == 'right':
                 max_steps = end[0] - current[0]
-                steps = random.randint(1, max_steps)
+                steps = self.rng.randint(1, max_steps)
                 new_x = current[0] + steps
                 new_point = (new_x, current[1])
                 self.path.append(new_point)
@@ -50,12 +77,12 @@ class MapGenerator:
                     possible_directions.append(-1)  # Down
                 if not possible_directions:
                     break
-                dir_move = random.choice(possible_directions)
+                dir_move = self.rng.choice(possible_directions)
                 if dir_move == 1:
                     max_steps = self.map_height - 1 - current[1]
                 else:
                     max_steps = current[1]
-                steps = random.randint(1, max_steps) if max_steps > 0 else 0
+                steps = self.rng.randint(1, max_steps) if max_steps > 0 else 0
                 new_y = current[1] + dir_move * steps
                 new_point = (current[0], new_y)
                 self.path.append(new_point)
@@ -66,11 +93,12 @@ class MapGenerator:
             self.path.append((current[0], end[1]))
         if self.path[-1] != end:
             self.path.append(end)
-        print("Path generated:", self.path)
+        log.debug("Path generated: %s", self.path)
 
     def fill_path(self):
 
         # Fill the path
+        grid = self.grid
         for i in range(len(self.path) - 1):
             start = self.path[i]
             end_segment = self.path[i + 1]
@@ -79,20 +107,30 @@ class MapGenerator:
             if start[0] == end_segment[0]:
                 y_min = min(start[1], end_segment[1])
                 y_max = max(start[1], end_segment[1])
-                for y in range(y_min, y_max + 1):
-                    self.grid[y][start[0]] = TileType.PATH.value
+                grid[y_min:y_max + 1, start[0]] = TileType.PATH.value
             # Horizontal movement
             else:
                 x_min = min(start[0], end_segment[0])
                 x_max = max(start[0], end_segment[0])
-                for x in range(x_min, x_max + 1):
-                    self.grid[start[1]][x] = TileType.PATH.value
+                grid[start[1], x_min:x_max + 1] = TileType.PATH.value
 
         # Mark start and end points
-        self.grid[self.path[0][1]][self.path[0][0]] = TileType.START.value
-        self.grid[self.path[-1][1]][self.path[-1][0]] = TileType.END.value
+        grid[self.path[0][1], self.path[0][0]] = TileType.START.value
+        grid[self.path[-1][1], self.path[-1][0]] = TileType.END.value
+
+    def free_anchors(self, height, width):
+        """Flat indices of the top-left cells where a height x width block covers only empty tiles"""
+        rows, cols = self.grid.shape
+        if height > rows or width > cols:
+            return np.zeros(0, dtype=np.intp)
+        # Summed-area table of occupied tiles with a zero border, any block sum is 4 lookups
+        table = np.zeros((rows + 1, cols + 1), dtype=np.int32)
+        np.cumsum(np.cumsum(self.grid != TileType.EMPTY.value, axis=0), axis=1, out=table[1:, 1:])
+        occupied = (table[height:, width:] - table[:-height, width:]
+                    - table[height:, :-width] + table[:-height, :-width])
+        anchor_rows, anchor_cols = np.nonzero(occupied == 0)
+        return anchor_rows * cols + anchor_cols
 
-        
     def fill_path_with_obstacles(self, small_obstacles=15, big_obstacles=3):
         """
         Fill the map with obstacles.
@@ -101,133 +139,184 @@ class MapGenerator:
         small_obstacles (int): Number of small (1x1) obstacles to place
         big_obstacles (int): Number of big (3x4) obstacles to place
         """
-        # Add small obstacles (1x1)
-        small_placed = 0
-        max_attempts = small_obstacles * 100  # Prevent infinite loop
-        attempts = 0
-
-        while small_placed < small_obstacles and attempts < max_attempts:
-            x = random.randint(0, self.map_width - 1)
-            y = random.randint(0, self.map_height - 1)
-            attempts += 1
-
-            # Check if position is empty
-            if self.grid[y][x] == TileType.EMPTY.value:
-                self.grid[y][x] = TileType.SMALL_OBSTACLE.value
-                small_placed += 1
-
-        # Add big obstacles (4x3)
+        grid = self.grid
+        cols = self.map_width
+        # NumPy sampling stream, derived from the seeded rng so the map stays reproducible
+        sampler = np.random.default_rng(self.rng.getrandbits(64))
+
+        # Add small obstacles (1x1) on distinct empty tiles
+        empty = np.flatnonzero(grid == TileType.EMPTY.value)
+        count = min(small_obstacles, len(empty))
+        grid.flat[sampler.choice(empty, size=count, replace=False)] = TileType.SMALL_OBSTACLE.value
+
+        # Add big obstacles (3 wide, 4 high): walk the free anchors in random order, an anchor is
+        # taken unless an obstacle placed before it now overlaps its block
+        height, width = 4, 3
+        anchors = sampler.permutation(self.free_anchors(height, width))
+        blocked = np.zeros(grid.shape, dtype=bool)
         big_placed = 0
-        max_attempts = big_obstacles * 100  # Prevent infinite loop
-        attempts = 0
-
-        while big_placed < big_obstacles and attempts < max_attempts:
-            # For a 3x4 obstacle, the top-left corner must leave room for the rest
-            x = random.randint(0, self.map_width - 3)  # 3 is the width
-            y = random.randint(0, self.map_height - 4)  # 4 is the height
-            attempts += 1
-
-            # Check if all positions for this obstacle are empty
-            can_place = True
-            for i in range(4):  # height
-                for j in range(3):  # width
-                    if y + i < self.map_height and x + j < self.map_width:
-                        if self.grid[y + i][x + j] != TileType.EMPTY.value:
-                            can_place = False
-                            break
-                if not can_place:
-                    break
-                   
-            if can_place:
-                # Place the big obstacle
-                for i in range(4):  # height
-                    for j in range(3):  # width
-                        self.grid[y + i][x + j] = TileType.BIG_OBSTACLE.value
-                big_placed += 1
-        
-        for row in self.grid:
-            print(" ".join(str(TileType(x).value) for x in row))
+        for anchor in anchors.tolist():
+            if big_placed == big_obstacles:
+                break
+            y, x = divmod(anchor, cols)
+            if blocked[y, x]:
+                continue
+            grid[y:y + height, x:x + width] = TileType.BIG_OBSTACLE.value
+            # Anchors whose block would overlap this obstacle
+            blocked[max(y - height + 1, 0):y + height, max(x - width + 1, 0):x + width] = True
+            big_placed += 1
+
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Map grid:\n%s", "\n".join(" ".join(str(x) for x in row) for row in grid))
+
+def encode_grid(grid):
+    """Compact, JSON-safe form of a map grid: its shape and the zlib-compressed tiles in base64"""
+    grid = np.asarray(grid, dtype=np.int8)
+    height, width = grid.shape if grid.ndim == 2 else (0, 0)
+    return {
+        "width": width,
+        "height": height,
+        "tiles": base64.b64encode(zlib.compress(grid.tobytes())).decode("ascii"),
+    }
+
+def decode_grid(data):
+    """Map grid as an int8 array, from encode_grid() output or a plain nested list of rows"""
+    if isinstance(data, dict):
+        tiles = np.frombuffer(zlib.decompress(base64.b64decode(data["tiles"])), dtype=np.int8)
+        return tiles.reshape(data["height"], data["width"]).copy()
+    if data is None or len(data) == 0:
+        return np.zeros((0, 0), dtype=np.int8)
+    return np.asarray(data, dtype=np.int8)
 
 class MapGraphicsManager:
-    def __init__(self, grid, tile_size, tileset):
+    """Static map layers (ground, path, obstacles) baked into chunk pixmaps drawn behind the scene;
+    chunks are rasterised when first needed and kept in an LRU cache under a memory budget"""
+    CHUNK_TILES = 32  # Tiles per side of one baked chunk
+    # Obstacle sprite sizes in tiles (rows, columns)
+    BIG_OBSTACLE_SIZE = (4, 3)
+
+    def __init__(self, grid, tile_size, tileset, memory_budget=64 * 1024 * 1024):
         """
         Initialize the MapGraphicsManager with grid data, tile size, and tileset.
         
-        :param grid: 2D list representing the map with cell types ('ground', 'path', 'small_obstacle', 'big_obstacle').
+        :param grid: Map tiles (TileType values), an array or a 2D list.
         :param tile_size: Size of each tile in pixels (assumed square).
-        :param tileset: Dictionary mapping cell types to image paths.
+        :param tileset: Dictionary mapping tile names to pixmaps.
+        :param memory_budget: Bytes of chunk pixmaps kept once they leave the view.
         """
-        self.grid = grid
+        self.grid = decode_grid(grid)
         self.tile_size = tile_size
         self.tileset = tileset
-        self.items = []
-        self.processed = None  # Track processed cells to avoid overlaps
+        self.rows, self.cols = self.grid.shape
+        self.chunk_rows = math.ceil(self.rows / self.CHUNK_TILES)
+        self.chunk_cols = math.ceil(self.cols / self.CHUNK_TILES)
+        self.memory_budget = memory_budget
+        self.memory_used = 0
+        # (chunk_row, chunk_col) -> QPixmap, least recently used first
+        self.chunks = OrderedDict()
+        # Chunks under the view, they are never evicted
+        self.visible = set()
         
         # Load all pixmaps
         self.pixmaps = {}
         for key, path in self.tileset.items():
             self.pixmaps[key] = QPixmap(path)
+        # Top-left tiles of the obstacle sprites, as (rows, columns) arrays
+        self.small_obstacles = np.nonzero(self.grid == TileType.SMALL_OBSTACLE.value)
+        self.big_obstacles = self._find_big_obstacles()
+
+    def _find_big_obstacles(self):
+        """Top-left tiles of the big obstacle blocks; blocks never overlap, so in row-major
+        order the first tile of a block not yet covered is its corner"""
+        height, width = self.BIG_OBSTACLE_SIZE
+        covered = np.zeros(self.grid.shape, dtype=bool)
+        corners = []
+        for row, col in np.argwhere(self.grid == TileType.BIG_OBSTACLE.value).tolist():
+            if not covered[row, col]:
+                corners.append((row, col))
+                covered[row:row + height, col:col + width] = True
+        corners = np.array(corners, dtype=np.intp).reshape(-1, 2)
+        return corners[:, 0], corners[:, 1]
+
+    def bounding_rect(self):
+        """Scene area covered by the map"""
+        return QRectF(0, 0, self.cols * self.tile_size, self.rows * self.tile_size)
+
+    def render_chunk(self, chunk_row, chunk_col):
+        """Rasterise the tiles of one chunk, including the parts of obstacles reaching in from its neighbours"""
+        tile = self.tile_size
+        first_row, first_col = chunk_row * self.CHUNK_TILES, chunk_col * self.CHUNK_TILES
+        last_row = min(first_row + self.CHUNK_TILES, self.rows)
+        last_col = min(first_col + self.CHUNK_TILES, self.cols)
+        pixmap = QPixmap((last_col - first_col) * tile, (last_row - first_row) * tile)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        # Chunk-local coordinates
+        painter.translate(-first_col * tile, -first_row * tile)
+
+        # 1. Base layer: ground everywhere, path tiles on top
+        ground = self.pixmaps.get('ground1')
+        if ground:
+            painter.drawTiledPixmap(first_col * tile, first_row * tile,
+                                    (last_col - first_col) * tile, (last_row - first_row) * tile, ground)
+        path = self.pixmaps.get('path_c')
+        if path:
+            window = self.grid[first_row:last_row, first_col:last_col]
+            for row, col in np.argwhere(window == TileType.PATH.value).tolist():
+                painter.drawPixmap((first_col + col) * tile, (first_row + row) * tile, path)
+
+        # 2. Obstacles on top, big ones can start up to a sprite's size before the chunk
+        layers = [('small_obstacle', self.small_obstacles, (1, 1)),
+                  ('big_obstacle', self.big_obstacles, self.BIG_OBSTACLE_SIZE)]
+        for key, (rows, cols), (height, width) in layers:
+            obstacle = self.pixmaps.get(key)
+            if not obstacle:
+                continue
+            inside = ((rows > first_row - height) & (rows < last_row) &
+                      (cols > first_col - width) & (cols < last_col))
+            for row, col in zip(rows[inside].tolist(), cols[inside].tolist()):
+                painter.drawPixmap(col * tile, row * tile, obstacle)
+        painter.end()
+        return pixmap
+
+    def _chunks_in(self, rect):
+        """Keys of the chunks intersecting a scene rect"""
+        size = self.CHUNK_TILES * self.tile_size
+        rows = range(max(int(rect.top() // size), 0), min(int(rect.bottom() // size), self.chunk_rows - 1) + 1)
+        cols = range(max(int(rect.left() // size), 0), min(int(rect.right() // size), self.chunk_cols - 1) + 1)
+        return [(chunk_row, chunk_col) for chunk_row in rows for chunk_col in cols]
+
+    def chunk(self, key):
+        """Pixmap of a chunk, rasterised on first use"""
+        pixmap = self.chunks.get(key)
+        if pixmap is not None:
+            self.chunks.move_to_end(key)
+            return pixmap
+        pixmap = self.render_chunk(*key)
+        self.chunks[key] = pixmap
+        self.memory_used += pixmap.width() * pixmap.height() * pixmap.depth() // 8
+        self._evict()
+        return pixmap
+
+    def _evict(self):
+        """Drop the least recently used chunks outside the view until the cache fits the budget"""
+        for key in list(self.chunks):
+            if self.memory_used <= self.memory_budget:
+                break
+            if key not in self.visible:
+                pixmap = self.chunks.pop(key)
+                self.memory_used -= pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+    def set_viewport(self, rect):
+        """Follow the view: chunks entering it are rasterised, the ones leaving it become evictable"""
+        visible = set(self._chunks_in(rect))
+        entering = visible - self.visible
+        self.visible = visible
+        for key in sorted(entering):
+            self.chunk(key)
 
-    def create_items(self):
-        """Create all graphics items with proper layering."""
-        self.items = []
-        rows = len(self.grid)
-        cols = len(self.grid[0]) if rows > 0 else 0
-        self.obstacle_processed = [[False]*cols for _ in range(rows)]
-
-        # 1. Draw base layer (ground/path) for all cells
-        for row in range(rows):
-            for col in range(cols):
-                base_type = 'path_c' if self.grid[row][col] == TileType.PATH.value else 'ground1'
-                self._add_base_tile(row, col, base_type)
-
-        # 2. Draw obstacles on top
-        obstacle_order = [TileType.SMALL_OBSTACLE.value, TileType.BIG_OBSTACLE.value]
-        for layer in obstacle_order:
-            for row in range(rows):
-                for col in range(cols):
-                    if self.grid[row][col] == layer and not self.obstacle_processed[row][col]:
-                        if layer == TileType.BIG_OBSTACLE.value:
-                            self._add_big_obstacle(row, col)
-                        else:
-                            self._add_obstacle(row, col)
-        return self.items
-
-    def _add_base_tile(self, row, col, tile_type):
-        """Add ground/path tiles unconditionally."""
-        pixmap = self.pixmaps.get(tile_type)
-        item = None
-        if not pixmap:
-            return
-        if tile_type == 'path_c':
-            item = PathItem(pixmap)
-        else:
-            item = MapItem(pixmap)
-        item.setPos(col * self.tile_size, row * self.tile_size)
-        self.items.append(item)
-    def _add_obstacle(self, row, col):
-        """Add single-cell obstacles."""
-        key = 'small_obstacle'
-        pixmap = self.pixmaps.get(key)
-        if not pixmap:
-            return
-        item = ObstacleItem(pixmap)
-        item.setPos(col * self.tile_size, row * self.tile_size)
-        self.items.append(item)
-        self.obstacle_processed[row][col] = True
-    def _add_big_obstacle(self, row, col):
-        """Add 3x4 obstacle and mark its area."""
-        if (row + 3 > len(self.grid)) or (col + 4 > len(self.grid[0])):
-            return
-        pixmap = self.pixmaps.get('big_obstacle')
-        if not pixmap:
-            return
-        # Add obstacle graphic
-        item = ObstacleItem(pixmap)
-        item.setPos(col * self.tile_size, row * self.tile_size)
-        self.items.append(item)
-        # Mark covered area
-        for r in range(row, row+3):
-            for c in range(col, col+4):
-                if r < len(self.grid) and c < len(self.grid[0]):
-                    self.obstacle_processed[r][c] = True
\ No newline at end of file
+    def paint(self, painter, rect):
+        """Draw the chunks intersecting rect (scene coordinates)"""
+        size = self.CHUNK_TILES * self.tile_size
+        for chunk_row, chunk_col in self._chunks_in(rect):
+            painter.drawPixmap(chunk_col * size, chunk_row * size, self.chunk((chunk_row, chunk_col)))
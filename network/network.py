@@ -4,6 +4,35 @@ import json
 import time
 from PySide6.QtCore import QObject, Signal, Slot, QTimer
 import netaddr
+from config.logs import get_logger
+
+log = get_logger("network")
+
+def encode_message(event):
+    """One event on the wire: its JSON followed by a newline"""
+    return (json.dumps(event) + "\n").encode('utf-8')
+
+class MessageReader:
+    """Splits a socket's byte stream back into events, so messages larger than one recv() arrive whole"""
+    def __init__(self, sock):
+        self.socket = sock
+        self._buffer = bytearray()
+
+    def read(self):
+        """Next event from the socket, None once the connection is closed"""
+        end = self._buffer.find(b"\n")
+        while end < 0:
+            data = self.socket.recv(65536)
+            if not data:
+                return None
+            # Only the new bytes can hold the terminator
+            start = len(self._buffer)
+            self._buffer += data
+            end = self._buffer.find(b"\n", start)
+        line = bytes(self._buffer[:end])
+        del self._buffer[:end + 1]
+        return json.loads(line.decode('utf-8'))
+
 class GameNetworkEvent:
     """Network event types for tower defense game"""
     CONNECT = "connect"
@@ -17,6 +46,7 @@ class GameNetworkEvent:
     TOWER_SELL = "tower_sell"
     CHAT_MESSAGE = "chat_message"
     SPAWN_ENEMY = "spawn_enemy"
+    TOWER_TARGETING = "tower_targeting"
 
 class NetworkManager(QObject):
     """Manages network communication for multiplayer games"""
@@ -32,6 +62,7 @@ class NetworkManager(QObject):
     def __init__(self, is_host=False):
         super().__init__()
         self.socket = None
+        self.reader = None
         self.server_address = None
         self.player_id = None
         self.is_host = is_host
@@ -60,7 +91,7 @@ class NetworkManager(QObject):
             self.server_socket.bind(('0.0.0.0', port))
             self.server_socket.listen(2)  # Allow 2 players max
             
-            print(f"Server started on 127.0.0.1:{port}")
+            log.info("Server started on 127.0.0.1:%s", port)
 
             self.player_id = "host"
             self.connected_players.append(self.player_id)
@@ -86,7 +117,7 @@ class NetworkManager(QObject):
             if not address or address.strip() == "":
                 address = "127.0.0.1"  # Default to localhost
                 
-            print(f"Attempting to connect to {address}:{port}")
+            log.info("Attempting to connect to %s:%s", address, port)
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             address = str(netaddr.IPAddress(address,flags= netaddr.ZEROFILL))  
             self.server_address = (address, port)
@@ -95,16 +126,16 @@ class NetworkManager(QObject):
             self.socket.settimeout(None)  # Reset timeout for normal operations
 
             # Send initial connection message
-            self.socket.sendall(json.dumps({
+            self.socket.sendall(encode_message({
                 "type": GameNetworkEvent.CONNECT,
                 "data": {"player_name": "Player"}
-            }).encode('utf-8'))
+            }))
             
             # Receive player ID from server
-            data = self.socket.recv(4096).decode('utf-8')
-            response = json.loads(data)
+            self.reader = MessageReader(self.socket)
+            response = self.reader.read()
             
-            if response["type"] == GameNetworkEvent.CONNECT:
+            if response and response["type"] == GameNetworkEvent.CONNECT:
                 self.player_id = response["data"]["player_id"]
                 self.connected_players = response["data"]["players"]
                 
@@ -130,7 +161,7 @@ class NetworkManager(QObject):
             return False
         except Exception as e:
             self.error.emit(f"Failed to join game: {str(e)}")
-            print(f"Client error: {str(e)}")  # Add detailed logging
+            log.error("Client error: %s", e)
             return False
     
     def disconnect(self):
@@ -156,10 +187,10 @@ class NetworkManager(QObject):
         if self.socket:
             try:
                 # Send disconnect message
-                self.socket.sendall(json.dumps({
+                self.socket.sendall(encode_message({
                     "type": GameNetworkEvent.DISCONNECT,
                     "data": {"player_id": self.player_id}
-                }).encode('utf-8'))
+                }))
                 
                 self.socket.close()
             except:
@@ -194,59 +225,58 @@ class NetworkManager(QObject):
             # Send event to server
             if self.socket:
                 try:
-                    self.socket.sendall(json.dumps(event).encode('utf-8'))
+                    self.socket.sendall(encode_message(event))
                 except Exception as e:
                     self.error.emit(f"Failed to send event: {str(e)}")
     
     def _server_loop(self):
         """Main loop for the server"""
-        print("Server started, waiting for players...")
+        log.info("Server started, waiting for players...")
         
         while self.running:
             try:
                 # Accept new client connection
                 client_socket, address = self.server_socket.accept()
-                print(f"New connection from {address}")
+                log.info("New connection from %s", address)
                 
                 # Handle client registration
-                data = client_socket.recv(4096).decode('utf-8')
-                event = json.loads(data)
+                reader = MessageReader(client_socket)
+                event = reader.read()
                 
-                if event["type"] == GameNetworkEvent.CONNECT:
+                if event and event["type"] == GameNetworkEvent.CONNECT:
                     # Assign player ID (for now, just "player2")
                     player_id = "player2"
                     self.clients[player_id] = client_socket
                     self.connected_players.append(player_id)
                     
                     # Send confirmation with player ID
-                    client_socket.sendall(json.dumps({
+                    client_socket.sendall(encode_message({
                         "type": GameNetworkEvent.CONNECT,
                         "data": {
                             "player_id": player_id,
                             "players": self.connected_players
                         }
-                    }).encode('utf-8'))
+                    }))
                     
                     # Notify about new player
                     self.player_joined.emit(player_id)
                     
                     # Start thread to handle this client
-                    thread = threading.Thread(target=self._handle_client, args=(client_socket, player_id))
+                    thread = threading.Thread(target=self._handle_client, args=(reader, player_id))
                     thread.daemon = True
                     thread.start()
             except Exception as e:
                 if self.running:  # Only show error if not deliberately shutting down
-                    print(f"Server error: {str(e)}")
+                    log.error("Server error: %s", e)
     
-    def _handle_client(self, client_socket, player_id):
+    def _handle_client(self, reader, player_id):
         """Handle communication with a specific client"""
         try:
             while self.running:
-                data = client_socket.recv(4096).decode('utf-8')
-                if not data:
+                event = reader.read()
+                if event is None:
                     break
                 
-                event = json.loads(data)
                 event["player_id"] = player_id  # Ensure correct player_id
                 
                 # On initial connection, send game state
@@ -261,7 +291,7 @@ class NetworkManager(QObject):
                 self._broadcast(event, exclude=player_id)
                 
         except Exception as e:
-            print(f"Error handling client {player_id}: {str(e)}")
+            log.error("Error handling client %s: %s", player_id, e)
         finally:
             # Handle disconnection
             if player_id in self.clients:
@@ -274,12 +304,10 @@ class NetworkManager(QObject):
         """Main loop for the client"""
         try:
             while self.running:
-                data = self.socket.recv(4096).decode('utf-8')
-                if not data:
+                event = self.reader.read()
+                if event is None:
                     break
                 
-                event = json.loads(data)
-                
                 # Handle disconnect event
                 if event["type"] == GameNetworkEvent.DISCONNECT:
                     self.running = False
@@ -296,7 +324,7 @@ class NetworkManager(QObject):
     
     def _broadcast(self, event, exclude=None):
         """Broadcast an event to all connected clients except excluded one"""
-        data = json.dumps(event).encode('utf-8')
+        data = encode_message(event)
         
         for player_id, client_socket in self.clients.items():
             if player_id != exclude:
@@ -354,6 +382,7 @@ class NetworkManager(QObject):
                         self.socket.settimeout(5)
                         self.socket.connect(self.server_address)
                         self.socket.settimeout(None)
+                        self.reader = MessageReader(self.socket)
                         
                         # Reconnection successful
                         self.reconnect_attempts = 0
@@ -361,10 +390,10 @@ class NetworkManager(QObject):
                         self.error.emit("Reconnected to server!")
                         
                         # Re-register with server
-                        self.socket.sendall(json.dumps({
+                        self.socket.sendall(encode_message({
                             "type": GameNetworkEvent.CONNECT,
                             "data": {"player_name": "Player", "reconnect": True}
-                        }).encode('utf-8'))
+                        }))
                         
                     except:
                         pass  # Will try again on next heartbeat
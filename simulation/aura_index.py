@@ -0,0 +1,76 @@
+'''
+Indeks aur wież wzmacniających w komórkach siatki - postawienie, sprzedaż i ulepszenie wieży
+sprawdza tylko komórki w jej pobliżu zamiast wszystkich wież
+'''
+class AuraIndex:
+    """Towers and booster auras by grid cell, keeps every tower's boost up to date incrementally"""
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        # cell -> towers standing in it
+        self._towers = {}
+        # cell -> boosters whose sprite reaches into it
+        self._auras = {}
+        # booster -> cells its aura is registered in
+        self._aura_cells = {}
+
+    def _cell(self, x, y):
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def _cells_around(self, x, y, radius):
+        min_x, min_y = self._cell(x - radius, y - radius)
+        max_x, max_y = self._cell(x + radius, y + radius)
+        return [(cx, cy) for cx in range(min_x, max_x + 1) for cy in range(min_y, max_y + 1)]
+
+    def add(self, tower):
+        """Index a new tower, boost it by the boosters covering it and, for a booster, apply its aura"""
+        self._towers.setdefault(self._cell(tower.x, tower.y), []).append(tower)
+        for booster in self._auras.get(self._cell(tower.x, tower.y), ()):
+            if booster is not tower and booster.overlaps(tower):
+                booster.boost_tower(tower)
+        if tower.is_booster:
+            self._add_aura(tower)
+
+    def remove(self, tower):
+        """Drop a tower, taking back its aura and the boosts it received"""
+        cell = self._cell(tower.x, tower.y)
+        towers = self._towers.get(cell)
+        if towers is None or tower not in towers:
+            return
+        towers.remove(tower)
+        if not towers:
+            del self._towers[cell]
+        if tower.is_booster:
+            self._remove_aura(tower)
+        for booster in list(tower.boosted_by):
+            booster.unboost_tower(tower)
+
+    def update(self, tower):
+        """Re-apply a booster's aura after it was upgraded"""
+        if tower.is_booster and tower in self._aura_cells:
+            self._remove_aura(tower)
+            self._add_aura(tower)
+
+    def clear(self):
+        self._towers = {}
+        self._auras = {}
+        self._aura_cells = {}
+
+    def _add_aura(self, booster):
+        # Like the sprite collision test it replaced, the aura reaches the towers the booster overlaps,
+        # not its range
+        cells = self._cells_around(booster.x, booster.y, 2 * booster.HALF_SIZE)
+        self._aura_cells[booster] = cells
+        for cell in cells:
+            self._auras.setdefault(cell, []).append(booster)
+            for tower in self._towers.get(cell, ()):
+                if tower is not booster and booster.overlaps(tower):
+                    booster.boost_tower(tower)
+
+    def _remove_aura(self, booster):
+        for cell in self._aura_cells.pop(booster, ()):
+            auras = self._auras[cell]
+            auras.remove(booster)
+            if not auras:
+                del self._auras[cell]
+        for tower in list(booster.boosted_towers):
+            booster.unboost_tower(tower)
@@ -0,0 +1,30 @@
+import math
+import numpy as np
+
+'''
+Analityczne wyznaczanie trafienia - zamiast sprawdzać kolizje w każdym ticku liczymy
+z góry, w którym ticku pocisk dogoni przeciwnika idącego po ścieżce
+'''
+def intercept(path, distance, speed, x, y, projectile_speed, reach, max_ticks):
+    """First tick k >= 1 at which a projectile fired from (x, y) this tick reaches an enemy at
+    the given path distance, as (k, enemy_x, enemy_y), or None if it leaks or outruns the shot
+
+    Matches the collision model: after k projectile steps the enemy has moved k - 1 times.
+    """
+    if projectile_speed <= 0 or max_ticks < 1:
+        return None
+    start_x, start_y = path.positions(distance)
+    gap = math.hypot(float(start_x) - x, float(start_y) - y)
+    closing = projectile_speed - speed
+    if closing > 0:
+        # The enemy gets at most speed further away per tick, so the shot lands by then
+        max_ticks = min(max_ticks, int(gap // closing) + 1)
+    ticks = np.arange(1, max_ticks + 1)
+    travelled = distance + (ticks - 1) * speed
+    enemy_x, enemy_y = path.positions(travelled)
+    reached = np.hypot(enemy_x - x, enemy_y - y) - reach <= projectile_speed * ticks
+    hits = np.flatnonzero(reached & (travelled < path.length))
+    if len(hits) == 0:
+        return None
+    first = hits[0]
+    return int(ticks[first]), float(enemy_x[first]), float(enemy_y[first])
@@ -0,0 +1,115 @@
+import argparse
+import itertools
+import json
+import os
+import statistics
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from simulation.scenario import build_simulation, load_scenario
+
+'''
+Wsadowe symulacje - wiele gier bez okna (ziarno mapy, układ wież, zakres fal) rozgrywanych
+równolegle w puli procesów, z wynikami zwracanymi na bieżąco i agregowanymi na końcu
+'''
+def play_game(scenario):
+    """Play one headless game and return a compact result, runs inside the worker processes"""
+    simulation, _ = build_simulation(scenario)
+    first_wave = simulation.state.wave
+    last_wave = first_wave + scenario.get("waves", 10) - 1
+    leaked = 0
+    while simulation.state.wave <= last_wave and not simulation.game_over:
+        lives = simulation.state.lives
+        simulation.start_wave()
+        while simulation.state.wave_started and not simulation.game_over:
+            simulation.step()
+        leaked += lives - simulation.state.lives
+    return {
+        "name": scenario.get("name"),
+        "seed": simulation.seed,
+        "first_wave": first_wave,
+        "last_wave": simulation.state.wave - 1,
+        "survived": not simulation.game_over,
+        "lives": simulation.state.lives,
+        "leaked": leaked,
+        "gold": simulation.state.gold,
+        "score": simulation.state.score,
+        "ticks": simulation.tick,
+        "kills": sum(tower.kills for tower in simulation.towers),
+    }
+
+
+def scenario_grid(base, seeds, layouts=None, wave_ranges=None):
+    """Every combination of map seed, tower layout and (first, last) wave range on top of a base scenario
+
+    layouts maps a layout name to a list of tower entries (see scenario.place_towers),
+    the name ends up in each result's "name".
+    """
+    layouts = layouts or {base.get("name", "layout"): base.get("towers", [])}
+    wave_ranges = wave_ranges or [(base.get("first_wave", 1), base.get("first_wave", 1) + base.get("waves", 10) - 1)]
+    for seed, (name, towers), (first, last) in itertools.product(seeds, layouts.items(), wave_ranges):
+        yield {**base, "name": name, "seed": seed, "towers": towers,
+               "first_wave": first, "waves": last - first + 1}
+
+
+def run_batch(scenarios, workers=None):
+    """Play the scenarios across a process pool, yields each result as soon as its game ends
+
+    Only a few games per worker are queued at a time, so scenarios can be a lazy
+    iterator over thousands of combinations. Callers on Windows/macOS need the usual
+    if __name__ == "__main__" guard for the worker processes.
+    """
+    workers = workers or os.cpu_count() or 1
+    scenarios = iter(scenarios)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {executor.submit(play_game, scenario) for scenario in itertools.islice(scenarios, workers * 4)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+            pending |= {executor.submit(play_game, scenario) for scenario in itertools.islice(scenarios, len(done))}
+
+
+def aggregate(results, key="name"):
+    """Summary statistics of the results, grouped by one of their fields"""
+    groups = {}
+    for result in results:
+        groups.setdefault(result[key], []).append(result)
+    summary = {}
+    for group, games in groups.items():
+        summary[group] = {
+            "games": len(games),
+            "survival_rate": sum(game["survived"] for game in games) / len(games),
+            "mean_lives": statistics.fmean(game["lives"] for game in games),
+            "mean_leaked": statistics.fmean(game["leaked"] for game in games),
+            "mean_score": statistics.fmean(game["score"] for game in games),
+            "median_score": statistics.median(game["score"] for game in games),
+            "mean_last_wave": statistics.fmean(game["last_wave"] for game in games),
+            "total_ticks": sum(game["ticks"] for game in games),
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a scenario over many map seeds in parallel")
+    parser.add_argument("scenario", help="scenario file or name from benchmarks/scenarios")
+    parser.add_argument("--seeds", type=int, default=16, help="number of map seeds, starting from the scenario's")
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--results", help="write one JSON result per line to this file")
+    args = parser.parse_args()
+
+    base = load_scenario(args.scenario)
+    first_seed = base.get("seed", 0)
+    results = []
+    output = open(args.results, "w") if args.results else None
+    for result in run_batch(scenario_grid(base, range(first_seed, first_seed + args.seeds)), args.workers):
+        results.append(result)
+        if output:
+            output.write(json.dumps(result) + "\n")
+        print(f"seed {result['seed']}: waves {result['first_wave']}-{result['last_wave']}, "
+              f"lives {result['lives']}, score {result['score']}")
+    if output:
+        output.close()
+    print(json.dumps(aggregate(results), indent=2))
+
+
+if __name__ == "__main__":
+    main()
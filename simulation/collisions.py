@@ -0,0 +1,28 @@
+import numpy as np
+
+'''
+Wektoryzowane wykrywanie kolizji okrąg-okrąg między pociskami i przeciwnikami
+'''
+# Upper bound on the size of one pairwise distance block (rows * columns)
+MAX_BLOCK = 1 << 20
+
+
+def circle_overlaps(ax, ay, ar, bx, by, br):
+    """Index pairs (i, j) where circle a[i] overlaps circle b[j], sorted by i then j"""
+    if len(ax) == 0 or len(bx) == 0:
+        empty = np.zeros(0, dtype=np.intp)
+        return empty, empty
+    rows_per_block = max(1, MAX_BLOCK // len(bx))
+    hits_a = []
+    hits_b = []
+    for start in range(0, len(ax), rows_per_block):
+        end = start + rows_per_block
+        dx = ax[start:end, None] - bx[None, :]
+        dy = ay[start:end, None] - by[None, :]
+        reach = ar[start:end, None] + br[None, :]
+        a, b = np.nonzero(dx * dx + dy * dy < reach * reach)
+        hits_a.append(a + start)
+        hits_b.append(b)
+    if len(hits_a) == 1:
+        return hits_a[0], hits_b[0]
+    return np.concatenate(hits_a), np.concatenate(hits_b)
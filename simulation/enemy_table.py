@@ -0,0 +1,203 @@
+import numpy as np
+from simulation.entities import ENEMY_TYPES
+
+'''
+Tabela przeciwników w układzie "structure of arrays" - każda kolumna to osobna tablica NumPy,
+dzięki czemu ruch, obrażenia i kolizje liczone są dla wszystkich przeciwników naraz
+'''
+# Enemy kinds by their index in the "type" column
+ENEMY_KIND_LIST = list(ENEMY_TYPES)
+ENEMY_KIND_INDEX = {kind: index for index, kind in enumerate(ENEMY_KIND_LIST)}
+
+# Column name -> dtype
+COLUMNS = {
+    "enemy_id": np.int64,
+    "type": np.int8,
+    "x": np.float64,
+    "y": np.float64,
+    "prev_x": np.float64,
+    "prev_y": np.float64,
+    "health": np.float64,
+    "speed": np.float64,
+    "value": np.int64,
+    "radius": np.float64,
+    "distance": np.float64,  # Path progress: distance travelled along the path
+    "incoming": np.float64,  # Damage of analytic hits already scheduled against the enemy
+    "reached_end": np.bool_,
+    "alive": np.bool_,  # False once killed or leaked, the row is swept at the end of the tick
+}
+
+
+class EnemyTable:
+    """All live enemies, one row each; rows [0, count) are in use"""
+    def __init__(self, capacity=64):
+        self.count = 0
+        self._data = {name: np.zeros(capacity, dtype=dtype) for name, dtype in COLUMNS.items()}
+        # enemy_id -> row
+        self.rows = {}
+        # Rows marked for removal since the last sweep
+        self._removed = []
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    # Column views, trimmed to the live rows. Writing into them updates the table.
+    @property
+    def enemy_id(self):
+        return self._data["enemy_id"][:self.count]
+    @property
+    def type(self):
+        return self._data["type"][:self.count]
+    @property
+    def x(self):
+        return self._data["x"][:self.count]
+    @property
+    def y(self):
+        return self._data["y"][:self.count]
+    @property
+    def prev_x(self):
+        return self._data["prev_x"][:self.count]
+    @property
+    def prev_y(self):
+        return self._data["prev_y"][:self.count]
+    @property
+    def health(self):
+        return self._data["health"][:self.count]
+    @property
+    def speed(self):
+        return self._data["speed"][:self.count]
+    @property
+    def value(self):
+        return self._data["value"][:self.count]
+    @property
+    def radius(self):
+        return self._data["radius"][:self.count]
+    @property
+    def distance(self):
+        return self._data["distance"][:self.count]
+    @property
+    def incoming(self):
+        return self._data["incoming"][:self.count]
+    @property
+    def reached_end(self):
+        return self._data["reached_end"][:self.count]
+    @property
+    def alive(self):
+        return self._data["alive"][:self.count]
+
+    def _grow(self):
+        """Double the capacity of every column"""
+        for name, column in self._data.items():
+            grown = np.zeros(len(column) * 2, dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            self._data[name] = grown
+
+    def add(self, kind, x, y, enemy_id):
+        """Append a new enemy of the given kind, returns its row"""
+        if self.count == len(self._data["x"]):
+            self._grow()
+        stats = ENEMY_TYPES[kind]
+        row = self.count
+        self.count += 1
+        data = self._data
+        data["enemy_id"][row] = enemy_id
+        data["type"][row] = ENEMY_KIND_INDEX[kind]
+        data["x"][row] = data["prev_x"][row] = x
+        data["y"][row] = data["prev_y"][row] = y
+        data["health"][row] = stats["health"]
+        data["speed"][row] = stats["speed"]
+        data["value"][row] = stats["value"]
+        data["radius"][row] = stats["radius"]
+        data["distance"][row] = 0.0
+        data["incoming"][row] = 0.0
+        data["reached_end"][row] = False
+        data["alive"][row] = True
+        self.rows[enemy_id] = row
+        return row
+
+    def mark_removed(self, rows):
+        """Flag rows (an index or an array of indices) as gone, they stay in place until sweep()"""
+        self._data["alive"][rows] = False
+        if np.ndim(rows):
+            self._removed.extend(rows.tolist())
+        else:
+            self._removed.append(int(rows))
+
+    def sweep(self):
+        """Drop the marked rows by moving live rows from the end into their slots, O(removed)"""
+        if not self._removed:
+            return
+        removed = np.unique(self._removed)
+        self._removed = []
+        data = self._data
+        ids = data["enemy_id"]
+        for enemy_id in ids[removed].tolist():
+            del self.rows[enemy_id]
+        new_count = self.count - len(removed)
+        # Holes below the new end are filled by the live rows beyond it
+        holes = removed[removed < new_count]
+        tail = np.arange(new_count, self.count)
+        movers = tail[data["alive"][new_count:self.count]]
+        for column in data.values():
+            column[holes] = column[movers]
+        for row in holes.tolist():
+            self.rows[int(ids[row])] = row
+        self.count = new_count
+
+    def remove(self, enemy_id):
+        """Drop a single enemy right away, returns False if it does not exist"""
+        row = self.rows.get(enemy_id)
+        if row is None:
+            return False
+        self.mark_removed(row)
+        self.sweep()
+        return True
+
+    def clear(self):
+        self.count = 0
+        self.rows = {}
+        self._removed = []
+
+    def row_of(self, enemy_id):
+        return self.rows.get(enemy_id)
+
+    def id_of(self, row):
+        return int(self._data["enemy_id"][row])
+
+    def kind(self, row):
+        return ENEMY_KIND_LIST[self._data["type"][row]]
+
+    def class_name(self, row):
+        return ENEMY_TYPES[self.kind(row)]["class_name"]
+
+    def position(self, row):
+        return (float(self._data["x"][row]), float(self._data["y"][row]))
+
+    def interpolated_position(self, row, alpha):
+        """Position between the previous and the current tick, used for rendering"""
+        data = self._data
+        x, prev_x = data["x"][row], data["prev_x"][row]
+        y, prev_y = data["y"][row], data["prev_y"][row]
+        return (float(prev_x + (x - prev_x) * alpha), float(prev_y + (y - prev_y) * alpha))
+
+    def follow_path(self, path):
+        """Advance every enemy along an ArcLengthPath by its speed"""
+        if self.count == 0:
+            return
+        self.prev_x[:] = self.x
+        self.prev_y[:] = self.y
+        distance = self.distance
+        distance += self.speed
+        np.minimum(distance, path.length, out=distance)
+        self.x[:], self.y[:] = path.positions(distance)
+        self.reached_end[:] = distance >= path.length
+
+    def progress_rank(self):
+        """Rank of every row by path progress, 0 is the enemy furthest along"""
+        order = np.argsort(-self.distance, kind="stable")
+        rank = np.empty(self.count, dtype=np.intp)
+        rank[order] = np.arange(self.count)
+        return rank
@@ -0,0 +1,274 @@
+import math
+import numpy as np
+
+'''
+Definicje jednostek symulacji (bez zależności od Qt)
+'''
+# Stats mirror the values the Qt items used to hardcode in game_objects/enemies.py
+# and game_objects/towers.py. Radii are collision radii (half of the sprite frame).
+ENEMY_TYPES = {
+    "rat": {
+        "class_name": "Rat",
+        "speed": 0.5,
+        "health": 40,
+        "value": 20,
+        "radius": 16,
+    },
+    "fast_rat": {
+        "class_name": "FastRat",
+        "speed": 2,
+        "health": 20,
+        "value": 40,
+        "radius": 16,
+    },
+    "giant_rat": {
+        "class_name": "GiantRat",
+        "speed": 0.25,
+        "health": 200,
+        "value": 100,
+        "radius": 32,
+    },
+}
+
+TOWER_TYPES = {
+    "basic": {
+        "class_name": "BasicTower",
+        "name": "Basic Tower",
+        "cost": 30,
+        "damage": 10,
+        "range": 100,
+        "fire_rate": 100,
+        "upgrade_cost": 20,
+        "max_upgrade_level": 3,
+        "projectile": "basic",
+        "upgrade": {"damage": 5, "range": 20, "fire_rate": -10, "cost": 20, "upgrade_cost": 0},
+    },
+    "bomb": {
+        "class_name": "BombTower",
+        "name": "Bomb Tower",
+        "cost": 50,
+        "damage": 20,
+        "range": 150,
+        "fire_rate": 200,
+        "upgrade_cost": 30,
+        "max_upgrade_level": 2,
+        "projectile": "bomb",
+        "upgrade": {"damage": 10, "range": 30, "fire_rate": -20, "cost": 30, "upgrade_cost": 0},
+    },
+    "booster": {
+        "class_name": "BoosterTower",
+        "name": "Booster Tower",
+        "cost": 50,
+        "damage": 0,
+        "range": 150,
+        "fire_rate": 200,
+        "upgrade_cost": 30,
+        "max_upgrade_level": 3,
+        "projectile": None,
+        "boost_value": 1.5,
+        "upgrade": {"damage": 0, "range": 20, "fire_rate": -10, "cost": 20, "upgrade_cost": 20},
+    },
+}
+
+PROJECTILE_TYPES = {
+    "basic": {
+        "class_name": "BasicProjectile",
+        "speed": 10,
+        "damage": 10,
+        "pierce": 0,
+        "lifetime": 1000,
+        "radius": 8,
+        "on_expire": None,
+    },
+    "bomb": {
+        "class_name": "BombProjectile",
+        "speed": 10,
+        "damage": 200,
+        "pierce": 0,
+        "lifetime": 1000,
+        "radius": 16,
+        "on_expire": "explosion",
+    },
+    "explosion": {
+        "class_name": "ExplosionProjectile",
+        "speed": 0,
+        "damage": 20,
+        "pierce": 999,
+        "lifetime": 100,
+        "radius": 16,
+        "on_expire": None,
+    },
+}
+
+# How a tower picks among the enemies in range
+TARGETING_MODES = ["first", "last", "strongest", "closest"]
+
+# Lookups used by history/network code, which identifies entities by class name
+ENEMY_KINDS = {stats["class_name"]: kind for kind, stats in ENEMY_TYPES.items()}
+TOWER_KINDS = {stats["class_name"]: kind for kind, stats in TOWER_TYPES.items()}
+
+
+class Tower:
+    """Tower stats, cooldown and upgrade state"""
+    HALF_SIZE = 16  # Half the side of the 32x32 tower sprite
+
+    def __init__(self, kind, x, y, tower_id):
+        stats = TOWER_TYPES[kind]
+        self.kind = kind
+        self.class_name = stats["class_name"]
+        self.name = stats["name"]
+        self.tower_id = tower_id
+        self.x = x
+        self.y = y
+        self.cost = stats["cost"]
+        self.damage = stats["damage"]
+        self.range = stats["range"]
+        self.fire_rate = stats["fire_rate"]
+        self.upgrade_cost = stats["upgrade_cost"]
+        self.max_upgrade_level = stats["max_upgrade_level"]
+        self.projectile = stats["projectile"]
+        self.boost_value = stats.get("boost_value", 1.0)
+        self.upgrade_level = 0
+        self.boost_modifier = 1.0
+        self.boosted_towers = []  # Towers this booster covers
+        self.boosted_by = []  # Boosters covering this tower
+        self.cooldown = 0
+        self.kills = 0
+        self.target = None  # enemy_id of the current target
+        self.targeting = "first"
+
+    @property
+    def is_booster(self):
+        return "boost_value" in TOWER_TYPES[self.kind]
+
+    @property
+    def fire_interval(self):
+        """Ticks between shots, shortened by booster towers"""
+        return self.fire_rate / self.boost_modifier
+
+    def can_upgrade(self, gold):
+        return gold >= self.upgrade_cost and self.upgrade_level < self.max_upgrade_level
+
+    def upgrade(self):
+        """Apply one upgrade level"""
+        if self.upgrade_level >= self.max_upgrade_level:
+            return False
+        deltas = TOWER_TYPES[self.kind]["upgrade"]
+        self.upgrade_level += 1
+        self.damage += deltas["damage"]
+        self.range += deltas["range"]
+        self.fire_rate += deltas["fire_rate"]
+        self.cost += deltas["cost"]
+        self.upgrade_cost += deltas["upgrade_cost"]
+        return True
+
+    def distance_to(self, x, y):
+        return math.hypot(self.x - x, self.y - y)
+
+    def overlaps(self, other):
+        """True when the two towers' sprites overlap, the reach of a booster's aura"""
+        reach = self.HALF_SIZE + other.HALF_SIZE
+        return abs(self.x - other.x) < reach and abs(self.y - other.y) < reach
+
+    def acquire_target(self, enemies, enemy_grid, progress_rank):
+        """Pick an enemy in range by the tower's targeting mode, returns its row in the EnemyTable or None
+
+        enemy_grid is a SpatialHash of the enemy positions and progress_rank the
+        EnemyTable.progress_rank() of this tick
+        """
+        rows = enemy_grid.query(self.x, self.y, self.range)
+        # Skip enemies already doomed by scheduled hits (only used with analytic hit resolution)
+        rows = rows[enemies.alive[rows] & (enemies.health[rows] > enemies.incoming[rows])]
+        if len(rows) == 0:
+            self.target = None
+            return None
+        ranks = progress_rank[rows]
+        if self.targeting == "last":
+            row = rows[np.argmax(ranks)]
+        elif self.targeting == "strongest":
+            # Highest health, the one further along the path on ties
+            row = rows[np.lexsort((ranks, -enemies.health[rows]))[0]]
+        elif self.targeting == "closest":
+            dx = enemies.x[rows] - self.x
+            dy = enemies.y[rows] - self.y
+            row = rows[np.argmin(dx * dx + dy * dy)]
+        else:
+            row = rows[np.argmin(ranks)]
+        self.target = enemies.id_of(row)
+        return row
+
+    def should_fire(self):
+        return self.projectile is not None and self.target is not None and self.cooldown <= 0
+
+    def boost_tower(self, tower):
+        if tower not in self.boosted_towers:
+            self.boosted_towers.append(tower)
+            tower.boosted_by.append(self)
+            tower.boost_modifier = max(tower.boost_modifier, self.boost_value)
+
+    def unboost_tower(self, tower):
+        if tower in self.boosted_towers:
+            self.boosted_towers.remove(tower)
+            tower.boosted_by.remove(self)
+            # Boosts don't stack, the strongest remaining booster applies
+            tower.boost_modifier = max((booster.boost_value for booster in tower.boosted_by), default=1.0)
+
+
+class Projectile:
+    """Projectile flying in a straight line towards where its target was"""
+    def __init__(self, kind="basic", x=0.0, y=0.0, target_x=0.0, target_y=0.0, tower=None):
+        self.reset(kind, x, y, target_x, target_y, tower)
+
+    def reset(self, kind, x, y, target_x, target_y, tower):
+        """(Re)initialise the projectile, pooled projectiles are reused through this"""
+        stats = PROJECTILE_TYPES[kind]
+        self.kind = kind
+        self.class_name = stats["class_name"]
+        self.x = x
+        self.y = y
+        self.prev_x = x
+        self.prev_y = y
+        self.speed = stats["speed"]
+        self.damage = stats["damage"]
+        self.pierce = stats["pierce"]
+        self.lifetime = stats["lifetime"]
+        self.radius = stats["radius"]
+        self.on_expire = stats["on_expire"]
+        self.tower = tower
+        # Cleared on expiry, the projectile is swept out at the end of the tick
+        self.alive = True
+        # Index in GameSimulation.projectiles
+        self.slot = -1
+        # Cosmetic projectiles only fly to a precomputed hit, they never collide
+        self.cosmetic = False
+        dx = target_x - x
+        dy = target_y - y
+        length = math.hypot(dx, dy)
+        # Normalize the direction vector
+        self.dx = dx / length if length else 0.0
+        self.dy = dy / length if length else 0.0
+
+    def fly_to(self, target_x, target_y, ticks):
+        """Turn into a cosmetic projectile landing exactly on (target_x, target_y) after ticks steps"""
+        dx = target_x - self.x
+        dy = target_y - self.y
+        length = math.hypot(dx, dy)
+        self.dx = dx / length if length else 0.0
+        self.dy = dy / length if length else 0.0
+        self.speed = length / ticks
+        self.lifetime = ticks
+        self.cosmetic = True
+
+    def update_position(self):
+        self.prev_x, self.prev_y = self.x, self.y
+        self.x += self.dx * self.speed
+        self.y += self.dy * self.speed
+        self.lifetime -= 1
+
+    def is_expired(self):
+        return self.lifetime <= 0 or self.pierce < 0
+
+    def interpolated_position(self, alpha):
+        """Position between the previous and the current tick, used for rendering"""
+        return (self.prev_x + (self.x - self.prev_x) * alpha,
+                self.prev_y + (self.y - self.prev_y) * alpha)
@@ -0,0 +1,56 @@
+import math
+import numpy as np
+
+'''
+Mapa zajętości pól siatki - sprawdzenie, czy można postawić wieżę, to kilka odczytów z tablicy
+zamiast testów kolizji ze wszystkimi elementami sceny
+'''
+# Sides of the map in multiplayer, by map column
+LEFT = 0
+RIGHT = 1
+
+
+class OccupancyGrid:
+    """Map cells blocked for tower placement: terrain from the map grid plus the towers standing on it"""
+    TOWER_HALF_SIZE = 16  # Towers block the cells under their 32x32 sprite
+    PLACEMENT_HALF_SIZE = 8  # A new tower needs the cells under a 16x16 square (the ghost) free
+
+    def __init__(self, grid, tile_size=16):
+        self.tile_size = tile_size
+        # Anything but empty ground (path, start, end, obstacles) is blocked
+        self.terrain = np.asarray(grid, dtype=np.int8) != 0
+        self.height, self.width = self.terrain.shape
+        # Towers covering each cell, footprints of neighbouring towers can overlap
+        self.towers = np.zeros(self.terrain.shape, dtype=np.int16)
+        # Multiplayer half of each column: the host plays the left half, the client the right one
+        self.side = np.where(np.arange(self.width) * tile_size < self.width * tile_size / 2, LEFT, RIGHT)
+
+    def _bounds(self, x, y, half_size):
+        """First and past-the-end row and column of the cells under a square centred on (x, y)"""
+        size = self.tile_size
+        return (int((y - half_size) // size), math.ceil((y + half_size) / size),
+                int((x - half_size) // size), math.ceil((x + half_size) / size))
+
+    def _clipped_span(self, x, y, half_size):
+        min_row, max_row, min_col, max_col = self._bounds(x, y, half_size)
+        return (slice(max(min_row, 0), max(min(max_row, self.height), 0)),
+                slice(max(min_col, 0), max(min(max_col, self.width), 0)))
+
+    def add_tower(self, x, y):
+        self.towers[self._clipped_span(x, y, self.TOWER_HALF_SIZE)] += 1
+
+    def remove_tower(self, x, y):
+        self.towers[self._clipped_span(x, y, self.TOWER_HALF_SIZE)] -= 1
+
+    def clear_towers(self):
+        self.towers[:] = 0
+
+    def is_free(self, x, y, side=None):
+        """Whether a tower can be placed at scene position (x, y), on the given side in multiplayer"""
+        min_row, max_row, min_col, max_col = self._bounds(x, y, self.PLACEMENT_HALF_SIZE)
+        if min_col < 0 or min_row < 0 or max_col > self.width or max_row > self.height:
+            return False
+        span = slice(min_row, max_row), slice(min_col, max_col)
+        if side is not None and self.side[int(x // self.tile_size)] != side:
+            return False
+        return not (self.terrain[span].any() or self.towers[span].any())
@@ -0,0 +1,35 @@
+import numpy as np
+
+'''
+Ścieżka sparametryzowana długością łuku - przeciwnik pamięta tylko przebyty dystans,
+a pozycja liczona jest przez interpolację w tablicy skumulowanych długości odcinków
+'''
+class ArcLengthPath:
+    """Enemy path with cumulative segment lengths, maps distance travelled to positions"""
+    def __init__(self, points):
+        self.points = np.array(points, dtype=np.float64).reshape(-1, 2)
+        if len(self.points) > 1:
+            segments = np.hypot(*np.diff(self.points, axis=0).T)
+        else:
+            segments = np.zeros(0)
+        # cumulative[i] is the distance from the start to points[i]
+        self.cumulative = np.concatenate(([0.0], np.cumsum(segments)))
+        self.length = float(self.cumulative[-1]) if len(self.points) else 0.0
+
+    def __len__(self):
+        return len(self.points)
+
+    @property
+    def start(self):
+        return self.points[0]
+
+    def positions(self, distance):
+        """Scene positions (x, y) for an array of distances travelled"""
+        distance = np.clip(distance, 0.0, self.length)
+        x = np.interp(distance, self.cumulative, self.points[:, 0])
+        y = np.interp(distance, self.cumulative, self.points[:, 1])
+        return x, y
+
+    def progress(self, distance):
+        """Fraction of the path covered, 0 at the start and 1 at the end"""
+        return distance / self.length if self.length else np.ones_like(distance)
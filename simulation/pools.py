@@ -0,0 +1,23 @@
+from simulation.entities import Projectile
+
+'''
+Pule obiektów wielokrotnego użytku - strzały nie tworzą nowych obiektów w trakcie walki
+'''
+class ProjectilePool:
+    """Preallocated Projectile objects handed out on fire and returned on expiry"""
+    def __init__(self, size=64):
+        self._free = [Projectile() for _ in range(size)]
+
+    def __len__(self):
+        return len(self._free)
+
+    def acquire(self, kind, x, y, target_x, target_y, tower):
+        """Take a projectile from the pool (or make one if it ran dry) and reset it"""
+        projectile = self._free.pop() if self._free else Projectile()
+        projectile.reset(kind, x, y, target_x, target_y, tower)
+        return projectile
+
+    def release(self, projectile):
+        """Return a projectile that left the game"""
+        projectile.tower = None
+        self._free.append(projectile)
@@ -0,0 +1,67 @@
+import csv
+import json
+import numpy as np
+
+'''
+Profiler czasu ticka - kroczące percentyle czasu każdego podsystemu symulacji i renderowania
+'''
+class TickProfiler:
+    """Rolling per-section timings in milliseconds, callers only time and record() while enabled"""
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self, window=600, enabled=False):
+        self.window = window
+        self.enabled = enabled
+        # section -> ring buffer of the last window samples
+        self._samples = {}
+        # section -> samples recorded in total
+        self._counts = {}
+
+    def record(self, section, ms):
+        samples = self._samples.get(section)
+        if samples is None:
+            samples = self._samples[section] = np.zeros(self.window)
+            self._counts[section] = 0
+        count = self._counts[section]
+        samples[count % self.window] = ms
+        self._counts[section] = count + 1
+
+    def reset(self):
+        self._samples = {}
+        self._counts = {}
+
+    def summary(self):
+        """section -> p50/p95/p99/mean/max over the window and the total sample count"""
+        summary = {}
+        for section, samples in self._samples.items():
+            count = self._counts[section]
+            window = samples[:min(count, self.window)]
+            p50, p95, p99 = np.percentile(window, self.PERCENTILES)
+            summary[section] = {
+                "p50": float(p50),
+                "p95": float(p95),
+                "p99": float(p99),
+                "mean": float(window.mean()),
+                "max": float(window.max()),
+                "samples": count,
+            }
+        return summary
+
+    def dump(self, filename):
+        """Write the summary to a .csv or .json file"""
+        if filename.lower().endswith(".csv"):
+            self.dump_csv(filename)
+        else:
+            self.dump_json(filename)
+
+    def dump_json(self, filename):
+        with open(filename, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def dump_csv(self, filename):
+        with open(filename, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["section", "p50_ms", "p95_ms", "p99_ms", "mean_ms", "max_ms", "samples"])
+            for section, stats in self.summary().items():
+                writer.writerow([section, stats["p50"], stats["p95"], stats["p99"],
+                                 stats["mean"], stats["max"], stats["samples"]])
@@ -0,0 +1,82 @@
+import json
+import os
+import config.config as cfg
+from map_generation.map_generator import MapGenerator
+from simulation.simulation import GameSimulation
+
+'''
+Scenariusze gry bez okna - mapa z ziarna, układ wież i liczba fal opisane w pliku JSON
+'''
+SCENARIO_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "scenarios")
+
+
+def load_scenario(filename):
+    """Read a scenario file, a bare name is looked up in benchmarks/scenarios"""
+    if not os.path.exists(filename):
+        filename = os.path.join(SCENARIO_DIR, filename if filename.endswith(".json") else filename + ".json")
+    with open(filename) as f:
+        scenario = json.load(f)
+    scenario.setdefault("name", os.path.splitext(os.path.basename(filename))[0])
+    return scenario
+
+
+def list_scenarios():
+    """Paths of the scenarios checked into the repo"""
+    return sorted(os.path.join(SCENARIO_DIR, name) for name in os.listdir(SCENARIO_DIR) if name.endswith(".json"))
+
+
+def build_simulation(scenario):
+    """A fresh GameSimulation with the scenario's map, rules and towers, returns (simulation, map_generator)"""
+    simulation = GameSimulation(seed=scenario.get("seed", 0))
+    simulation.state.record = False
+    map_generator = MapGenerator(scenario.get("map_width", cfg.MAP_WIDTH),
+                                 scenario.get("map_height", cfg.MAP_HEIGHT), simulation.rng)
+    simulation.set_path([(x * cfg.TILE_SIZE, y * cfg.TILE_SIZE) for x, y in map_generator.path])
+    simulation.set_map_grid(map_generator.grid)
+    simulation.set_hit_mode(scenario.get("hit_mode", cfg.HIT_RESOLUTION))
+    simulation.state.gold = scenario.get("gold", simulation.state.gold)
+    simulation.state.lives = scenario.get("lives", simulation.state.lives)
+    simulation.state.wave = scenario.get("first_wave", simulation.state.wave)
+    for entry in scenario.get("towers", []):
+        place_towers(simulation, entry)
+    return simulation, map_generator
+
+
+def place_towers(simulation, entry):
+    """Place the towers of one layout entry, either a single tower or a rule along the path
+
+    {"type": "basic", "x": 96, "y": 48} places one tower at scene coordinates.
+    {"type": ["basic", "bomb"], "along_path": {"every": 3, "offsets": [[40, 40]]}} places
+    a tower at each offset from every third path corner, cycling through the types.
+    Both accept "upgrades" and "targeting". Positions the game would refuse (path, obstacles,
+    other towers, off the map) are skipped, returns the number of towers placed.
+    """
+    kinds = entry["type"] if isinstance(entry["type"], list) else [entry["type"]]
+    if "along_path" in entry:
+        rule = entry["along_path"]
+        corners = simulation.path.points[1:-1:rule.get("every", 1)]
+        positions = [(float(x + dx), float(y + dy)) for x, y in corners for dx, dy in rule.get("offsets", [[0, 0]])]
+    else:
+        positions = [(entry["x"], entry["y"])]
+    placed = 0
+    for index, (x, y) in enumerate(positions):
+        if not simulation.can_place_tower(x, y):
+            continue
+        placed += 1
+        tower = simulation.place_tower(kinds[index % len(kinds)], x, y,
+                                       targeting=entry.get("targeting", "first"))
+        for _ in range(entry.get("upgrades", 0)):
+            tower.upgrade()
+        simulation.refresh_tower(tower)
+    return placed
+
+
+def play_wave(simulation, max_ticks=None):
+    """Run one wave to its end (or game over), returns the ticks it took"""
+    start = simulation.tick
+    simulation.start_wave()
+    while simulation.state.wave_started and not simulation.game_over:
+        simulation.step()
+        if max_ticks is not None and simulation.tick - start >= max_ticks:
+            break
+    return simulation.tick - start
@@ -0,0 +1,641 @@
+import heapq
+import itertools
+import math
+import random
+import time
+import numpy as np
+import config.config as cfg
+from game_objects.waves import ENEMY_LIST, build_new_wave
+from simulation.entities import Tower, TOWER_TYPES, PROJECTILE_TYPES, TARGETING_MODES
+from simulation.enemy_table import EnemyTable
+from simulation.path import ArcLengthPath
+from simulation.spatial_hash import SpatialHash
+from simulation.collisions import circle_overlaps
+from simulation.pools import ProjectilePool
+from simulation.ballistics import intercept
+from simulation.profiler import TickProfiler
+from simulation.aura_index import AuraIndex
+from simulation.occupancy import OccupancyGrid
+
+'''
+Symulacja gry bez zależności od Qt - może działać bez okna i szybciej niż w czasie rzeczywistym
+'''
+# How projectile hits are found: per-tick collision checks, an analytic intercept
+# scheduled at fire time, or an instant hit. Analytic projectiles are only drawn.
+HIT_MODES = ["collision", "intercept", "hitscan"]
+
+
+class SimulationState:
+    """Plain game values owned by the simulation"""
+    def __init__(self):
+        self.gold = cfg.BASE_GOLD
+        self.score = 0
+        self.lives = cfg.BASE_LIVES
+        self.level = 1
+        self.wave = 1
+        self.wave_started = False
+        self.enemies_to_spawn = []
+        self.record = True
+
+
+class GameSimulation:
+    """Owns enemies, towers, projectiles and waves and advances them one tick at a time"""
+    TICK_MS = 16  # Simulated time per step
+    SPAWN_INTERVAL_MS = 1000
+    GRID_CELL_SIZE = 64  # Spatial hash cell for target acquisition, in scene pixels
+    PROJECTILE_POOL_SIZE = 256  # Projectiles preallocated up front
+    INTERCEPT_RETRY_TICKS = 8  # Wait before a tower retries a shot that couldn't connect
+
+    def __init__(self, path=None, state=None, history_recorder=None, seed=None):
+        self.state = state if state is not None else SimulationState()
+        # One random stream per game: map generation and waves draw from it, so the same
+        # seed reproduces the same game (the AI keeps its own stream derived from the seed)
+        self.seed = None
+        self.rng = random.Random()
+        self.set_seed(seed)
+        self.history_recorder = history_recorder
+        self.path = ArcLengthPath([])
+        self.towers = []
+        self.enemies = EnemyTable()
+        self.enemy_grid = SpatialHash(self.GRID_CELL_SIZE)
+        self.projectiles = []
+        self.projectile_pool = ProjectilePool(self.PROJECTILE_POOL_SIZE)
+        # Projectiles expired this tick, swept out in _cleanup_items
+        self._expired_projectiles = []
+        self.hit_mode = cfg.HIT_RESOLUTION
+        # Heap of analytic hits: (due tick, sequence, enemy_id, damage, tower, projectile class, x, y)
+        self._scheduled_hits = []
+        self._hit_sequence = itertools.count()
+        # Hits landed this tick, applied together in _apply_damage: arrays of enemy rows
+        # and damage, plus the tower behind each hit (credited with the kill)
+        self._damage_rows = []
+        self._damage_amounts = []
+        self._damage_towers = []
+        self.tick = 0
+        self.game_over = False
+        # Per-subsystem timings, step() only pays for them while enabled
+        self.profiler = TickProfiler(cfg.PROFILER_WINDOW, cfg.PROFILER_ENABLED)
+        # tower_id -> Tower, kept in step with self.towers
+        self.tower_index = {}
+        # Booster auras by grid cell, kept in step with self.towers
+        self.aura_index = AuraIndex(self.GRID_CELL_SIZE)
+        # Cells blocked for placement, set up from the map grid by set_map_grid()
+        self.occupancy = None
+        # Compact integer ids for towers and enemies. In multiplayer each peer
+        # hands out every id_stride-th id starting at id_offset, so ids never clash.
+        self.id_offset = 0
+        self.id_stride = 1
+        self._next_id = 0
+        self.spawn_interval = self.SPAWN_INTERVAL_MS // self.TICK_MS
+        self._spawn_cooldown = 0
+
+        # Optional hooks for the owner (GameScene, headless runners)
+        self.on_enemy_spawned = None
+        self.on_wave_ended = None
+        self.on_game_over = None
+
+        if path is not None:
+            self.set_path(path)
+
+    def set_path(self, path):
+        """Set the enemy path as a list of (x, y) scene coordinates"""
+        self.path = ArcLengthPath(path)
+
+    def set_map_grid(self, grid):
+        """Set the map tiles (MapGenerator.grid) that tower placement is checked against"""
+        if grid is None or len(grid) == 0:
+            # Without a map (e.g. old recordings) placement is not restricted
+            self.occupancy = None
+            return
+        self.occupancy = OccupancyGrid(grid, cfg.TILE_SIZE)
+        for tower in self.towers:
+            self.occupancy.add_tower(tower.x, tower.y)
+
+    def can_place_tower(self, x, y, side=None):
+        """Whether a tower fits at (x, y); side is occupancy.LEFT or RIGHT to keep to one half in multiplayer"""
+        return self.occupancy is None or self.occupancy.is_free(x, y, side)
+
+    def clear_entities(self):
+        """Remove all towers, enemies and projectiles"""
+        self.towers = []
+        self.tower_index = {}
+        self.aura_index.clear()
+        if self.occupancy is not None:
+            self.occupancy.clear_towers()
+        self.enemies.clear()
+        for projectile in self.projectiles:
+            self.projectile_pool.release(projectile)
+        self.projectiles = []
+        self._expired_projectiles = []
+        self._scheduled_hits = []
+
+    def set_seed(self, seed=None):
+        """Restart the random stream from seed, None picks a new seed"""
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.rng.seed(seed)
+
+    def reset(self, path=None, seed=None):
+        """Clear all entities and restore the starting values, a seed restarts the random stream"""
+        self.clear_entities()
+        if seed is not None:
+            self.set_seed(seed)
+        self._next_id = 0
+        self.tick = 0
+        self.game_over = False
+        self._spawn_cooldown = 0
+        self.state.gold = cfg.BASE_GOLD
+        self.state.lives = cfg.BASE_LIVES
+        self.state.score = 0
+        self.state.wave = 1
+        self.state.wave_started = False
+        self.state.enemies_to_spawn = []
+        if path is not None:
+            self.set_path(path)
+
+    def new_id(self):
+        """Next free tower/enemy id"""
+        entity_id = self.id_offset + self._next_id * self.id_stride
+        self._next_id += 1
+        return entity_id
+
+    def record(self, event_type, data):
+        """Forward an event to the history recorder"""
+        if self.history_recorder is not None:
+            self.history_recorder.record_event(event_type, data)
+
+    @property
+    def recording(self):
+        return self.state.record and self.history_recorder is not None
+
+    # ----------------------
+    # Core Loop
+    # ----------------------
+    def step(self):
+        """Advance the game by one tick"""
+        if self.game_over:
+            return
+        self.tick += 1
+        if self.profiler.enabled:
+            self._profiled_step()
+            return
+        self._update_spawning()
+        self._update_enemies()
+        self._update_towers()
+        self._update_projectiles()
+        self._resolve_scheduled_hits()
+        self._check_collisions()
+        self._apply_damage()
+        self._cleanup_items()
+
+    def _profiled_step(self):
+        """The body of step() with every subsystem timed into the profiler"""
+        record = self.profiler.record
+        clock = time.perf_counter
+        tick_start = start = clock()
+        for section, update in (("spawning", self._update_spawning),
+                                ("enemies", self._update_enemies),
+                                ("towers", self._update_towers),
+                                ("projectiles", self._update_projectiles),
+                                ("scheduled_hits", self._resolve_scheduled_hits),
+                                ("collisions", self._check_collisions),
+                                ("damage", self._apply_damage),
+                                ("cleanup", self._cleanup_items)):
+            update()
+            now = clock()
+            record(section, (now - start) * 1000.0)
+            start = now
+        record("tick", (start - tick_start) * 1000.0)
+
+    def run(self, ticks):
+        """Advance the game by several ticks"""
+        for _ in range(ticks):
+            if self.game_over:
+                break
+            self.step()
+
+    # ----------------------
+    # Waves
+    # ----------------------
+    def start_wave(self):
+        """Queue up the enemies of the current wave"""
+        self.state.wave_started = True
+        if self.state.wave > len(ENEMY_LIST):
+            enemies = build_new_wave(self.state.wave, self.rng)
+        else:
+            enemies = ENEMY_LIST[self.state.wave - 1]
+        for enemy_type, count in enemies.items():
+            self.state.enemies_to_spawn.extend([enemy_type.lower()] * count)
+        self.rng.shuffle(self.state.enemies_to_spawn)
+        self._spawn_cooldown = self.spawn_interval
+
+        if self.recording: self.record("wave_started", {
+            "wave_number": self.state.wave,
+            "enemies": list(self.state.enemies_to_spawn)
+        })
+
+    def end_wave(self):
+        """Finish the current wave"""
+        self.state.wave_started = False
+        self.state.wave += 1
+        if self.recording: self.record("wave_ended", {
+            "wave_number": self.state.wave,
+            "gold": self.state.gold,
+            "lives": self.state.lives
+        })
+        if self.on_wave_ended:
+            self.on_wave_ended()
+
+    def _update_spawning(self):
+        """Spawn the next queued enemy once per spawn interval"""
+        if not self.state.enemies_to_spawn:
+            return
+        self._spawn_cooldown -= 1
+        if self._spawn_cooldown <= 0:
+            self._spawn_cooldown = self.spawn_interval
+            row = self.spawn_enemy(self.state.enemies_to_spawn.pop(0))
+            if self.on_enemy_spawned:
+                self.on_enemy_spawned(self.enemies.id_of(row))
+
+    # ----------------------
+    # Update Subsystems
+    # ----------------------
+    def _update_enemies(self):
+        """Move enemies and take a life for each one reaching the end"""
+        enemies = self.enemies
+        enemies.follow_path(self.path)
+        leaked = np.flatnonzero(enemies.reached_end & enemies.alive)
+        if len(leaked) == 0:
+            return
+        enemies.mark_removed(leaked)
+        self.state.lives -= len(leaked)
+        if self.recording:
+            for row in leaked:
+                self._record_enemy("enemy_reached_end", row)
+        if self.state.lives <= 0:
+            self.end_game()
+
+    def _record_enemy(self, event_type, row):
+        enemies = self.enemies
+        self.record(event_type, {
+            "enemy_type": enemies.class_name(row),
+            "enemy_id": enemies.id_of(row),
+            "position": enemies.position(row)
+        })
+
+    def _kill_enemies(self, rows):
+        """Pay out the enemies' value in one go and mark them for removal"""
+        value = int(self.enemies.value[rows].sum())
+        self.state.score += value
+        self.state.gold += value
+        if self.recording:
+            for row in rows.tolist():
+                self._record_enemy("enemy_killed", row)
+        self.enemies.mark_removed(rows)
+
+    def _update_towers(self):
+        """Handle tower targeting and shooting"""
+        if not self.towers:
+            return
+        self.enemy_grid.rebuild(self.enemies.x, self.enemies.y)
+        progress_rank = self.enemies.progress_rank()
+        for tower in self.towers:
+            row = tower.acquire_target(self.enemies, self.enemy_grid, progress_rank)
+            if tower.should_fire():
+                projectile = self._fire(tower, row)
+                if projectile is None:
+                    # No intercept within the projectile's lifetime, don't solve it again every tick
+                    tower.cooldown = self.INTERCEPT_RETRY_TICKS
+            else:
+                projectile = None
+            if projectile is not None:
+                tower.cooldown = tower.fire_interval
+                if self.recording: self.record("tower_shot", {
+                    "tower_type": tower.class_name,
+                    "tower_id": tower.tower_id,
+                    "projectile_type": projectile.class_name,
+                    "target_enemy": self.enemies.class_name(row),
+                    "position": (tower.x, tower.y)
+                })
+            if tower.cooldown > 0:
+                tower.cooldown -= 1
+
+    def _fire(self, tower, row):
+        """Launch the tower's projectile at an enemy row, returns None if the shot can't connect"""
+        if self.hit_mode != "collision":
+            projectile = self._schedule_hit(tower, row)
+        else:
+            target_x, target_y = self.enemies.position(row)
+            projectile = self.projectile_pool.acquire(tower.projectile, tower.x, tower.y,
+                                                      target_x, target_y, tower)
+        if projectile is not None:
+            self._add_projectile(projectile)
+        return projectile
+
+    def _schedule_hit(self, tower, row):
+        """Work out when the shot lands and queue its damage, returns the cosmetic projectile"""
+        enemies = self.enemies
+        stats = PROJECTILE_TYPES[tower.projectile]
+        if self.hit_mode == "hitscan":
+            # The hit lands now, the shot is only a one-tick flash onto the target
+            target_x, target_y = enemies.position(row)
+            ticks = 1
+            due = self.tick
+        else:
+            hit = intercept(self.path, float(enemies.distance[row]), float(enemies.speed[row]),
+                            tower.x, tower.y, stats["speed"],
+                            stats["radius"] + float(enemies.radius[row]), stats["lifetime"])
+            if hit is None:
+                return None
+            ticks, target_x, target_y = hit
+            due = self.tick + ticks - 1
+        projectile = self.projectile_pool.acquire(tower.projectile, tower.x, tower.y,
+                                                  target_x, target_y, tower)
+        projectile.fly_to(target_x, target_y, ticks)
+        enemies.incoming[row] += projectile.damage
+        heapq.heappush(self._scheduled_hits, (due, next(self._hit_sequence), enemies.id_of(row),
+                                              projectile.damage, tower, projectile.class_name,
+                                              target_x, target_y, projectile.on_expire))
+        return projectile
+
+    def _schedule_explosion(self, kind, x, y, tower):
+        """Queue the area hits of an explosion at (x, y): one per enemy and tick it overlaps
+        the blast while the explosion lasts, following each enemy along the path"""
+        stats = PROJECTILE_TYPES[kind]
+        enemies = self.enemies
+        lifetime = stats["lifetime"]
+        # Enemies move along the path no faster than their speed, the others can't reach the blast
+        reach = stats["radius"] + enemies.radius
+        dx = enemies.x - x
+        dy = enemies.y - y
+        limit = reach + enemies.speed * lifetime
+        rows = np.flatnonzero(enemies.alive & (dx * dx + dy * dy < limit * limit))
+        if len(rows) == 0:
+            return
+        # Same ticks as a collision explosion: from the tick after impact for its lifetime
+        steps = np.arange(1, lifetime + 1)
+        distance = enemies.distance[rows, None] + enemies.speed[rows, None] * steps
+        path_x, path_y = self.path.positions(distance)
+        reach = reach[rows, None]
+        inside = ((path_x - x) ** 2 + (path_y - y) ** 2 < reach * reach) & (distance < self.path.length)
+        hit_rows, hit_steps = np.nonzero(inside)
+        # A collision explosion stops once its pierce is used up
+        order = np.argsort(hit_steps, kind="stable")[:stats["pierce"] + 1]
+        damage = stats["damage"]
+        for index in order.tolist():
+            row = int(rows[hit_rows[index]])
+            enemies.incoming[row] += damage
+            heapq.heappush(self._scheduled_hits, (self.tick + int(steps[hit_steps[index]]), next(self._hit_sequence),
+                                                  enemies.id_of(row), damage, tower, stats["class_name"],
+                                                  x, y, None))
+
+    def set_hit_mode(self, mode):
+        """Switch how projectile hits are resolved, returns False for unknown modes"""
+        if mode not in HIT_MODES:
+            return False
+        self.hit_mode = mode
+        return True
+
+    def _add_projectile(self, projectile):
+        projectile.slot = len(self.projectiles)
+        self.projectiles.append(projectile)
+
+    def _update_projectiles(self):
+        """Move projectiles and check lifespan"""
+        projectiles = self.projectiles
+        # Explosions appended on expiry start moving next tick
+        for index in range(len(projectiles)):
+            projectile = projectiles[index]
+            projectile.update_position()
+            if projectile.is_expired():
+                self._handle_projectile_death(projectile)
+
+    def _handle_projectile_death(self, projectile):
+        """Process projectile expiration"""
+        if projectile.on_expire:
+            explosion = self.projectile_pool.acquire(projectile.on_expire, projectile.x, projectile.y,
+                                                     projectile.x, projectile.y, projectile.tower)
+            # An analytic shot's explosion damage is already scheduled, this one is only drawn
+            explosion.cosmetic = projectile.cosmetic
+            self._add_projectile(explosion)
+        if self.recording: self.record("projectile_expired", {
+            "projectile_type": projectile.class_name,
+            "position": (projectile.x, projectile.y)
+        })
+        projectile.alive = False
+        self._expired_projectiles.append(projectile)
+
+    def _resolve_scheduled_hits(self):
+        """Buffer the analytic hits due this tick"""
+        hits = self._scheduled_hits
+        enemies = self.enemies
+        rows = []
+        damage = []
+        while hits and hits[0][0] <= self.tick:
+            _, _, enemy_id, amount, tower, class_name, x, y, on_expire = heapq.heappop(hits)
+            if on_expire:
+                # The blast goes off at the impact point even if the target is already gone
+                self._schedule_explosion(on_expire, x, y, tower)
+            row = enemies.row_of(enemy_id)
+            if row is None or not enemies.alive[row]:
+                continue
+            enemies.incoming[row] -= amount
+            rows.append(row)
+            damage.append(amount)
+            self._damage_towers.append(tower)
+            if self.recording: self.record("projectile_hit", {
+                "projectile_type": class_name,
+                "target_enemy": enemies.class_name(row),
+                "position": (x, y)
+            })
+        if rows:
+            self._damage_rows.append(np.array(rows, dtype=np.intp))
+            self._damage_amounts.append(np.array(damage, dtype=np.float64))
+
+    def _check_collisions(self):
+        """Detect projectile-enemy overlaps and buffer their hits"""
+        if not self.enemies or not self.projectiles:
+            return
+        # Expired and cosmetic projectiles are out of play
+        projectiles = [p for p in self.projectiles if p.alive and not p.cosmetic]
+        if not projectiles:
+            return
+        count = len(projectiles)
+        px = np.fromiter((p.x for p in projectiles), np.float64, count)
+        py = np.fromiter((p.y for p in projectiles), np.float64, count)
+        pr = np.fromiter((p.radius for p in projectiles), np.float64, count)
+        enemies = self.enemies
+        hits, rows = circle_overlaps(px, py, pr, enemies.x, enemies.y, enemies.radius)
+        if len(rows):
+            # Enemies that leaked this tick are out of play
+            live = enemies.alive[rows]
+            hits, rows = hits[live], rows[live]
+        if len(rows) == 0:
+            return
+        damage = np.fromiter((p.damage for p in projectiles), np.float64, count)
+        self._damage_rows.append(rows)
+        self._damage_amounts.append(damage[hits])
+        hit_list = hits.tolist()
+        self._damage_towers.extend(projectiles[index].tower for index in hit_list)
+        for index, hit_count in zip(*np.unique(hits, return_counts=True)):
+            projectiles[index].pierce -= int(hit_count)
+        if self.recording:
+            for index, row in zip(hit_list, rows.tolist()):
+                self.record("projectile_hit", {
+                    "projectile_type": projectiles[index].class_name,
+                    "target_enemy": enemies.class_name(row),
+                    "position": (projectiles[index].x, projectiles[index].y)
+                })
+
+    def _apply_damage(self):
+        """Apply this tick's buffered hits at once, each kill goes to the tower whose hit finished the enemy"""
+        if not self._damage_rows:
+            return
+        rows = np.concatenate(self._damage_rows)
+        damage = np.concatenate(self._damage_amounts)
+        towers = self._damage_towers
+        self._damage_rows = []
+        self._damage_amounts = []
+        self._damage_towers = []
+        health = self.enemies.health
+        # Damage dealt to each enemy by its earlier hits and by the hits up to and including this one
+        order = np.argsort(rows, kind="stable")
+        sorted_rows = rows[order]
+        dealt = np.cumsum(damage[order])
+        group_start = np.flatnonzero(np.r_[True, sorted_rows[1:] != sorted_rows[:-1]])
+        group_size = np.diff(np.r_[group_start, len(sorted_rows)])
+        dealt -= np.repeat(dealt[group_start] - damage[order][group_start], group_size)
+        before = health[sorted_rows]
+        finishing = (dealt >= before) & (dealt - damage[order] < before)
+        health -= np.bincount(rows, weights=damage, minlength=len(health))
+        if not finishing.any():
+            return
+        for index in order[finishing].tolist():
+            towers[index].kills += 1
+        self._kill_enemies(sorted_rows[finishing])
+
+    def _cleanup_items(self):
+        """Sweep out everything that died this tick"""
+        self.enemies.sweep()
+        if self._expired_projectiles:
+            projectiles = self.projectiles
+            for projectile in self._expired_projectiles:
+                # Swap-remove: the last projectile takes the expired one's slot
+                last = projectiles.pop()
+                if last is not projectile:
+                    projectiles[projectile.slot] = last
+                    last.slot = projectile.slot
+                self.projectile_pool.release(projectile)
+            self._expired_projectiles = []
+        if not self.enemies and not self.state.enemies_to_spawn and self.state.wave_started:
+            self.end_wave()
+
+    def end_game(self):
+        """Stop the simulation after the last life is lost"""
+        self.game_over = True
+        if self.recording: self.record("game_over", {
+            "final_score": self.state.score,
+            "waves_completed": self.state.wave,
+            "result": "defeat"
+        })
+        if self.on_game_over:
+            self.on_game_over()
+
+    # ----------------------
+    # Entity Management
+    # ----------------------
+    def spawn_enemy(self, kind, enemy_id=None):
+        """Add a new enemy at the start of the path, returns its row in the enemy table"""
+        if not isinstance(enemy_id, int) or enemy_id in self.enemies.rows:
+            # Older recordings use uuid strings, those enemies get a fresh id
+            enemy_id = self.new_id()
+        x, y = self.path.start
+        row = self.enemies.add(kind, x, y, enemy_id)
+        if self.recording: self.record("enemy_spawned", {
+            "enemy_type": self.enemies.class_name(row),
+            "enemy_id": enemy_id,
+            "position": self.enemies.position(row)
+        })
+        return row
+
+    def remove_enemy(self, enemy_id):
+        """Remove an enemy without reward, returns False if it does not exist"""
+        return self.enemies.remove(enemy_id)
+
+    def place_tower(self, kind, x, y, tower_id=None, targeting="first"):
+        """Create and register a new tower"""
+        if tower_id is None or tower_id in self.tower_index:
+            tower_id = self.new_id()
+        tower = Tower(kind, x, y, tower_id)
+        if targeting in TARGETING_MODES:
+            tower.targeting = targeting
+        self.towers.append(tower)
+        self.tower_index[tower_id] = tower
+        self.aura_index.add(tower)
+        if self.occupancy is not None:
+            self.occupancy.add_tower(x, y)
+        if self.recording: self.record("tower_placed", {
+            "tower_type": tower.class_name,
+            "tower_id": tower.tower_id,
+            "position": (x, y),
+            "cost": tower.cost,
+            "targeting": tower.targeting
+        })
+        return tower
+
+    def upgrade_tower(self, tower):
+        """Spend gold to upgrade a tower, returns True on success"""
+        if not tower.can_upgrade(self.state.gold):
+            return False
+        self.state.gold -= tower.upgrade_cost
+        tower.upgrade()
+        self.aura_index.update(tower)
+        if self.recording: self.record("tower_upgraded", {
+            "tower_type": tower.class_name,
+            "tower_id": tower.tower_id,
+            "position": (tower.x, tower.y),
+            "upgrade_level": tower.upgrade_level,
+            "cost": tower.upgrade_cost
+        })
+        return True
+
+    def set_tower_targeting(self, tower, targeting):
+        """Change how a tower picks its target, returns False for unknown modes"""
+        if targeting not in TARGETING_MODES:
+            return False
+        tower.targeting = targeting
+        if self.recording: self.record("tower_targeting_changed", {
+            "tower_type": tower.class_name,
+            "tower_id": tower.tower_id,
+            "targeting": targeting
+        })
+        return True
+
+    def sell_tower(self, tower):
+        """Remove a tower and refund half of its cost"""
+        refund = tower.cost // 2
+        self.state.gold += refund
+        self.remove_tower(tower)
+        if self.recording: self.record("tower_sold", {
+            "tower_type": tower.class_name,
+            "tower_id": tower.tower_id,
+            "position": (tower.x, tower.y),
+            "refund": refund
+        })
+        return refund
+
+    def remove_tower(self, tower):
+        if self.tower_index.get(tower.tower_id) is tower:
+            del self.tower_index[tower.tower_id]
+            self.towers.remove(tower)
+            self.aura_index.remove(tower)
+            if self.occupancy is not None:
+                self.occupancy.remove_tower(tower.x, tower.y)
+
+    def refresh_tower(self, tower):
+        """Re-apply a tower's aura after it was upgraded outside upgrade_tower (replays, network sync)"""
+        self.aura_index.update(tower)
+
+    def find_tower(self, tower_id):
+        return self.tower_index.get(tower_id)
@@ -0,0 +1,64 @@
+import numpy as np
+
+'''
+Jednorodna siatka (spatial hash) pozycji przeciwników, budowana raz na tick -
+wieża sprawdza tylko komórki pokrywające jej zasięg zamiast wszystkich przeciwników
+'''
+class SpatialHash:
+    """Uniform grid of enemy rows, rebuilt from the enemy table once per tick"""
+    # Cell keys are cell_x * KEY_STRIDE + cell_y
+    KEY_STRIDE = 1 << 20
+    # Below this many points a plain vectorized scan is cheaper than building cells
+    MIN_INDEXED = 64
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self._order = np.zeros(0, dtype=np.intp)
+        # cell key -> (start, end) slice of self._order
+        self._cells = {}
+        self._indexed = False
+
+    def rebuild(self, x, y):
+        """Index the given positions, row i of the table is at (x[i], y[i])"""
+        self.x = x
+        self.y = y
+        self._indexed = len(x) >= self.MIN_INDEXED
+        if not self._indexed:
+            self._cells = {}
+            return
+        keys = self._cell(x) * self.KEY_STRIDE + self._cell(y)
+        self._order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[self._order]
+        cell_keys, starts = np.unique(sorted_keys, return_index=True)
+        ends = np.append(starts[1:], len(sorted_keys))
+        self._cells = dict(zip(cell_keys.tolist(), zip(starts.tolist(), ends.tolist())))
+
+    def _cell(self, value):
+        return np.floor_divide(value, self.cell_size).astype(np.int64)
+
+    def query(self, x, y, radius):
+        """Rows closer than radius to (x, y), in table order"""
+        if not self._indexed:
+            dx = self.x - x
+            dy = self.y - y
+            return np.flatnonzero(dx * dx + dy * dy < radius * radius)
+        size = self.cell_size
+        min_cx, max_cx = int((x - radius) // size), int((x + radius) // size)
+        min_cy, max_cy = int((y - radius) // size), int((y + radius) // size)
+        chunks = []
+        for cx in range(min_cx, max_cx + 1):
+            base = cx * self.KEY_STRIDE
+            for cy in range(min_cy, max_cy + 1):
+                span = self._cells.get(base + cy)
+                if span is not None:
+                    chunks.append(self._order[span[0]:span[1]])
+        if not chunks:
+            return self._order[:0]
+        rows = np.concatenate(chunks) if len(chunks) > 1 else chunks[0]
+        dx = self.x[rows] - x
+        dy = self.y[rows] - y
+        rows = rows[dx * dx + dy * dy < radius * radius]
+        rows.sort()
+        return rows
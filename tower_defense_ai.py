@@ -1,16 +1,20 @@
-import random
 import numpy as np
 import gymnasium as gym
 from gymnasium import spaces
 import time
 import os
+import random
 from stable_baselines3 import PPO
 from stable_baselines3.common.callbacks import BaseCallback
 from PySide6.QtCore import QObject, Signal, Slot, QTimer, QPointF, QThread
 from PySide6.QtWidgets import QMessageBox,QApplication
-from game_objects.enemies import Rat, GiantRat,FastRat
+from simulation.simulation import GameSimulation
+from map_generation.map_generator import TileType
 import config.config as cfg
 from functools import wraps
+from config.logs import get_logger
+
+log = get_logger("ai")
 
 def safe_for_training(method):
     """Decorator to make methods safe for training thread"""
@@ -35,12 +39,19 @@ class TowerDefenseEnv(gym.Env):
     def __init__(self, game_scene):
         super().__init__()
         self.game_scene = game_scene
-        self.grid_size = (cfg.MAP_HEIGHT, cfg.MAP_WIDTH)
+        # The agent observes and acts on a window of the map that follows the active area,
+        # so the observation does not grow with the map
+        map_rows, map_cols = game_scene.map_generator.grid.shape
+        self.grid_size = (min(map_rows, cfg.AI_VIEW_TILES), min(map_cols, cfg.AI_VIEW_TILES))
+        self.view_origin = (0, 0)  # Map (row, column) of the window's top-left tile
+        # Channel 0 of the whole map and the grid it was built from
+        self._map_layer = None
+        self._map_layer_grid = None
         
         # Define action and observation space
         # Action space: (tower_type, x, y)
         # Tower types: 0=none, 1=basic, 2=bomb, 3=booster
-        self.action_space = spaces.MultiDiscrete([4, self.grid_size[0], self.grid_size[1]])
+        self.action_space = spaces.MultiDiscrete([4, self.grid_size[1], self.grid_size[0]])
         
         # Observation space: grid state + resources + wave info
         # Grid: 0=empty, 1=tower, 2=path, 3=obstacle
@@ -51,41 +62,67 @@ class TowerDefenseEnv(gym.Env):
             'grid': spaces.Box(low=0, high=3, shape=(grid_shape[0], grid_shape[1], 4), dtype=np.int8),
             'resources': spaces.Box(low=0, high=np.inf, shape=(2,), dtype=np.float32),  # gold, lives
             'wave': spaces.Box(low=0, high=np.inf, shape=(1,), dtype=np.int32),  # current wave
+            'view': spaces.Box(low=0, high=1, shape=(2,), dtype=np.float32),  # window origin (row, column) / map size
         })
         
         self.reset()
     
+    def _static_layer(self):
+        """Path and obstacle channel for the whole map, rebuilt only when the map changes"""
+        grid = self.game_scene.map_generator.grid
+        if self._map_layer_grid is not grid:
+            layer = np.zeros(grid.shape, dtype=np.int8)
+            layer[np.isin(grid, (TileType.PATH.value, TileType.START.value, TileType.END.value))] = 2
+            layer[np.isin(grid, (TileType.BIG_OBSTACLE.value, TileType.SMALL_OBSTACLE.value))] = 3
+            self._map_layer = layer
+            self._map_layer_grid = grid
+        return self._map_layer
+
+    def _update_view(self):
+        """Center the window on the active area: the leading enemy, or the path entrance between waves"""
+        simulation = self.game_scene.simulation
+        enemies = simulation.enemies
+        if len(enemies):
+            x, y = enemies.position(int(np.argmax(enemies.distance)))
+        elif len(simulation.path):
+            x, y = simulation.path.start
+        else:
+            x = y = 0
+        map_rows, map_cols = self.game_scene.map_generator.grid.shape
+        rows, cols = self.grid_size
+        top = min(max(int(y // cfg.TILE_SIZE) - rows // 2, 0), max(map_rows - rows, 0))
+        left = min(max(int(x // cfg.TILE_SIZE) - cols // 2, 0), max(map_cols - cols, 0))
+        self.view_origin = (top, left)
+
     def _get_obs(self):
-        """Convert game state to observation"""
-        # Initialize grid observation with zeros
-        grid_obs = np.zeros((self.grid_size[0], self.grid_size[1], 4), dtype=np.int8)
-        
-        # Add path information
-        path_points = self.game_scene.path_points
-        for point in path_points:
-            # Convert scene coordinates to grid coordinates
-            grid_x, grid_y = self._scene_to_grid(point)
-            if 0 <= grid_x < self.grid_size[1] and 0 <= grid_y < self.grid_size[0]:
-                grid_obs[grid_y, grid_x, 0] = 2  # Path
+        """Convert the game state inside the view window to an observation"""
+        self._update_view()
+        top, left = self.view_origin
+        rows, cols = self.grid_size
+        grid_obs = np.zeros((rows, cols, 4), dtype=np.int8)
+        
+        # Add path and obstacle information
+        window = self._static_layer()[top:top + rows, left:left + cols]
+        grid_obs[:window.shape[0], :window.shape[1], 0] = window
         
         # Add tower information
-        for tower in self.game_scene.game_items['towers']:
-            grid_x, grid_y = self._scene_to_grid(tower.pos())
-            if 0 <= grid_x < self.grid_size[1] and 0 <= grid_y < self.grid_size[0]:
-                # Determine tower type
-                if tower.__class__.__name__ == "BasicTower":
-                    grid_obs[grid_y, grid_x, 1] = 1
-                elif tower.__class__.__name__ == "BombTower":
-                    grid_obs[grid_y, grid_x, 1] = 2
-                elif tower.__class__.__name__ == "BoosterTower":
-                    grid_obs[grid_y, grid_x, 1] = 3
+        simulation = self.game_scene.simulation
+        tower_codes = {"basic": 1, "bomb": 2, "booster": 3}
+        for tower in simulation.towers:
+            grid_x, grid_y = self._entity_to_grid(tower)
+            grid_x -= left
+            grid_y -= top
+            if 0 <= grid_x < cols and 0 <= grid_y < rows:
+                grid_obs[grid_y, grid_x, 1] = tower_codes.get(tower.kind, 0)
         
         # Add enemy information
-        for enemy in self.game_scene.game_items['enemies']:
-            grid_x, grid_y = self._scene_to_grid(enemy.pos())
-            if 0 <= grid_x < self.grid_size[1] and 0 <= grid_y < self.grid_size[0]:
-                grid_obs[grid_y, grid_x, 2] = 1
-                # We could add more information about enemy types here
+        enemies = simulation.enemies
+        enemy_cols = (enemies.x // cfg.TILE_SIZE).astype(int) - left
+        enemy_rows = (enemies.y // cfg.TILE_SIZE).astype(int) - top
+        inside = ((enemy_cols >= 0) & (enemy_cols < cols) &
+                  (enemy_rows >= 0) & (enemy_rows < rows))
+        grid_obs[enemy_rows[inside], enemy_cols[inside], 2] = 1
+        # We could add more information about enemy types here
         
         # Resources and wave information
         resources = np.array([
@@ -94,20 +131,30 @@ class TowerDefenseEnv(gym.Env):
         ], dtype=np.float32)
         
         wave = np.array([self.game_scene.game_state.wave], dtype=np.int32)
+
+        # Where the window sits, so the same grid contents in different parts of the map can be told apart
+        map_rows, map_cols = self.game_scene.map_generator.grid.shape
+        view = np.array([top / map_rows, left / map_cols], dtype=np.float32)
         
         return {
             'grid': grid_obs,
             'resources': resources,
-            'wave': wave
+            'wave': wave,
+            'view': view
         }
     
     def _scene_to_grid(self, pos):
         """Convert scene coordinates to grid coordinates"""
         return self.game_scene.scene_to_grid(pos)
     
+    def _entity_to_grid(self, entity):
+        """Convert a simulation entity's position to grid coordinates"""
+        return (int(entity.x // cfg.TILE_SIZE), int(entity.y // cfg.TILE_SIZE))
+
     def _grid_to_scene(self, grid_pos):
-        """Convert grid coordinates to scene coordinates"""
-        return self.game_scene.grid_to_scene(grid_pos)
+        """Convert view window coordinates (as used by actions) to scene coordinates"""
+        top, left = self.view_origin
+        return self.game_scene.grid_to_scene((grid_pos[0] + left, grid_pos[1] + top))
     
     def step(self, action):
         """Execute one time step within the environment"""
@@ -125,12 +172,12 @@ class TowerDefenseEnv(gym.Env):
         prev_gold = self.game_scene.game_state.gold
         prev_lives = self.game_scene.game_state.lives
         prev_score = self.game_scene.game_state.score
-        prev_enemies_count = len(self.game_scene.game_items['enemies'])
+        prev_enemies_count = len(self.game_scene.simulation.enemies)
         
         # Start a new wave if none is active
         if (not self.game_scene.game_state.wave_started and 
             len(self.game_scene.game_state.enemies_to_spawn) == 0 and 
-            len(self.game_scene.game_items['enemies']) == 0):
+            len(self.game_scene.simulation.enemies) == 0):
             # Instead of modifying multiplayer settings, use the training-specific method
             if hasattr(self.game_scene, 'start_wave_training'):
                 self.game_scene.start_wave_training()
@@ -159,17 +206,15 @@ class TowerDefenseEnv(gym.Env):
                 tower_costs = {"basic": 20, "bomb": 200, "booster": 80}
                 if self.game_scene.game_state.gold >= tower_costs[tower_type_name]:
                     # Check if placement is valid
-                    from game_objects.graphicItems import GhostTowerItem
-                    # Use tower_config instead
-                    tower_config = {
-                        "type": tower_type_name,
-                        "cost": tower_costs[tower_type_name],
-                    }
-                    # Create a ghost tower to check placement validity
-                    temp_tower = GhostTowerItem(tower_config)
-                    temp_tower.setPos(scene_pos)
-                    
-                    if self.game_scene.is_valid_position(temp_tower):
+                    if self.game_scene.can_place_at(scene_pos):
+                        from game_objects.graphicItems import GhostTowerItem
+                        # Use tower_config instead
+                        tower_config = {
+                            "type": tower_type_name,
+                            "cost": tower_costs[tower_type_name],
+                        }
+                        temp_tower = GhostTowerItem(tower_config)
+                        temp_tower.setPos(scene_pos)
                         self.game_scene.add_tower(temp_tower, scene_pos)
                         self.game_scene.game_state.gold -= tower_costs[tower_type_name]
                         # Small reward for tower placement
@@ -181,19 +226,13 @@ class TowerDefenseEnv(gym.Env):
                     # Penalty for trying to place unaffordable tower
                     reward -= 0.1
         
-        # Run game for a short period to see effects - UPDATED
+        # Run game for a short period to see effects - the simulation spawns enemies itself
         for _ in range(5):  # Simulate 5 game ticks
             self.game_scene.advance_for_training()  # Use non-timer version instead
-            
-            # Check for enemies to spawn with a thread-safe method that doesn't check timers
-            if (self.game_scene.game_state.wave_started and 
-                self.game_scene.game_state.enemies_to_spawn):
-                # Don't check spawn_timer.isActive() which causes the thread error
-                self._handle_enemy_spawn()
     
         # Calculate rewards based on game state changes
         # Reward for killing enemies
-        enemies_killed = prev_enemies_count - len(self.game_scene.game_items['enemies'])
+        enemies_killed = prev_enemies_count - len(self.game_scene.simulation.enemies)
         reward += enemies_killed * 1.0
         
         # Reward for score increase
@@ -221,36 +260,11 @@ class TowerDefenseEnv(gym.Env):
         # Return the new observation, reward, done flag, and info dict
         return self._get_obs(), reward, done, False, info
 
-    def _handle_enemy_spawn(self):
-        """Handle spawning an enemy during training"""
-        if not self.game_scene.game_state.enemies_to_spawn:
-            return
-            
-        # Spawn one enemy manually
-        enemy_type = self.game_scene.game_state.enemies_to_spawn[0]
-        self.game_scene.game_state.enemies_to_spawn.pop(0)
-        
-        # For training, create a more complete mock enemy with required methods
-        enemy = type('MockEnemy', (), {
-            'pos': lambda: self.game_scene.path_points[0],
-            'health': 10, 
-            '_health': 10,
-            'enemy_id': 'training_enemy',
-            'value': 5,
-            # Add missing methods
-            'advance_animation': lambda _: None,  # No-op animation function
-            '__class__': type('MockClass', (), {'__name__': enemy_type.capitalize()}),
-            # Make it properly handle movement along path
-            'path_points': self.game_scene.path_points,
-            'current_point': 0,
-            'setPos': lambda pos: None  # No-op position setter
-        })
-        
-        self.game_scene.game_items['enemies'].append(enemy)
-
     def reset(self, seed=None, options=None):
         """Reset the environment to its initial state"""
         super().reset(seed=seed)
+        if seed is not None:
+            self.game_scene.simulation.set_seed(seed)
         
         # Thread-safe game state reset 
         if hasattr(self.game_scene, 'reset_game'):
@@ -273,38 +287,12 @@ class TowerDefenseEnv(gym.Env):
 
     def _reset_for_training(self):
         """Reset game state without timers for training"""
-        # Reset core game values without timers
-        self.game_scene.game_state.gold = cfg.BASE_GOLD
-        self.game_scene.game_state.lives = cfg.BASE_LIVES
-        self.game_scene.game_state.score = 0
-        self.game_scene.game_state.wave = 1
+        # Reset core game values and entities without timers
+        self.game_scene.simulation.reset()
         self.game_scene.game_active = True
         
-        # Clear existing game entities
-        for item_category in self.game_scene.game_items:
-            for item in list(self.game_scene.game_items[item_category]):
-                self.game_scene.removeItem(item)
-            self.game_scene.game_items[item_category] = []
-        
-        # Reset wave state
-        self.game_scene.game_state.wave_started = False
-        self.game_scene.game_state.enemies_to_spawn = []
-        
-        # Prepare to start first wave
-        # Save original multiplayer state
-        original_multiplayer = self.game_scene.multiplayer
-        original_is_host = self.game_scene.is_host
-        
-        # Temporarily adjust settings to ensure wave starts
-        self.game_scene.multiplayer = False
-        self.game_scene.is_host = True
-        
-        # Prepare the first wave without timers
-        self.game_scene.start_wave()
-        
-        # Restore original settings
-        self.game_scene.multiplayer = original_multiplayer
-        self.game_scene.is_host = original_is_host
+        # Prepare the first wave without timers or network checks
+        self.game_scene.start_wave_training()
 
     def render(self):
         """Render the environment to the screen"""
@@ -322,6 +310,8 @@ class TowerDefenseAI(QObject):
     thinking = Signal()  # Signal when AI is thinking
     request_start_timer = Signal()  # Add new signal
     request_stop_timer = Signal()   # Add new signal
+    # Mixed into the game seed for the AI's own random stream
+    RNG_SEED_SALT = 0x5EEDA1
     
     def __init__(self, game_scene, parent=None):
         # Add this to your existing __init__ method
@@ -341,6 +331,17 @@ class TowerDefenseAI(QObject):
         # Track previously attempted positions
         self.attempted_positions = set()
         self.failed_attempts_threshold = 3  # Allow a few failures before forcing diversity
+        self._rng = None
+        self._rng_seed = None
+
+    @property
+    def rng(self):
+        """The AI's own random stream, derived from the game seed so its draws never shift the waves"""
+        seed = self.game_scene.simulation.seed
+        if self._rng is None or self._rng_seed != seed:
+            self._rng = random.Random(seed ^ self.RNG_SEED_SALT)
+            self._rng_seed = seed
+        return self._rng
 
     @Slot()
     def _start_timer_in_main_thread(self):
@@ -368,18 +369,16 @@ class TowerDefenseAI(QObject):
                 
             # Check if model file exists WITH .zip extension
             if os.path.exists(f"{model_path}.zip"):
-                print(f"Loading model from {model_path}.zip")
+                log.info("Loading model from %s.zip", model_path)
                 self.model = PPO.load(model_path, env=self.env)
                 return True
             else:
                 # Create a new model with default parameters
-                print(f"No model found at {model_path}.zip - creating new model")
+                log.info("No model found at %s.zip - creating new model", model_path)
                 self.model = PPO("MultiInputPolicy", self.env, verbose=1)
                 return False
         except Exception as e:
-            print(f"Error loading model: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error loading model: %s", e)
             return False
     
     def start(self):
@@ -387,7 +386,7 @@ class TowerDefenseAI(QObject):
         if not self.model:
             self.load_model()
         
-        print("Starting AI controller...")
+        log.info("Starting AI controller...")
         
         # Try to place a tower - loop through more positions
         if self.game_scene.game_state.gold >= 20:
@@ -399,17 +398,17 @@ class TowerDefenseAI(QObject):
                     
                     try:
                         pos = self.env._grid_to_scene((x, y))
-                        from game_objects.towers import BasicTower
-                        tower = BasicTower(pos, self.game_scene.animations["basic_tower"])
                         
-                        if self.game_scene.is_valid_position(tower):
-                            print(f"AI placing initial tower at {x},{y}")
-                            self.game_scene.game_items['towers'].append(tower)
-                            self.game_scene.addItem(tower)
+                        if self.game_scene.can_place_at(pos):
+                            from game_objects.graphicItems import GhostTowerItem
+                            tower = GhostTowerItem({"type": "basic", "cost": 20})
+                            tower.setPos(pos)
+                            log.info("AI placing initial tower at %s,%s", x, y)
+                            self.game_scene.add_tower(tower, pos)
                             self.game_scene.game_state.gold -= 20
                             placed = True
                     except Exception as e:
-                        print(f"Error placing initial tower: {e}")
+                        log.error("Error placing initial tower: %s", e)
                 if placed:
                     break
         
@@ -417,7 +416,7 @@ class TowerDefenseAI(QObject):
         self.request_start_timer.emit()
         
         # Check timer status
-        QTimer.singleShot(1000, lambda: print(f"AI timer active: {self.timer.isActive()}"))
+        QTimer.singleShot(1000, lambda: log.debug("AI timer active: %s", self.timer.isActive()))
     
     def stop(self):
         """Stop AI control"""
@@ -434,8 +433,8 @@ class TowerDefenseAI(QObject):
         # Check if we need to start a wave
         if (not self.game_scene.game_state.wave_started and 
             len(self.game_scene.game_state.enemies_to_spawn) == 0 and 
-            len(self.game_scene.game_items['enemies']) == 0):
-            print("AI is starting a new wave...")
+            len(self.game_scene.simulation.enemies) == 0):
+            log.info("AI is starting a new wave...")
             # Use the real game's wave starting mechanism
             self.game_scene.start_wave()
             # Reset the position tracking at the start of each wave
@@ -444,13 +443,12 @@ class TowerDefenseAI(QObject):
         # Get current observation
         obs = self.env._get_obs()
         
-        # DEBUG: Print current gold
-        print(f"AI step - Current gold: {self.game_scene.game_state.gold}")
+        log.debug("AI step - Current gold: %s", self.game_scene.game_state.gold)
         
         # If model exists, use it with occasional exploration; otherwise use direct placement
         if self.model:
             # Use non-deterministic prediction occasionally to encourage exploration
-            use_deterministic = random.random() > 0.2  # 80% deterministic, 20% exploration
+            use_deterministic = self.rng.random() > 0.2  # 80% deterministic, 20% exploration
             
             # Predict action
             action, _ = self.model.predict(obs, deterministic=use_deterministic)
@@ -461,11 +459,11 @@ class TowerDefenseAI(QObject):
             # Check if this position has been tried too many times
             pos_key = f"{action[1]},{action[2]}"
             if pos_key in self.attempted_positions:
-                print(f"Position {pos_key} already attempted - forcing diversity")
+                log.debug("Position %s already attempted - forcing diversity", pos_key)
                 # Force a different position by using random placement
                 action = self._generate_diverse_placement()
             
-            print(f"AI action: tower_type={action[0]}, x={action[1]}, y={action[2]}")
+            log.debug("AI action: tower_type=%s, x=%s, y=%s", action[0], action[1], action[2])
         else:
             # Direct placement algorithm for untrained model
             action = self._generate_diverse_placement()
@@ -487,22 +485,22 @@ class TowerDefenseAI(QObject):
 
     def _generate_diverse_placement(self):
         """Generate a placement action that tries to be diverse"""
-        import random
+        rng = self.rng
         
         # Try to place a tower if we have gold
         if self.game_scene.game_state.gold >= 20:  # Cost of basic tower
             # Decide which tower type to place based on available gold
             if self.game_scene.game_state.gold >= 200:
-                tower_type = random.choices([1, 2, 3], weights=[0.7, 0.2, 0.1])[0]  # Basic, bomb, booster
+                tower_type = rng.choices([1, 2, 3], weights=[0.7, 0.2, 0.1])[0]  # Basic, bomb, booster
             elif self.game_scene.game_state.gold >= 80:
-                tower_type = random.choices([1, 3], weights=[0.8, 0.2])[0]  # Basic or booster
+                tower_type = rng.choices([1, 3], weights=[0.8, 0.2])[0]  # Basic or booster
             else:
                 tower_type = 1  # Basic tower
             
             # Try up to 20 random positions
             for _ in range(20):
-                grid_x = random.randint(1, self.env.grid_size[1]-2)
-                grid_y = random.randint(1, self.env.grid_size[0]-2)
+                grid_x = rng.randint(1, self.env.grid_size[1]-2)
+                grid_y = rng.randint(1, self.env.grid_size[0]-2)
                 
                 # Check if we've already tried this position
                 pos_key = f"{grid_x},{grid_y}"
@@ -511,13 +509,7 @@ class TowerDefenseAI(QObject):
                     
                 # Check if position is valid
                 scene_pos = self.env._grid_to_scene((grid_x, grid_y))
-                from game_objects.graphicItems import GhostTowerItem
-                tower_costs = {"basic": 20, "bomb": 200, "booster": 80}
-                tower_names = {1: "basic", 2: "bomb", 3: "booster"}
-                ghost = GhostTowerItem({"type": tower_names[tower_type], "cost": tower_costs[tower_names[tower_type]]})
-                ghost.setPos(scene_pos)
-                
-                if self.game_scene.is_valid_position(ghost):
+                if self.game_scene.can_place_at(scene_pos):
                     return [tower_type, grid_x, grid_y]
         
         # Default to no action
@@ -543,66 +535,26 @@ class TowerDefenseAI(QObject):
                 tower_costs = {"basic": 20, "bomb": 200, "booster": 80}
                 cost = tower_costs.get(tower_type_name, 0)
                 
-                print(f"Attempting to place {tower_type_name} tower at ({grid_x},{grid_y})")
-                print(f"Available gold: {self.game_scene.game_state.gold}, Cost: {cost}")
+                log.debug("Attempting to place %s tower at (%s,%s), gold %s, cost %s", tower_type_name,
+                          grid_x, grid_y, self.game_scene.game_state.gold, cost)
                 
                 if self.game_scene.game_state.gold >= cost:
                     try:
-                        # Create a tower directly instead of using ghost tower
-                        from game_objects.towers import BasicTower, BombTower, BoosterTower
-                        
-                        if tower_type_name == "basic":
-                            tower = BasicTower(scene_pos, self.game_scene.animations["basic_tower"])
-                            valid = self.game_scene.is_valid_position(tower)
-                            print(f"Position valid: {valid}")
-                            if valid:
-                                self.game_scene.game_items['towers'].append(tower)
-                                self.game_scene.addItem(tower)
-                                self.game_scene.game_state.gold -= cost
-                                success = True
-                                print(f"✓ Basic tower placed at ({grid_x},{grid_y})")
-                                return success
-                        
-                        # If direct placement failed, try using the ghost tower method
                         from game_objects.graphicItems import GhostTowerItem
                         ghost_tower = GhostTowerItem({"type": tower_type_name, "cost": cost})
                         ghost_tower.setPos(scene_pos)
-                        ghost_tower.name = tower_type_name  # Ensure name property exists
                         
-                        valid = self.game_scene.is_valid_position(ghost_tower)
-                        print(f"Ghost position valid: {valid}")
+                        valid = self.game_scene.can_place_at(scene_pos)
+                        log.debug("Ghost position valid: %s", valid)
                         
                         if valid:
-                            # Try both methods of tower placement
-                            try:
-                                # Method 1: add_tower method
-                                self.game_scene.add_tower(ghost_tower, scene_pos)
-                                print(f"✓ Tower placed using add_tower at ({grid_x},{grid_y})")
-                                success = True
-                            except Exception as e1:
-                                print(f"Error with add_tower: {e1}")
-                                
-                                # Method 2: Direct placement
-                                try:
-                                    if tower_type_name == "basic":
-                                        tower = BasicTower(scene_pos, self.game_scene.animations["basic_tower"])
-                                    elif tower_type_name == "bomb":
-                                        tower = BombTower(scene_pos, self.game_scene.animations["bomb_tower"])
-                                    elif tower_type_name == "booster":
-                                        tower = BoosterTower(scene_pos, self.game_scene.animations["booster_tower"])
-                                        
-                                    self.game_scene.game_items['towers'].append(tower)
-                                    self.game_scene.addItem(tower)
-                                    self.game_scene.game_state.gold -= cost
-                                    print(f"✓ Tower placed directly at ({grid_x},{grid_y})")
-                                    success = True
-                                except Exception as e2:
-                                    print(f"Error with direct placement: {e2}")
+                            self.game_scene.add_tower(ghost_tower, scene_pos)
+                            self.game_scene.game_state.gold -= cost
+                            log.debug("Tower placed at (%s,%s)", grid_x, grid_y)
+                            success = True
                                     
                     except Exception as e:
-                        print(f"Error during tower placement: {e}")
-                        import traceback
-                        traceback.print_exc()
+                        log.exception("Error during tower placement: %s", e)
         
         return success  # Return False if placement failed
 
@@ -632,7 +584,7 @@ class TowerDefenseAI(QObject):
             self.model.save(self.model_path)
             return True
         except Exception as e:
-            print(f"Error during training: {e}")
+            log.error("Error during training: %s", e)
             return False
 
 
@@ -658,50 +610,24 @@ class TrainingWorker(QThread):
             # Create a training-specific environment that doesn't interact with UI timers
             class TrainingGameScene:
                 def __init__(self, real_scene):
-                    # Copy only the data we need, not timers or Qt objects
+                    # Run the headless simulation on a copy of the map, no timers or Qt objects
                     self.map_generator = real_scene.map_generator
-                    self.game_items = {"towers": [], "enemies": [], "projectiles": []}
                     self.path_points = deepcopy(real_scene.path_points)
-                    self.animations = real_scene.animations  # Just reference, won't modify
+                    self.simulation = GameSimulation([(p.x(), p.y()) for p in self.path_points],
+                                                     seed=real_scene.simulation.seed)
+                    self.simulation.set_map_grid(self.map_generator.grid)
+                    self.game_state = self.simulation.state
                     self.multiplayer = False
                     self.is_host = True
                     self.game_active = True
                     
-                    # Create fresh game state without signals
-                    self.game_state = type('GameState', (), {
-                        'gold': cfg.BASE_GOLD,
-                        'lives': cfg.BASE_LIVES,
-                        'score': 0,
-                        'wave': 1,
-                        'wave_started': False,
-                        'enemies_to_spawn': []
-                    })
-                    
-                    # Mock the timer properties that training code checks
-                    self.spawn_timer = type('MockTimer', (), {'isActive': lambda: False})
-                    
                 def advance_for_training(self):
-                    # Add actual simulation code
-                    # Simple simulation of game advancement
-                    # Process enemies
-                    for enemy in list(self.game_items['enemies']):
-                        # Move enemies along path or remove them
-                        if hasattr(enemy, 'current_point'):
-                            enemy.current_point += 1
-                            if enemy.current_point >= len(self.path_points):
-                                # Enemy reached end
-                                self.game_state.lives -= 1
-                                self.game_items['enemies'].remove(enemy)
-                            elif random.random() < 0.1:  # 10% chance to "kill" enemies
-                                self.game_state.score += enemy.value
-                                self.game_state.gold += enemy.value
-                                self.game_items['enemies'].remove(enemy)
+                    self.simulation.step()
+                    if self.simulation.game_over:
+                        self.game_active = False
                 
                 def start_wave_training(self):
-                    # Simplified wave start logic without timers
-                    self.game_state.wave_started = True
-                    # Add mock enemies
-                    self.game_state.enemies_to_spawn = ["rat"] * 10
+                    self.simulation.start_wave()
                     
                 def scene_to_grid(self, pos):
                     # Grid conversion without Qt dependencies
@@ -714,21 +640,13 @@ class TrainingWorker(QThread):
                     return QPointF(grid_pos[0] * 16, grid_pos[1] * 16)
                     
                 def is_valid_position(self, tower):
-                    # Simplified check for training
-                    return True
+                    return self.can_place_at(tower.pos())
+
+                def can_place_at(self, pos):
+                    return self.simulation.can_place_tower(pos.x(), pos.y())
                     
                 def add_tower(self, tower, pos):
-                    # Simplified tower adding for training
-                    pass
-                
-                def removeItem(self, item):
-                    """Safe version of removeItem that works with mock objects"""
-                    # For real QGraphicsItems, we would need to remove from the scene
-                    # For mock objects in training, just remove from our lists
-                    for category in self.game_items:
-                        if item in self.game_items[category]:
-                            self.game_items[category].remove(item)
-                            return
+                    return self.simulation.place_tower(tower.name, pos.x(), pos.y())
             
             # Create a training scene that won't affect timers
             training_scene = TrainingGameScene(self.ai.game_scene)
@@ -780,9 +698,9 @@ class TrainingWorker(QThread):
                                 path = self.model_path
                                 
                             self.model.save(path)
-                            print(f"Saved checkpoint to {path}.zip")
+                            log.info("Saved checkpoint to %s.zip", path)
                         except Exception as e:
-                            print(f"Warning: Could not save model: {e}")
+                            log.warning("Could not save model: %s", e)
                     return True
             
             # Train the model
@@ -796,16 +714,14 @@ class TrainingWorker(QThread):
 
             # Save the model
             model.save(save_path)
-            print(f"Training complete, model saved to {save_path}.zip")
+            log.info("Training complete, model saved to %s.zip", save_path)
 
             # Update the AI's model
             self.ai.model = model
             
             self.completed.emit(True)
         except Exception as e:
-            print(f"Training error: {e}")
-            import traceback
-            traceback.print_exc()  # Print the full stack trace
+            log.exception("Training error: %s", e)
             self.completed.emit(False)
 
 def validate_model_path(path):
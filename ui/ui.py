@@ -1,13 +1,15 @@
 from PySide6.QtWidgets import (
     QGraphicsView, QGraphicsScene, QVBoxLayout, QWidget, QPushButton, QLabel, QGraphicsItem
 , QGraphicsTextItem, QGraphicsPixmapItem, QGraphicsRectItem, QGraphicsEllipseItem,QRadioButton,QButtonGroup, QGroupBox, QTextEdit, QLineEdit
-, QHBoxLayout)
+, QHBoxLayout, QComboBox)
 from PySide6.QtCore import Qt, QRectF, QPoint, Signal,Slot
 from PySide6.QtGui import QWheelEvent, QMouseEvent, QPainter, QTransform, QColor,QFont
 from PySide6.QtCore import QTimer, QPointF
 from game_objects.gameEngine import GameState
 from game_objects.graphicItems import BaseTowerItem
 from network.network import GameNetworkEvent
+from simulation.entities import TARGETING_MODES
+import config.config as cfg
 import time
 
 TOWER_TYPES = {
@@ -36,9 +38,11 @@ class TowerStoreWidget(QWidget):
     tower_selected = Signal(dict)  # Emit when a tower is selected
     wave_started = Signal()  # Emit when a wave starts
     game_saved = Signal()  # Emit when the game is paused
+    speed_changed = Signal(int)  # Emit when fast-forward is toggled, 0 = max speed
     def __init__(self, game_state : GameState):
         super().__init__()
         self.game_state = game_state
+        self.speed_index = 0
         self.init_ui()
 
     def init_ui(self):
@@ -67,10 +71,13 @@ class TowerStoreWidget(QWidget):
             layout.addWidget(btn)
         self.waveButton = QPushButton("Start Wave")
         self.waveButton.clicked.connect(self.handle_wave_start)
+        self.speedButton = QPushButton(self.speed_text(cfg.GAME_SPEEDS[0]))
+        self.speedButton.clicked.connect(self.handle_speed_change)
         self.saveButton = QPushButton("Save")
         self.saveButton.clicked.connect(self.handle_save)
         
         layout.addWidget(self.waveButton)
+        layout.addWidget(self.speedButton)
         layout.addWidget(self.saveButton)
         self.setLayout(layout)
 
@@ -87,6 +94,14 @@ class TowerStoreWidget(QWidget):
     def handle_wave_end(self):
         self.waveButton.setEnabled(True)
         self.waveButton.setText(f"Start Wave {self.game_state.wave + 1}")
+    def speed_text(self, speed):
+        return "Speed: Max" if speed == 0 else f"Speed: {speed}x"
+    def handle_speed_change(self):
+        """Cycle through the fast-forward speeds"""
+        self.speed_index = (self.speed_index + 1) % len(cfg.GAME_SPEEDS)
+        speed = cfg.GAME_SPEEDS[self.speed_index]
+        self.speedButton.setText(self.speed_text(speed))
+        self.speed_changed.emit(speed)
     def handle_save(self):
         """Emit signal when the game is saved"""
         self.game_saved.emit()
@@ -96,10 +111,10 @@ class TowerStoreWidget(QWidget):
     def handle_game_over(self):
         """Handle game over state"""
         self.waveButton.setEnabled(False)
-        self.pauseButton.setEnabled(False)
         for btn in self.tower_buttons:
             btn.setEnabled(False)
         self.waveButton.setText("Game Over")
+        self.speedButton.setEnabled(False)
     def update_store_ui(self, gold):
         """Update the store UI based on game state"""
         self.gold_label.setText(f"Gold: {gold}")
@@ -113,9 +128,10 @@ class TowerOverviewWidget(QWidget):
     sell_tower = Signal(object)  # Emit when the sell button is clicked
     upgrade_tower = Signal(object)  # Emit when the upgrade button is clicked
     tower_deselected = Signal()  # Emit when a tower is selected
+    targeting_changed = Signal(object, str)  # Emit when a targeting mode is picked
     def __init__(self,game_state : GameState):
         super().__init__()
-        self.tower= BaseTowerItem(QPoint(0.0,0.0))
+        self.tower = None
         self.game_state = game_state
         self.setWindowFlags(Qt.Window | Qt.FramelessWindowHint)
         self.hide()
@@ -126,16 +142,21 @@ class TowerOverviewWidget(QWidget):
 
         self.name_label = QLabel("Tower Name")
         self.kills_label = QLabel("Kills: 0")
-        self.frame_label = QLabel(f"Frame: {self.tower.current_frame}")
-        self.sell_btn = QPushButton(f"Sell:{self.tower.cost}")
+        self.frame_label = QLabel("Frame: 0")
+        self.sell_btn = QPushButton("Sell:0")
         self.sell_btn.clicked.connect(self.handle_sell_tower)
-        self.upgrade_btn = QPushButton(f"Upgrade:{self.tower.upgrade_cost} ")
+        self.upgrade_btn = QPushButton("Upgrade:0 ")
         self.upgrade_btn.clicked.connect(self.handle_upgrade_tower)
-        self.upgrade_btn.setEnabled(self.game_state.gold >= self.tower.upgrade_cost)
+        self.upgrade_btn.setEnabled(False)
+        self.targeting_box = QComboBox()
+        for mode in TARGETING_MODES:
+            self.targeting_box.addItem(f"Target: {mode}", mode)
+        self.targeting_box.currentIndexChanged.connect(self.handle_targeting_change)
         
         layout.addWidget(self.frame_label)
         layout.addWidget(self.name_label)
         layout.addWidget(self.kills_label)
+        layout.addWidget(self.targeting_box)
         layout.addWidget(self.sell_btn)
         layout.addWidget(self.upgrade_btn)
         self.setLayout(layout)
@@ -152,13 +173,23 @@ class TowerOverviewWidget(QWidget):
         self.sell_btn.setText(f"Sell: {tower.cost // 2}")
         self.upgrade_btn.setText(f"Upgrade: {tower.upgrade_cost}")
         self.kills_label.setText(f"Kills: {tower.kills}")
+        self.upgrade_btn.setEnabled(tower.can_upgrade(self.game_state.gold))
+        # Don't echo the selected tower's own mode back as a change
+        self.targeting_box.blockSignals(True)
+        self.targeting_box.setCurrentIndex(max(0, self.targeting_box.findData(tower.targeting)))
+        self.targeting_box.blockSignals(False)
+        self.targeting_box.setEnabled(tower.can_target)
         self.show()
     @Slot(int)
     def update_upgrade_ui(self, gold):
         if self.tower:
-            self.upgrade_btn.setEnabled(gold >= self.tower.upgrade_cost)
+            self.upgrade_btn.setEnabled(self.tower.can_upgrade(gold))
         else:
             self.upgrade_btn.setEnabled(False)
+    def handle_targeting_change(self, index):
+        """Handle targeting mode selection"""
+        if self.tower:
+            self.targeting_changed.emit(self.tower, self.targeting_box.itemData(index))
     def handle_sell_tower(self):
         """Handle tower sell action"""
 
@@ -244,6 +275,10 @@ class GameView(QGraphicsView):
         self._zoom_level = 1.0
         self._pan_start = QPoint()
         self._panning = False
+        # Profiler overlay, its text is refreshed a few times per second
+        self._show_profiler = False
+        self._profiler_lines = []
+        self._profiler_refreshed = 0.0
         
         
         # Initialize view settings
@@ -305,6 +340,14 @@ class GameView(QGraphicsView):
         else:
             super().mouseMoveEvent(event)
 
+    def scrollContentsBy(self, dx, dy):
+        super().scrollContentsBy(dx, dy)
+        self.viewport_changed.emit(self.viewport_rect())
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.viewport_changed.emit(self.viewport_rect())
+
     def mouseReleaseEvent(self, event: QMouseEvent):
         """End panning operation"""
         if event.button() == Qt.MiddleButton:
@@ -358,6 +401,53 @@ class GameView(QGraphicsView):
         # Add grid drawing here if needed
         super().drawBackground(painter, rect)
 
+    def paintEvent(self, event):
+        """Paint the scene, timed into the profiler while it is enabled"""
+        profiler = getattr(self.scene(), "simulation", None) and self.scene().simulation.profiler
+        if not profiler or not profiler.enabled:
+            super().paintEvent(event)
+            return
+        start = time.perf_counter()
+        super().paintEvent(event)
+        profiler.record("paint", (time.perf_counter() - start) * 1000.0)
+
+    def drawForeground(self, painter: QPainter, rect: QRectF):
+        super().drawForeground(painter, rect)
+        if self._show_profiler:
+            self._draw_profiler_overlay(painter)
+
+    def _draw_profiler_overlay(self, painter: QPainter):
+        """Draw the profiler percentiles in the top left corner of the viewport"""
+        now = time.perf_counter()
+        if now - self._profiler_refreshed > 0.5:
+            self._profiler_refreshed = now
+            self._profiler_lines = [f"{'section':<15}{'p50':>7}{'p95':>7}{'p99':>7} ms"]
+            for section, stats in self.scene().simulation.profiler.summary().items():
+                self._profiler_lines.append(
+                    f"{section:<15}{stats['p50']:>7.2f}{stats['p95']:>7.2f}{stats['p99']:>7.2f}")
+        painter.save()
+        painter.resetTransform()
+        font = QFont("Monospace", 8)
+        font.setStyleHint(QFont.TypeWriter)
+        painter.setFont(font)
+        line_height = painter.fontMetrics().height()
+        width = max((painter.fontMetrics().horizontalAdvance(line) for line in self._profiler_lines), default=0)
+        painter.fillRect(QRectF(4, 4, width + 8, line_height * len(self._profiler_lines) + 8), QColor(0, 0, 0, 160))
+        painter.setPen(QColor(255, 255, 255))
+        for index, line in enumerate(self._profiler_lines):
+            painter.drawText(8, 8 + line_height * (index + 1) - painter.fontMetrics().descent(), line)
+        painter.restore()
+
+    def set_profiler_overlay(self, enable: bool):
+        """Show or hide the profiler overlay and turn profiling on or off with it"""
+        self._show_profiler = enable
+        self._profiler_refreshed = 0.0
+        self.scene().simulation.profiler.enabled = enable
+        # The overlay sits on top of the whole viewport, partial updates would leave stale text
+        self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate if enable
+                                   else QGraphicsView.MinimalViewportUpdate)
+        self.viewport().update()
+
     def item_proxy(self, item):
         """Create a proxy widget for HUD elements"""
         return self.scene().addWidget(item)